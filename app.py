@@ -1,47 +1,91 @@
 """
 로또 예측 성능 분석 대시보드 - Flask Web Application
 """
-from flask import Flask, render_template, request, redirect, url_for, jsonify, flash
-import json, os
+from flask import (
+    Flask, render_template, request, redirect, url_for, jsonify, flash, send_file, stream_with_context,
+)
+import click
+import io, json, os, time
+import migrations
+import baseline
+import instrumentation
+import events
+import tempfile
+from cache import VersionedCache
+from jinja2.utils import htmlsafe_json_dumps
+from importer import import_draws, import_predictions, import_file, detect_format, format_report
 from models import (
-    init_db, CODES, save_round, save_predictions, get_all_rounds,
-    get_round_data, delete_round, get_dashboard_data, get_round_detail_analysis,
+    init_db, schema_current, get_codes, save_code, delete_code, save_round, save_predictions, get_rounds_page,
+    delete_round, get_dashboard_data, get_round_detail_analysis,
+    rebuild_round_scores, check_aggregates, get_data_version, get_rounds_status,
+    validate_draw, parse_prediction_text, init_app, get_db, get_code_round_series,
+    db_stats, get_number_index, get_number_rolling, get_code_drilldown,
+    get_changes, get_round_comparison, round_detail_cache_stats,
 )
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'lotto-dashboard-dev-key-2025')
+init_app(app)
+instrumentation.init_app(app, db_stats)
 
+# 스키마 마이그레이션/백필은 배포 시 1회 (gunicorn.conf.py on_starting, flask db-migrate) —
+# 워커는 버전만 확인하고, 마이그레이션 단계 없이 실행된 경우(개발 서버 등)에만 직접 적용한다.
+# 분석 전용 모듈(significance, prizes, export)은 해당 라우트에서 처음 쓸 때 가져온다.
 with app.app_context():
-    init_db()
+    if not schema_current():
+        init_db()
+
+# 대시보드 결과/직렬화 JSON 캐시 (DB 데이터 버전 기준 → 워커 간에도 정확)
+dashboard_cache = VersionedCache()
+# 데이터 변경 감시 (워커당 스레드 1개, 실시간 갱신 스트림용)
+change_watcher = events.ChangeWatcher(get_data_version)
+
+HISTORY_PAGE_SIZE = 50
+
+def dashboard_window():
+    """요청 인자의 대시보드 조회 구간 (last_n, from, to)"""
+    last_n = request.args.get('last_n', type=int)
+    if last_n is not None and last_n <= 0:
+        last_n = None
+    return (last_n, request.args.get('from', type=int), request.args.get('to', type=int))
+
+def script_json(data):
+    """<script> 안에 넣을 JSON (<, >, &, ' 를 \\u 이스케이프 — 코드 이름 등 사용자 입력 포함)"""
+    return htmlsafe_json_dumps(data, ensure_ascii=False)
+
+def cached_dashboard(version, window):
+    """데이터 버전·구간별 대시보드 데이터"""
+    return dashboard_cache.get(version, ('data', window), lambda: get_dashboard_data(*window))
 
 @app.route('/')
 def dashboard():
-    data = get_dashboard_data()
-    return render_template('dashboard.html', data=data, codes=CODES,
-                           data_json=json.dumps(data, ensure_ascii=False))
+    version = get_data_version()
+    window = dashboard_window()
+    data = cached_dashboard(version, window)
+    data_json = dashboard_cache.get(version, ('page_json', window),
+                                    lambda: script_json(data))
+    return render_template('dashboard.html', data=data, codes=get_codes(), data_json=data_json,
+                           last_n=window[0], data_version=version,
+                           windowed=any(v is not None for v in window))
 
 @app.route('/input', methods=['GET'])
 def input_page():
-    rounds = get_all_rounds()
-    return render_template('input.html', codes=CODES, rounds=rounds)
+    rounds, _, _ = get_rounds_page(limit=5)
+    return render_template('input.html', codes=get_codes(), rounds=rounds)
 
 @app.route('/input/round', methods=['POST'])
 def save_round_data():
     try:
         round_number = int(request.form['round_number'])
         draw_date = request.form.get('draw_date', '')
-        numbers = []
-        for i in range(1, 7):
-            n = int(request.form[f'actual_num{i}'])
-            if not (1 <= n <= 45):
-                flash(f'번호 {n}은(는) 1~45 범위를 벗어났습니다.', 'error')
-                return redirect(url_for('input_page'))
-            numbers.append(n)
-        if len(set(numbers)) != 6:
-            flash('중복된 번호가 있습니다.', 'error')
-            return redirect(url_for('input_page'))
+        numbers = [int(request.form[f'actual_num{i}']) for i in range(1, 7)]
         bonus = request.form.get('bonus')
         bonus = int(bonus) if bonus and bonus.strip() else None
+        try:
+            validate_draw(numbers, bonus)
+        except ValueError as e:
+            flash(str(e), 'error')
+            return redirect(url_for('input_page'))
         save_round(round_number, draw_date, numbers, bonus)
         flash(f'{round_number}회차 당첨 번호가 저장되었습니다.', 'success')
     except (ValueError, KeyError) as e:
@@ -53,44 +97,57 @@ def save_prediction_data():
     try:
         round_number = int(request.form['pred_round_number'])
         code_id = request.form['code_id']
-        if code_id not in CODES:
+        codes = get_codes()
+        if code_id not in codes:
             flash(f'알 수 없는 코드: {code_id}', 'error')
             return redirect(url_for('input_page'))
         raw_text = request.form.get('prediction_text', '').strip()
         if not raw_text:
             flash('예측 번호를 입력해주세요.', 'error')
             return redirect(url_for('input_page'))
-        sets_list = []
-        for line in raw_text.strip().split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-            nums = []
-            for part in line.replace(',', ' ').replace('\t', ' ').split():
-                part = part.strip()
-                if part.isdigit():
-                    nums.append(int(part))
-            if len(nums) == 6 and all(1 <= n <= 45 for n in nums):
-                sets_list.append(sorted(nums))
+        sets_list = parse_prediction_text(raw_text)
         if len(sets_list) == 0:
             flash('유효한 세트가 없습니다.', 'error')
             return redirect(url_for('input_page'))
-        expected = CODES[code_id]['sets']
+        expected = codes[code_id]['sets']
         if len(sets_list) != expected:
             flash(f'{code_id}는 {expected}세트 필요, {len(sets_list)}세트 입력됨', 'warning')
         result = save_predictions(round_number, code_id, sets_list)
         if result:
-            flash(f'{round_number}회차 {CODES[code_id]["name"]} {len(sets_list)}세트 저장 ✓', 'success')
+            flash(f'{round_number}회차 {codes[code_id]["name"]} {len(sets_list)}세트 저장 ✓', 'success')
         else:
             flash(f'{round_number}회차가 존재하지 않습니다. 먼저 당첨 번호를 등록하세요.', 'error')
     except (ValueError, KeyError) as e:
         flash(f'입력 오류: {e}', 'error')
     return redirect(url_for('input_page'))
 
+@app.route('/input/import', methods=['POST'])
+def import_data():
+    upload = request.files.get('file')
+    kind = request.form.get('kind', 'draws')
+    if not upload or not upload.filename:
+        flash('가져올 파일을 선택해주세요.', 'error')
+        return redirect(url_for('input_page'))
+    importer = import_draws if kind == 'draws' else import_predictions
+    stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    try:
+        report = importer(stream, detect_format(upload.filename))
+    except UnicodeDecodeError:
+        flash('UTF-8 텍스트 파일만 가져올 수 있습니다.', 'error')
+        return redirect(url_for('input_page'))
+    flash(f'가져오기 완료: {format_report(report)}', 'success' if not report['errors'] else 'warning')
+    for message in (report['error_samples'] + report['warnings'])[:5]:
+        flash(message, 'warning')
+    return redirect(url_for('input_page'))
+
 @app.route('/history')
 def history():
-    rounds = get_all_rounds()
-    return render_template('history.html', rounds=rounds, codes=CODES)
+    rounds, older, newer = get_rounds_page(
+        before=request.args.get('before', type=int),
+        after=request.args.get('after', type=int),
+        limit=HISTORY_PAGE_SIZE,
+    )
+    return render_template('history.html', rounds=rounds, codes=get_codes(), older=older, newer=newer)
 
 @app.route('/round/<int:round_number>')
 def round_detail(round_number):
@@ -99,7 +156,42 @@ def round_detail(round_number):
         flash(f'{round_number}회차 데이터가 없습니다.', 'error')
         return redirect(url_for('history'))
     return render_template('round_detail.html',
-                           round_number=round_number, analysis=analysis, codes=CODES)
+                           round_number=round_number, analysis=analysis, codes=get_codes())
+
+@app.route('/api/round/<int:round_number>')
+def api_round_detail(round_number):
+    analysis = get_round_detail_analysis(round_number)
+    if not analysis:
+        return jsonify({'error': f'{round_number}회차 데이터가 없습니다.'}), 404
+    return jsonify(analysis)
+
+def compare_window():
+    """요청 인자의 비교 구간 (from, to) — 없으면 최근 10회차"""
+    from_round = request.args.get('from', type=int)
+    to_round = request.args.get('to', type=int)
+    if from_round is None or to_round is None:
+        latest = get_rounds_page(limit=10)[0]
+        if not latest:
+            return None
+        from_round = latest[-1]['round_number'] if from_round is None else from_round
+        to_round = latest[0]['round_number'] if to_round is None else to_round
+    return from_round, to_round
+
+def cached_comparison(window):
+    return dashboard_cache.get(get_data_version(), ('compare', window), lambda: get_round_comparison(*window))
+
+@app.route('/rounds/compare')
+def rounds_compare():
+    window = compare_window()
+    comparison = cached_comparison(window) if window else None
+    return render_template('compare.html', comparison=comparison, codes=get_codes())
+
+@app.route('/api/rounds/compare')
+def api_rounds_compare():
+    window = compare_window()
+    if not window:
+        return jsonify({'error': '등록된 회차가 없습니다.'}), 404
+    return jsonify(cached_comparison(window))
 
 @app.route('/round/<int:round_number>/delete', methods=['POST'])
 def round_delete(round_number):
@@ -109,20 +201,354 @@ def round_delete(round_number):
 
 @app.route('/api/dashboard')
 def api_dashboard():
-    return jsonify(get_dashboard_data())
+    version = get_data_version()
+    window = dashboard_window()
+    etag = f'dashboard-v{version}-' + '-'.join('' if v is None else str(v) for v in window)
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        body = dashboard_cache.get(version, ('api_json', window),
+                                   lambda: app.json.dumps(cached_dashboard(version, window)) + '\n')
+        response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def warm_up():
+    """기본(전체 이력) 대시보드 데이터와 직렬화 JSON 을 캐시에 미리 채움 → 걸린 초
+
+    gunicorn.conf.py 가 워커 시작 직후(또는 preload 시 fork 전 마스터에서) 호출한다.
+    """
+    started = time.perf_counter()
+    window = (None, None, None)
+    with app.app_context():
+        version = get_data_version()
+        data = cached_dashboard(version, window)
+        dashboard_cache.get(version, ('page_json', window), lambda: script_json(data))
+        dashboard_cache.get(version, ('api_json', window), lambda: app.json.dumps(data) + '\n')
+    return time.perf_counter() - started
+
+def code_form(source):
+    """요청 데이터(폼 / JSON) → save_code 인자 (세트 수·순서는 정수 변환)"""
+    sort_order = source.get('sort_order')
+    try:
+        sets = int(source.get('sets', 0))
+        sort_order = int(sort_order) if sort_order not in (None, '') else None
+    except (TypeError, ValueError):
+        raise ValueError('세트 수와 순서는 정수여야 합니다.') from None
+    return {
+        'name': str(source.get('name', '')),
+        'sets': sets,
+        'color': str(source.get('color', '')),
+        'short': str(source.get('short', '')),
+        'sort_order': sort_order,
+    }
+
+@app.route('/codes')
+def codes_page():
+    return render_template('codes.html', codes=get_codes())
+
+@app.route('/codes', methods=['POST'])
+def save_code_data():
+    try:
+        code_id = request.form.get('code_id', '').strip()
+        created = save_code(code_id, **code_form(request.form))
+        flash(f'코드 {code_id} {"등록" if created else "수정"} ✓', 'success')
+    except ValueError as e:
+        flash(f'입력 오류: {e}', 'error')
+    return redirect(url_for('codes_page'))
+
+@app.route('/codes/<code_id>/delete', methods=['POST'])
+def code_delete(code_id):
+    removed = delete_code(code_id)
+    if removed is None:
+        flash(f'알 수 없는 코드: {code_id}', 'error')
+    else:
+        flash(f'코드 {code_id} 삭제 (예측 {removed}세트 포함)', 'success')
+    return redirect(url_for('codes_page'))
+
+@app.route('/api/codes')
+def api_codes():
+    return jsonify({'codes': [{'code_id': code_id, **info} for code_id, info in get_codes().items()]})
+
+@app.route('/api/codes', methods=['POST'])
+@app.route('/api/codes/<code_id>', methods=['PUT'])
+def api_save_code(code_id=None):
+    body = request.get_json(silent=True) or {}
+    code_id = code_id or str(body.get('code_id', '')).strip()
+    try:
+        created = save_code(code_id, **code_form(body))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'code_id': code_id, 'created': created, **get_codes()[code_id]}), 201 if created else 200
+
+@app.route('/api/codes/<code_id>', methods=['DELETE'])
+def api_delete_code(code_id):
+    removed = delete_code(code_id)
+    if removed is None:
+        return jsonify({'error': f'알 수 없는 코드: {code_id}'}), 404
+    return jsonify({'code_id': code_id, 'removed_sets': removed})
+
+CODE_ROLLING_DEFAULT = 10
+
+def cached_code_drilldown(version, code_id, window):
+    """데이터 버전·코드·구간·이동 평균 크기별 코드 상세 분석 (예측 없는 코드면 None)"""
+    rolling = max(1, request.args.get('rolling', CODE_ROLLING_DEFAULT, type=int))
+    return dashboard_cache.get(version, ('code', code_id, rolling, window),
+                               lambda: get_code_drilldown(code_id, rolling, *window))
+
+@app.route('/code/<code_id>')
+def code_detail(code_id):
+    codes = get_codes()
+    if code_id not in codes:
+        flash(f'알 수 없는 코드: {code_id}', 'error')
+        return redirect(url_for('dashboard'))
+    window = dashboard_window()
+    data = cached_code_drilldown(get_data_version(), code_id, window)
+    return render_template('code.html', code_id=code_id, code=codes[code_id], data=data,
+                           data_json=script_json(data), last_n=window[0])
+
+@app.route('/api/code/<code_id>')
+def api_code(code_id):
+    if code_id not in get_codes():
+        return jsonify({'error': f'알 수 없는 코드: {code_id}'}), 404
+    data = cached_code_drilldown(get_data_version(), code_id, dashboard_window())
+    if data is None:
+        return jsonify({'error': f'{code_id} 예측 데이터가 없습니다'}), 404
+    return jsonify(data)
+
+LONG_POLL_MAX_SECONDS = 30
+
+@app.after_request
+def notify_change_watcher(response):
+    """쓰기 요청 뒤 같은 워커의 스트림이 주기를 기다리지 않도록 즉시 확인"""
+    if request.method in ('POST', 'PUT', 'DELETE'):
+        change_watcher.poke()
+    return response
+
+def changes_json(since):
+    """since 이후 변경분 JSON (같은 버전·since 의 스트림끼리 공유)"""
+    version = get_data_version()
+    return dashboard_cache.get(version, ('changes', since),
+                               lambda: json.dumps(get_changes(since), ensure_ascii=False))
+
+def change_since():
+    """클라이언트의 마지막 수신 버전 (Last-Event-ID 헤더 → since 인자 → 현재 버전)"""
+    last_id = request.headers.get('Last-Event-ID', '')
+    if last_id.isdigit():
+        return int(last_id)
+    since = request.args.get('since', type=int)
+    return since if since is not None else get_data_version()
+
+@app.route('/api/stream')
+def api_stream():
+    since = change_since()
+    response = app.response_class(
+        stream_with_context(events.stream(change_watcher, since, changes_json)),
+        mimetype='text/event-stream',
+    )
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 프록시 버퍼링 해제
+    return response
+
+@app.route('/api/changes')
+def api_changes():
+    """롱 폴링 대체 경로 — 변경이 생기거나 wait 초가 지나면 응답 (대기 자리가 없으면 즉시)"""
+    since = change_since()
+    wait = max(0, min(request.args.get('wait', 25, type=int), LONG_POLL_MAX_SECONDS))
+    headers = {'Cache-Control': 'no-cache'}
+    if wait and change_watcher.try_hold():
+        try:
+            change_watcher.wait(since, wait)
+        finally:
+            change_watcher.release()
+    elif wait:
+        # 대기 자리 없음 — 스레드를 붙잡지 않고 바로 응답, 클라이언트는 Retry-After 뒤 다시 요청
+        headers['Retry-After'] = str(events.SHORT_POLL_RETRY_MS // 1000)
+    return app.response_class(changes_json(since) + '\n', mimetype='application/json', headers=headers)
+
+@app.route('/api/numbers')
+def api_numbers():
+    version = get_data_version()
+    window = dashboard_window()
+    return jsonify(dashboard_cache.get(version, ('numbers', window), lambda: get_number_index(*window)))
+
+@app.route('/api/numbers/rolling')
+def api_numbers_rolling():
+    code_id = request.args.get('code', '')
+    if code_id not in get_codes():
+        return jsonify({'error': f'알 수 없는 코드: {code_id}'}), 404
+    version = get_data_version()
+    window = dashboard_window()
+    size = max(1, request.args.get('window', 50, type=int))
+    step = request.args.get('step', type=int)
+    return jsonify(dashboard_cache.get(
+        version, ('numbers_rolling', code_id, size, step, window),
+        lambda: get_number_rolling(code_id, size, step, *window)
+    ))
+
+@app.route('/api/prizes')
+def api_prizes():
+    """등수별 당첨 집계 + 기대 수익 (?prize1~prize5=금액&ticket=가격 으로 상금표 변경)"""
+    import prizes
+    overrides = {str(t): request.args.get(f'prize{t}') for t in prizes.TIERS}
+    overrides['ticket'] = request.args.get('ticket')
+    try:
+        table, ticket = prizes.prize_table(overrides)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    version = get_data_version()
+    window = dashboard_window()
+    key = tuple(sorted(table.items())) + (ticket,)
+    # 등수 개수는 구간별로 1회만 채점, 상금표별 금액 계산은 그 위에서
+    counts = dashboard_cache.get(version, ('prize_tiers', window), lambda: prizes.tier_counts(*window))
+    return jsonify(dashboard_cache.get(version, ('prizes', window, key),
+                                       lambda: prizes.prize_report(counts, table, ticket)))
+
+@app.route('/api/significance')
+def api_significance():
+    import significance
+    version = get_data_version()
+    window = dashboard_window()
+    trials = request.args.get('trials', significance.DEFAULT_TRIALS, type=int)
+    trials = max(1, min(trials, significance.MAX_TRIALS))
+    raw_seed = request.args.get('seed')
+    if raw_seed is None:
+        # 기본 시드 = 데이터 버전 → 같은 버전에서는 결과가 재현되므로 캐시에 보관
+        seed = version
+        compute = lambda: dashboard_cache.get(
+            version, ('significance', window, trials, seed),
+            lambda: significance.run_significance(get_code_round_series(*window), trials, seed)
+        )
+    else:
+        try:
+            seed = int(raw_seed)
+        except ValueError:
+            seed = -1
+        if not 0 <= seed <= significance.MAX_SEED:
+            return jsonify({'error': f'seed 는 0~{significance.MAX_SEED} 사이 정수여야 합니다.'}), 400
+        # 직접 준 시드는 요청마다 캐시를 밀어내지 않도록 저장하지 않고, 시행 횟수도 기본값까지만 허용
+        trials = min(trials, significance.DEFAULT_TRIALS)
+        compute = lambda: significance.run_significance(get_code_round_series(*window), trials, seed)
+    try:
+        result = compute()
+    except significance.Busy as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '10'}
+    return jsonify({'data_version': version, 'seed': seed, **result})
+
+EXPORT_MIMETYPES = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson', 'npz': 'application/zip'}
+
+@app.route('/export/results.<any(csv, jsonl, npz):fmt>')
+def export_results(fmt):
+    import export
+    filters = {
+        'from_round': request.args.get('from', type=int),
+        'to_round': request.args.get('to', type=int),
+        'code_id': request.args.get('code') or None,
+    }
+    filename = f'lotto_results.{fmt}'
+    if fmt == 'npz':
+        # zip 목차는 끝에 쓰이므로 임시 파일에 만든 뒤 전송 (메모리 사용은 일정)
+        tmp = tempfile.TemporaryFile()
+        export.write_npz(tmp, **filters)
+        tmp.seek(0)
+        return send_file(tmp, mimetype=EXPORT_MIMETYPES[fmt], as_attachment=True, download_name=filename)
+    chunks = export.stream_csv(**filters) if fmt == 'csv' else export.stream_jsonl(**filters)
+    response = app.response_class(stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+@app.route('/metrics')
+def metrics():
+    if not instrumentation.ENABLED:
+        return 'instrumentation disabled (LOTTO_INSTRUMENT=1)\n', 404
+    return app.response_class(instrumentation.render_metrics(),
+                              content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/cache/stats')
+def api_cache_stats():
+    return jsonify({'data_version': get_data_version(), 'dashboard': dashboard_cache.stats(),
+                    'round_detail': round_detail_cache_stats()})
 
 @app.route('/api/round/<int:round_number>/status')
 def api_round_status(round_number):
-    data = get_round_data(round_number)
-    if not data:
+    statuses = get_rounds_status(round_number, round_number)
+    if not statuses:
         return jsonify({'exists': False})
-    status = {}
-    for code_id in CODES:
-        if code_id in data['predictions']:
-            status[code_id] = {'entered': True, 'sets': len(data['predictions'][code_id])}
-        else:
-            status[code_id] = {'entered': False, 'sets': 0}
-    return jsonify({'exists': True, 'round_number': round_number, 'actual': data['actual'], 'codes': status})
+    return jsonify({'exists': True, **statuses[0]})
+
+@app.route('/api/rounds/status')
+def api_rounds_status():
+    from_round = request.args.get('from', type=int)
+    to_round = request.args.get('to', type=int)
+    return jsonify({'rounds': get_rounds_status(from_round, to_round)})
+
+@app.cli.command('rebuild-scores')
+def rebuild_scores_command():
+    """회차 성과표(round_scores) 전체 재구축"""
+    count = rebuild_round_scores()
+    print(f'round_scores {count}행 재구축 완료')
+
+@app.cli.command('check-aggregates')
+def check_aggregates_command():
+    """누적 집계(score_aggregates)를 전체 재계산과 비교"""
+    mismatches = check_aggregates()
+    if not mismatches:
+        print('누적 집계 일치 ✓')
+        return
+    for m in mismatches:
+        print(f"불일치 {m['kind']}/{m['source']}: 기대 {m['expected']} / 저장 {m['actual']}")
+    print('flask rebuild-scores 로 재구축하세요.')
+    raise SystemExit(1)
+
+@app.cli.command('db-migrate')
+def db_migrate_command():
+    """스키마 마이그레이션 + 백필 적용 및 버전 확인 (배포 시 1회)"""
+    for version, description in init_db():
+        print(f'마이그레이션 {version} 적용: {description}')
+    print(f'스키마 버전 {migrations.current_version(get_db())} / 최신 {migrations.LATEST_VERSION}')
+
+@app.cli.command('check-baseline')
+@click.option('--sets', 'set_counts', type=int, multiple=True, help='세트 수 (여러 번 지정 가능, 기본: 코드별 세트 수)')
+@click.option('--trials', type=int, default=1_000_000, show_default=True, help='몬테카를로 추첨 횟수')
+@click.option('--seed', type=int, default=None)
+def check_baseline_command(set_counts, trials, seed):
+    """랜덤 기준선 정확값을 몬테카를로 시뮬레이션과 비교"""
+    for k in set_counts or sorted({info['sets'] for info in get_codes().values()}):
+        exact = baseline.analytic_baseline(k)
+        sampled = baseline.monte_carlo_baseline(k, trials, seed)
+        print(f"{k}세트: 최대일치 기댓값 {exact['expected_max']:.4f} / "
+              f"시뮬레이션 {sampled['expected_max']:.4f} ± {sampled['expected_max_stderr']:.4f}")
+        for t in baseline.TIERS:
+            key = f'p_max_{t}plus'
+            print(f"  P(최대 ≥ {t}) {exact[key]:.6f} / {sampled[key]:.6f}")
+
+@app.cli.command('export-results')
+@click.argument('path')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl', 'npz']), default=None,
+              help='기본: 파일 확장자')
+@click.option('--from', 'from_round', type=int, default=None, help='시작 회차')
+@click.option('--to', 'to_round', type=int, default=None, help='끝 회차')
+@click.option('--code', 'code_id', default=None, help='코드 ID')
+def export_results_command(path, fmt, from_round, to_round, code_id):
+    """회차 × 코드 × 세트 채점 결과 내보내기 (CSV/JSONL/NPZ)"""
+    import export
+    fmt = fmt or os.path.splitext(path)[1].lstrip('.').lower()
+    if fmt not in EXPORT_MIMETYPES:
+        raise click.BadParameter(f'지원하지 않는 형식: {fmt}', param_hint='--format')
+    count = export.export_to_file(path, fmt, from_round=from_round, to_round=to_round, code_id=code_id)
+    print(f'{count}세트 내보내기 완료: {path}')
+
+@app.cli.command('import-data')
+@click.argument('path')
+@click.option('--kind', type=click.Choice(['draws', 'predictions']), required=True,
+              help='draws: 당첨 번호, predictions: 예측 세트')
+def import_data_command(path, kind):
+    """CSV/JSONL 파일 일괄 가져오기"""
+    report = import_file(path, kind)
+    print(format_report(report))
+    for message in report['error_samples'] + report['warnings']:
+        print(f'  - {message}')
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,96 @@
+"""
+로또 예측 성능 분석 대시보드 - 랜덤 기준선 (초기하분포 정확 계산 + 몬테카를로 검증)
+
+무작위 세트 1개가 당첨 번호 6개 중 m개를 맞힐 확률은 초기하분포
+C(6,m)·C(39,6-m) / C(45,6) 이고, 서로 독립인 k세트의 최대 일치 수 분포는
+P(max ≤ m) = F(m)^k 로 정확히 구할 수 있다. 결과는 세트 수 k 별로 캐시한다.
+"""
+
+from functools import lru_cache
+from math import comb
+
+import scoring
+
+PICK = 6
+TIERS = (3, 4, 5)
+MONTE_CARLO_CHUNK = 200_000  # 몬테카를로 1회 배치의 추첨 수 (메모리 상한)
+
+
+@lru_cache(maxsize=None)
+def match_pmf():
+    """무작위 세트 1개의 일치 수 분포 → (P(0), ..., P(6))"""
+    total = comb(scoring.MAX_NUMBER, PICK)
+    return tuple(
+        comb(PICK, m) * comb(scoring.MAX_NUMBER - PICK, PICK - m) / total
+        for m in range(PICK + 1)
+    )
+
+
+@lru_cache(maxsize=None)
+def max_match_pmf(k):
+    """무작위 k세트의 최대 일치 수 분포 → (P(max=0), ..., P(max=6))"""
+    if k < 1:
+        raise ValueError('세트 수는 1 이상이어야 합니다')
+    cdf, acc = [], 0.0
+    for p in match_pmf():
+        acc += p
+        cdf.append(min(acc, 1.0) ** k)
+    return tuple(cdf[m] - (cdf[m - 1] if m else 0.0) for m in range(PICK + 1))
+
+
+@lru_cache(maxsize=None)
+def analytic_baseline(k):
+    """무작위 k세트 기준선 (정확값)
+
+    expected_max: 회차당 최대 일치 수 기댓값
+    p_max_Nplus: 최대 일치 수가 N 이상일 확률
+    sets_Nplus: 회차당 N개 이상 맞힌 세트 수 기댓값
+    """
+    pmf, max_pmf = match_pmf(), max_match_pmf(k)
+    result = {'k': k, 'expected_max': sum(m * p for m, p in enumerate(max_pmf))}
+    for t in TIERS:
+        result[f'p_max_{t}plus'] = sum(max_pmf[t:])
+        result[f'sets_{t}plus'] = k * sum(pmf[t:])
+    return result
+
+
+def expected_max_match(k):
+    """무작위 k세트의 회차당 최대 일치 수 기댓값"""
+    return analytic_baseline(k)['expected_max']
+
+
+def monte_carlo_baseline(k, trials=1_000_000, seed=None):
+    """무작위 k세트 기준선 몬테카를로 추정 (analytic_baseline 교차 검증용)
+
+    추첨 trials 회를 MONTE_CARLO_CHUNK 단위로 나눠 벡터화 채점한다.
+    expected_max_stderr 는 평균의 표준오차.
+    """
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    max_hist = np.zeros(PICK + 1, dtype=np.int64)
+    set_hist = np.zeros(PICK + 1, dtype=np.int64)
+    max_sq_sum = 0
+    done = 0
+    while done < trials:
+        n = min(MONTE_CARLO_CHUNK, trials - done)
+        draws = scoring.random_sets(n, rng)
+        sets = scoring.random_sets(n * k, rng)
+        matches = scoring.score_sets(draws, sets, np.repeat(np.arange(n), k))
+        maxes = matches.reshape(n, k).max(axis=1)
+        max_hist += np.bincount(maxes, minlength=PICK + 1)
+        set_hist += np.bincount(matches, minlength=PICK + 1)
+        max_sq_sum += int((maxes.astype(np.int64) ** 2).sum())
+        done += n
+
+    mean = float(np.arange(PICK + 1) @ max_hist) / trials
+    variance = max(max_sq_sum / trials - mean ** 2, 0.0)
+    result = {
+        'k': k,
+        'trials': trials,
+        'expected_max': mean,
+        'expected_max_stderr': (variance / trials) ** 0.5,
+    }
+    for t in TIERS:
+        result[f'p_max_{t}plus'] = float(max_hist[t:].sum()) / trials
+        result[f'sets_{t}plus'] = float(set_hist[t:].sum()) / trials
+    return result
@@ -0,0 +1,310 @@
+"""
+로또 예측 성능 분석 대시보드 - 합성 DB 생성기 + 성능 벤치마크
+
+사용법:
+    python bench.py                                   # 100 / 1k / 10k 회차 → bench_report.json
+    python bench.py --sizes 100 1000 --codes 20 --repeat 5 --out report.json
+    python bench.py --sizes 1000 --codes 200                  # 코드 200개 (합성 코드 193개 등록)
+    python bench.py --compare previous.json --threshold 1.5   # 느려진 항목이 있으면 종료 코드 1
+
+항목마다 실행 시간(최소/중앙값), tracemalloc 최대 메모리(별도 1회 실행), SQL 쿼리 수를 기록한다.
+라우트는 Flask 테스트 클라이언트로 호출하며 대시보드 / 회차 상세 캐시를 비운 콜드 상태로 측정한다.
+시작 항목(kind='startup')은 새 인터프리터를 띄워 워커 부팅 단계를 재며, 메모리는 자식 프로세스 최대 RSS 다.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_REPEAT = 3
+PREDICTION_COVERAGE = 0.9  # 회차 × 코드 중 예측이 입력된 비율
+SYNTHETIC_CODE_SETS = (5, 5, 5, 10, 21)  # 추가 합성 코드의 세트 수 순환
+
+
+def _models():
+    """DATABASE_PATH 설정 후에 가져오기 (app 은 가져올 때 스키마 버전을 확인하고 필요하면 초기화한다)"""
+    import app
+    import models
+    return app, models
+
+
+def register_codes(models, n_codes):
+    """코드 수가 기본 7개보다 많으면 합성 코드를 codes 테이블에 등록 → 사용할 코드 ID 목록 (앱 컨텍스트 안에서)"""
+    existing = len(models.get_codes())
+    for i in range(existing, n_codes):
+        models.save_code(
+            f'S{i + 1:03d}', f'Synthetic {i + 1}', SYNTHETIC_CODE_SETS[i % len(SYNTHETIC_CODE_SETS)],
+            '#64748B', f'S{i + 1:02d}',
+        )
+    return list(models.get_codes())[:n_codes]
+
+
+def generate_database(path, n_rounds, n_codes=7, seed=0, coverage=PREDICTION_COVERAGE):
+    """합성 DB 생성 → 생성 정보 dict
+
+    회차는 1회부터 주 1회 추첨, 각 코드는 coverage 확률로 자기 세트 수만큼 예측을 입력한다.
+    """
+    app, models = _models()
+    models.DB_PATH = path
+    rng = random.Random(seed)
+    first = date(2002, 12, 7)
+
+    started = time.perf_counter()
+    with app.app.app_context():
+        models.init_db()
+        code_ids = register_codes(models, n_codes)
+        codes = models.get_codes()
+        models.bulk_save_rounds(
+            (rn, (first + timedelta(weeks=rn - 1)).isoformat(), rng.sample(range(1, 46), 6),
+             rng.randint(1, 45))
+            for rn in range(1, n_rounds + 1)
+        )
+        result = models.bulk_save_predictions(
+            (rn, code_id, rng.sample(range(1, 46), 6))
+            for rn in range(1, n_rounds + 1)
+            for code_id in code_ids
+            if rng.random() < coverage
+            for _ in range(codes[code_id]['sets'])
+        )
+    return {
+        'rounds': n_rounds,
+        'codes': len(code_ids),
+        'prediction_sets': result['saved'],
+        'build_seconds': round(time.perf_counter() - started, 3),
+        'db_bytes': os.path.getsize(path),
+    }
+
+
+def _measure(name, kind, fn, repeat):
+    """fn() 을 repeat 회 실행해 시간 측정 + tracemalloc 추적 1회로 최대 메모리 측정
+
+    fn 은 실행한 쿼리 수를 반환한다 (시간 측정은 tracemalloc 오버헤드 없이 수행).
+    """
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        queries = fn()
+        times.append(time.perf_counter() - started)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'name': name,
+        'kind': kind,
+        'seconds_min': round(min(times), 6),
+        'seconds_median': round(statistics.median(times), 6),
+        'peak_kib': round(peak / 1024, 1),
+        'queries': queries,
+    }
+
+
+def _force_migration(path):
+    """DB 사본의 스키마 버전과 파생 데이터를 지워 init_db 가 전체 마이그레이션 + 백필을 다시 하게 함 → 사본 경로"""
+    copy = path + '.migrate'
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(copy + suffix):
+            os.remove(copy + suffix)
+    with sqlite3.connect(path) as src, sqlite3.connect(copy) as dst:
+        src.backup(dst)
+        for table in ('rounds', 'predictions', 'random_baselines'):
+            dst.execute(f"UPDATE {table} SET mask = NULL")
+        dst.execute("UPDATE round_scores SET numbers = NULL")
+        dst.execute("DELETE FROM score_aggregates")
+        dst.execute("DELETE FROM round_details")
+        dst.execute("PRAGMA user_version = 0")
+    return copy
+
+
+# 새 인터프리터에서 실행할 워커 부팅 단계 (이름, 코드, DB 준비 함수) — 끝에 자식 최대 RSS(KiB)를 출력한다
+# (ru_maxrss 는 exec 전 부모의 RSS 가 남으므로 /proc 의 VmHWM 을 쓰고, 없으면 ru_maxrss)
+# 준비 함수는 매 실행 전(측정 밖)에 호출되며 실행에 쓸 DB 경로를 돌려준다.
+STARTUP_CASES = [
+    ('startup: import app', 'import app', None),
+    ('startup: import app + GET /', "import app; app.app.test_client().get('/')", None),
+    # 스키마가 최신인 DB 에서 init_db 를 다시 부를 때 — 버전 / 백필 필요 여부 검사만 한다
+    ('startup: import app + init_db (current)', 'import app, models; models.init_db()', None),
+    # 스키마 변경 후 첫 부팅 — 전체 마이그레이션 + 백필 (on_starting 이 배포당 1회 치르는 비용)
+    ('startup: init_db (migrate + backfill)', 'import models; models.init_db()', _force_migration),
+]
+RSS_SUFFIX = """
+import os, resource
+if os.path.exists('/proc/self/status'):
+    print(next(line.split()[1] for line in open('/proc/self/status') if line.startswith('VmHWM')))
+else:
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def measure_startup(path, repeat):
+    """DB 가 준비된 상태에서 워커 부팅 단계별 시간 (프로세스 시작 포함) → 결과 목록"""
+    env = {**os.environ, 'DATABASE_PATH': path, 'LOTTO_WARMUP': '0'}
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for name, code, prepare in STARTUP_CASES:
+        times, peak = [], 0
+        for _ in range(repeat):
+            case_env = {**env, 'DATABASE_PATH': prepare(path)} if prepare else env
+            started = time.perf_counter()
+            out = subprocess.run([sys.executable, '-c', code + RSS_SUFFIX], cwd=cwd, env=case_env,
+                                 capture_output=True, text=True, check=True).stdout
+            times.append(time.perf_counter() - started)
+            peak = max(peak, int(out.split()[-1]))
+        results.append({
+            'name': name,
+            'kind': 'startup',
+            'seconds_min': round(min(times), 6),
+            'seconds_median': round(statistics.median(times), 6),
+            'peak_kib': float(peak),
+            'queries': None,
+        })
+    return results
+
+
+def _cases(app, models, n_rounds, rng):
+    """(이름, 종류, 호출 함수) 목록 — 호출 함수는 실행한 쿼리 수를 반환"""
+    latest = n_rounds
+    status_from = max(1, latest - 49)
+    sets_5 = [rng.sample(range(1, 46), 6) for _ in range(5)]
+    client = app.app.test_client()
+
+    def model_call(fn, *args, **kwargs):
+        def run():
+            models.clear_round_detail_cache()
+            with app.app.app_context():
+                fn(*args, **kwargs)
+                return models.db_stats()['queries']
+        return run
+
+    def route_call(path, method='get', **kwargs):
+        def run():
+            app.dashboard_cache.clear()
+            models.clear_round_detail_cache()
+            response = getattr(client, method)(path, **kwargs)
+            assert response.status_code < 400, f'{path} → {response.status_code}'
+            return int(response.headers.get('X-DB-Queries', 0))
+        return run
+
+    return [
+        ('get_dashboard_data', 'model', model_call(models.get_dashboard_data)),
+        ('get_dashboard_data(last_n=100)', 'model', model_call(models.get_dashboard_data, last_n=100)),
+        ('get_round_detail_analysis', 'model', model_call(models.get_round_detail_analysis, latest)),
+        ('get_rounds_status(50)', 'model', model_call(models.get_rounds_status, status_from, latest)),
+        ('get_rounds_page', 'model', model_call(models.get_rounds_page, limit=50)),
+        ('get_code_performance(2607)', 'model', model_call(models.get_code_performance, '2607')),
+        ('get_code_drilldown(2607)', 'model', model_call(models.get_code_drilldown, '2607')),
+        ('save_predictions', 'model', model_call(models.save_predictions, latest, '2601', sets_5)),
+        ('GET /', 'route', route_call('/')),
+        ('GET /api/dashboard', 'route', route_call('/api/dashboard')),
+        ('GET /round/<n>', 'route', route_call(f'/round/{latest}')),
+        ('GET /api/round/<n>', 'route', route_call(f'/api/round/{latest}')),
+        ('GET /api/rounds/compare(50)', 'route', route_call(f'/api/rounds/compare?from={status_from}&to={latest}')),
+        ('GET /api/round/<n>/status', 'route', route_call(f'/api/round/{latest}/status')),
+        ('GET /api/rounds/status', 'route', route_call(f'/api/rounds/status?from={status_from}&to={latest}')),
+        ('GET /history', 'route', route_call('/history')),
+        ('GET /api/code/<id>', 'route', route_call('/api/code/2607')),
+        ('GET /api/prizes', 'route', route_call('/api/prizes')),
+        ('GET /codes', 'route', route_call('/codes')),
+        ('GET /api/codes', 'route', route_call('/api/codes')),
+        ('POST /input/predictions', 'route', route_call('/input/predictions', method='post', data={
+            'pred_round_number': latest, 'code_id': '2601',
+            'prediction_text': '\n'.join(' '.join(map(str, s)) for s in sets_5),
+        })),
+    ]
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, n_codes=7, repeat=DEFAULT_REPEAT, seed=0, workdir=None):
+    """크기별 합성 DB 생성 후 전체 항목 측정 → 보고서 dict"""
+    workdir = workdir or tempfile.mkdtemp(prefix='lotto-bench-')
+    os.environ['DATABASE_PATH'] = os.path.join(workdir, 'startup.db')
+    app, models = _models()
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'sizes': {},
+    }
+    for n_rounds in sizes:
+        path = os.path.join(workdir, f'bench_{n_rounds}.db')
+        if os.path.exists(path):
+            os.remove(path)
+        info = generate_database(path, n_rounds, n_codes, seed)
+        print(f"[{n_rounds}회차] DB 생성 {info['build_seconds']}초 "
+              f"({info['prediction_sets']}세트, {info['db_bytes'] // 1024}KiB)", file=sys.stderr)
+
+        results = []
+        for name, kind, fn in _cases(app, models, n_rounds, random.Random(seed)):
+            result = _measure(name, kind, fn, repeat)
+            results.append(result)
+            print(f"  {name:<34} {result['seconds_median'] * 1000:9.2f}ms "
+                  f"{result['peak_kib']:10.1f}KiB {result['queries']:5}q", file=sys.stderr)
+        for result in measure_startup(path, repeat):
+            results.append(result)
+            print(f"  {result['name']:<34} {result['seconds_median'] * 1000:9.2f}ms "
+                  f"{result['peak_kib']:10.1f}KiB (RSS)", file=sys.stderr)
+        report['sizes'][str(n_rounds)] = {**info, 'results': results}
+    return report
+
+
+def compare_reports(previous, current, threshold=1.5, min_seconds=0.001):
+    """이전 보고서 대비 중앙값이 threshold 배 이상 느려졌거나 쿼리 수가 늘어난 항목 목록"""
+    regressions = []
+    for size, data in current['sizes'].items():
+        before = {r['name']: r for r in previous.get('sizes', {}).get(size, {}).get('results', [])}
+        for r in data['results']:
+            old = before.get(r['name'])
+            if not old:
+                continue
+            slower = (r['seconds_median'] >= min_seconds
+                      and r['seconds_median'] > old['seconds_median'] * threshold)
+            more_queries = (r['queries'] or 0) > (old['queries'] or 0)
+            if slower or more_queries:
+                regressions.append({
+                    'size': size,
+                    'name': r['name'],
+                    'seconds': [old['seconds_median'], r['seconds_median']],
+                    'queries': [old['queries'], r['queries']],
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='로또 대시보드 성능 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='회차 수 목록')
+    parser.add_argument('--codes', type=int, default=7, help='코드 수 (7 초과분은 합성 코드)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='항목별 반복 횟수')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='bench_report.json', help='JSON 보고서 경로')
+    parser.add_argument('--compare', help='비교할 이전 JSON 보고서')
+    parser.add_argument('--threshold', type=float, default=1.5, help='회귀 판정 배율')
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.codes, args.repeat, args.seed)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            report['regressions'] = compare_reports(json.load(f), report, args.threshold)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f'보고서 저장: {args.out}', file=sys.stderr)
+
+    for r in report.get('regressions', []):
+        print(f"회귀 [{r['size']}회차] {r['name']}: {r['seconds'][0]}s → {r['seconds'][1]}s, "
+              f"쿼리 {r['queries'][0]} → {r['queries'][1]}", file=sys.stderr)
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
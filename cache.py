@@ -0,0 +1,101 @@
+"""
+로또 예측 성능 분석 대시보드 - 데이터 버전 기반 응답 캐시
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class VersionedCache:
+    """데이터 버전별 메모이제이션 — 더 새 버전이 들어오면 이전 항목을 모두 폐기"""
+
+    def __init__(self, max_entries=64):
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._version = None
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version, key, compute):
+        """(version, key) 캐시 조회, 없으면 compute() 결과를 저장 후 반환"""
+        with self._lock:
+            if self._version is None or version > self._version:
+                self._entries.clear()
+                self._version = version
+            if version == self._version and key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+        with self._lock:
+            if version == self._version:
+                if len(self._entries) >= self._max_entries:
+                    self._entries.clear()
+                self._entries[key] = value
+        return value
+
+    def clear(self):
+        """모든 항목 폐기 (벤치마크의 콜드 측정용)"""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self):
+        """적중/미스 카운터"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'version': self._version,
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else None,
+            }
+
+
+class LRUCache:
+    """키별 최근 사용 순 캐시 — 개별 항목 무효화(discard) 지원"""
+
+    def __init__(self, max_entries=256):
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """적중/미스 카운터"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else None,
+            }
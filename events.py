@@ -0,0 +1,121 @@
+"""
+로또 예측 성능 분석 대시보드 - 데이터 변경 알림 (Server-Sent Events / 롱 폴링)
+
+워커 프로세스마다 감시 스레드 하나가 meta.data_version 을 주기적으로 읽고,
+스트림/롱 폴링 요청은 Condition 으로 버전 변화를 기다린다 — 클라이언트 수와 무관하게
+DB 폴링은 워커당 1개다. 다른 워커의 쓰기도 같은 DB 버전으로 감지된다.
+
+대기하는 연결은 요청 스레드를 붙잡으므로 워커당 동시 대기 수를 slots 개로 제한한다.
+자리가 없으면 기다리지 않고 현재 변경분만 보낸 뒤 SHORT_POLL_RETRY_MS 후 다시 접속하게 한다
+(SSE 는 retry 필드, 롱 폴링은 Retry-After 헤더) — 나머지 스레드는 일반 요청 몫으로 남는다.
+"""
+
+import json
+import os
+import threading
+import time
+
+POLL_INTERVAL = 0.5       # 감시 스레드의 버전 확인 주기 (초)
+HEARTBEAT_SECONDS = 15    # 변경이 없을 때 연결 유지용 주석 전송 주기
+STREAM_MAX_SECONDS = 300  # 스트림 1개의 최대 유지 시간 (이후 클라이언트가 Last-Event-ID 로 재연결)
+RETRY_MS = 3000           # 클라이언트 재연결 대기 (SSE retry 필드)
+SHORT_POLL_RETRY_MS = 15000  # 대기 자리가 없을 때 재접속 간격
+STREAM_SLOTS = int(os.environ.get('LOTTO_STREAM_SLOTS', 4))  # 워커당 동시 대기 연결 수 (gunicorn 은 스레드 수 / 4)
+
+
+class ChangeWatcher:
+    """데이터 버전 감시 — 첫 wait() 때 (프로세스별로) 감시 스레드를 시작"""
+
+    def __init__(self, read_version, interval=POLL_INTERVAL, slots=STREAM_SLOTS):
+        self._read_version = read_version  # 앱 컨텍스트 밖에서 호출 가능한 버전 조회 함수
+        self._interval = interval
+        self.set_slots(slots)
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._version = None
+        self._pid = None
+
+    def _ensure_started(self):
+        with self._cond:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._version = self._read_version()
+        threading.Thread(target=self._run, name='change-watcher', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self._interval)
+            self._wake.clear()
+            try:
+                version = self._read_version()
+            except Exception:
+                continue  # 잠금 경합 등 일시 오류 — 다음 주기에 다시 확인
+            with self._cond:
+                if version != self._version:
+                    self._version = version
+                    self._cond.notify_all()
+
+    def set_slots(self, slots):
+        """동시 대기 연결 수 설정 (워커 시작 시, 요청을 받기 전에)"""
+        self.slots = max(0, slots)
+        self._slots = threading.BoundedSemaphore(self.slots) if self.slots else None
+
+    def try_hold(self):
+        """대기 자리 1개 확보 (없으면 즉시 False) — 성공하면 release() 필수"""
+        return self._slots is not None and self._slots.acquire(blocking=False)
+
+    def release(self):
+        self._slots.release()
+
+    def poke(self):
+        """같은 프로세스에서 쓰기가 끝났을 때 즉시 확인 요청"""
+        self._wake.set()
+
+    def wait(self, since, timeout):
+        """버전이 since 와 달라질 때까지 최대 timeout 초 대기 → 현재 버전"""
+        self._ensure_started()
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != since, timeout)
+            return self._version
+
+
+def format_event(event, data, event_id=None):
+    """SSE 메시지 1개 (data 는 JSON 문자열 또는 직렬화할 객체)"""
+    if not isinstance(data, str):
+        data = json.dumps(data, ensure_ascii=False)
+    lines = [f'id: {event_id}'] if event_id is not None else []
+    lines.append(f'event: {event}')
+    lines.extend(f'data: {line}' for line in data.split('\n'))
+    return '\n'.join(lines) + '\n\n'
+
+
+def stream(watcher, since, changes_json, max_seconds=STREAM_MAX_SECONDS, heartbeat=HEARTBEAT_SECONDS):
+    """SSE 텍스트 조각 생성기
+
+    changes_json(since) → since 이후 변경분 JSON 문자열 ('version' 키 포함 객체 직렬화)
+    대기 자리가 없으면 현재까지의 변경분만 보내고 바로 끝낸다 (재접속 간격 SHORT_POLL_RETRY_MS).
+    """
+    if not watcher.try_hold():
+        yield f'retry: {SHORT_POLL_RETRY_MS}\n\n'
+        version = watcher.wait(since, 0)
+        if version != since:
+            yield format_event('change', changes_json(since), event_id=version)
+        return
+
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        last = since
+        deadline = time.monotonic() + max_seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            version = watcher.wait(last, min(heartbeat, remaining))
+            if version != last:
+                yield format_event('change', changes_json(last), event_id=version)
+                last = version
+            else:
+                yield ': keep-alive\n\n'
+    finally:
+        watcher.release()
@@ -0,0 +1,176 @@
+"""
+로또 예측 성능 분석 대시보드 - 채점 결과 스트리밍 내보내기 (CSV / JSONL / NPZ 열 형식)
+
+행 = 회차 × 코드 × 세트. 일치 수는 비트마스크 popcount 로 SQL 에서 계산하고,
+커서에서 fetchmany 단위로 읽어 바로 내보내므로 메모리 사용량이 이력 길이와 무관하다.
+
+NPZ 는 np.load 로 바로 읽을 수 있는 열 배열 묶음이다:
+    round_number (N,) int32, code (N,) int16 — code_ids 의 인덱스, set_number (N,) int16,
+    numbers (N, 6) int8, match_count (N,) int8, code_ids (C,) str,
+    draw_round_number (R,) int32, draw_numbers (R, 6) int8, draw_bonus (R,) int8 (없으면 0)
+열은 임시 memmap 파일에 나눠 채운 뒤 zip 항목으로 복사한다.
+"""
+
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+
+import numpy as np
+from numpy.lib import format as npy_format
+
+from models import _where, _window_condition, get_codes, get_db
+
+FETCH_SIZE = 5000
+COLUMNS = ['round_number', 'draw_date', 'code_id', 'set_number',
+           'num1', 'num2', 'num3', 'num4', 'num5', 'num6', 'match_count']
+
+# rounds 를 바깥 루프로 고정(CROSS JOIN)해 round_number 인덱스 순서 + predictions 유일 인덱스 탐색으로
+# 정렬 없이 스트리밍한다
+EXPORT_QUERY = """
+    SELECT r.round_number, r.draw_date, p.code_id, p.set_number,
+           p.num1, p.num2, p.num3, p.num4, p.num5, p.num6,
+           popcount(p.mask & r.mask) AS match_count
+    FROM rounds r CROSS JOIN predictions p ON p.round_id = r.id
+    {where}
+    ORDER BY r.round_number, p.code_id, p.set_number
+"""
+
+
+def _filters(from_round=None, to_round=None, code_id=None):
+    """내보내기 범위 → (WHERE 절, 파라미터) — 회차 구간은 대시보드와 같은 조건"""
+    conds, params = _window_condition(from_round=from_round, to_round=to_round)
+    if code_id is not None:
+        conds.append("p.code_id = ?")
+        params.append(code_id)
+    return _where(*conds), params
+
+
+def iter_batches(from_round=None, to_round=None, code_id=None, size=FETCH_SIZE):
+    """채점 결과 행을 size 개씩 순차 반환 (튜플, COLUMNS 순서)"""
+    where, params = _filters(from_round, to_round, code_id)
+    cursor = get_db().execute(EXPORT_QUERY.format(where=where), params)
+    try:
+        while True:
+            rows = cursor.fetchmany(size)
+            if not rows:
+                break
+            yield [tuple(row) for row in rows]
+    finally:
+        cursor.close()
+
+
+def stream_csv(**filters):
+    """CSV 텍스트 조각 생성기 (헤더 포함)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(COLUMNS)
+    for rows in iter_batches(**filters):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+# 숫자 열은 그대로, 문자열 열(draw_date, code_id)만 json.dumps 로 이스케이프
+JSONL_TEMPLATE = '{' + ', '.join(f'"{c}": %s' for c in COLUMNS) + '}\n'
+
+
+def stream_jsonl(**filters):
+    """JSONL 텍스트 조각 생성기 (한 줄 = 세트 1개, 키는 COLUMNS)"""
+    dumps = json.dumps
+    for rows in iter_batches(**filters):
+        yield ''.join(
+            JSONL_TEMPLATE % (row[0], dumps(row[1], ensure_ascii=False), dumps(row[2], ensure_ascii=False),
+                              *row[3:])
+            for row in rows
+        )
+
+
+def _copy_into_zip(zf, name, path):
+    with open(path, 'rb') as src, zf.open(name, 'w', force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+
+
+def write_npz(target, from_round=None, to_round=None, code_id=None):
+    """열 형식 NPZ 쓰기 (target: 경로 또는 쓰기 가능한 바이너리 파일) → 세트 행 수
+
+    행 수를 먼저 세고 같은 읽기 트랜잭션 안에서 채우므로 도중의 쓰기와 섞이지 않는다.
+    """
+    conn = get_db()
+    where, params = _filters(from_round, to_round, code_id)
+    code_ids = list(get_codes())
+    code_index = {c: i for i, c in enumerate(code_ids)}
+
+    conn.execute("BEGIN")
+    try:
+        n = conn.execute(
+            f"SELECT COUNT(*) FROM rounds r CROSS JOIN predictions p ON p.round_id = r.id {where}", params
+        ).fetchone()[0]
+        round_where, round_params = _filters(from_round, to_round)
+        draws = conn.execute(
+            f"SELECT r.round_number, r.num1, r.num2, r.num3, r.num4, r.num5, r.num6, COALESCE(r.bonus, 0) "
+            f"FROM rounds r {round_where} ORDER BY r.round_number",
+            round_params
+        ).fetchall()
+
+        with tempfile.TemporaryDirectory(prefix='lotto-export-') as tmp:
+            specs = {
+                'round_number': (np.int32, (n,)),
+                'code': (np.int16, (n,)),
+                'set_number': (np.int16, (n,)),
+                'numbers': (np.int8, (n, 6)),
+                'match_count': (np.int8, (n,)),
+            }
+            columns = {
+                name: npy_format.open_memmap(os.path.join(tmp, f'{name}.npy'), mode='w+', dtype=dtype, shape=shape)
+                for name, (dtype, shape) in specs.items()
+            }
+            done = 0
+            for rows in iter_batches(from_round, to_round, code_id):
+                m = len(rows)
+                batch = np.array([(row[0],) + row[3:] for row in rows], dtype=np.int32)  # 문자열 열 제외
+                columns['round_number'][done:done + m] = batch[:, 0]
+                columns['code'][done:done + m] = [code_index.get(row[2], -1) for row in rows]
+                columns['set_number'][done:done + m] = batch[:, 1]
+                columns['numbers'][done:done + m] = batch[:, 2:8]
+                columns['match_count'][done:done + m] = batch[:, 8]
+                done += m
+            for column in columns.values():
+                column.flush()
+            del columns
+
+            draws = np.array(draws, dtype=np.int32).reshape(-1, 8)
+            small = {
+                'code_ids': np.array(code_ids),
+                'draw_round_number': draws[:, 0],
+                'draw_numbers': draws[:, 1:7].astype(np.int8),
+                'draw_bonus': draws[:, 7].astype(np.int8),
+            }
+            with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zf:
+                for name in specs:
+                    _copy_into_zip(zf, f'{name}.npy', os.path.join(tmp, f'{name}.npy'))
+                for name, array in small.items():
+                    with zf.open(f'{name}.npy', 'w') as dst:
+                        npy_format.write_array(dst, array)
+    finally:
+        conn.rollback()
+    return n
+
+
+def export_to_file(path, fmt, **filters):
+    """파일로 내보내기 (CLI) → 세트 행 수"""
+    if fmt == 'npz':
+        return write_npz(path, **filters)
+    chunks = stream_csv(**filters) if fmt == 'csv' else stream_jsonl(**filters)
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for chunk in chunks:
+            f.write(chunk)
+            count += chunk.count('\n')
+    return count - 1 if fmt == 'csv' else count
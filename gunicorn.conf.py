@@ -0,0 +1,50 @@
+"""
+로또 예측 성능 분석 대시보드 - gunicorn 설정 (시작 시 1회 마이그레이션 + 대시보드 캐시 예열)
+
+바인드 주소, 워커 수, 워커 클래스는 Procfile / render.yaml 의 명령줄 인자로 지정한다.
+
+환경 변수:
+    LOTTO_PRELOAD=1   앱을 마스터에서 한 번만 가져온 뒤 fork (예열한 캐시를 워커가 공유)
+    LOTTO_WARMUP=0    워커 시작 시 대시보드 캐시 예열 끄기 (기본: 켬)
+"""
+
+import os
+import time
+
+preload_app = os.environ.get('LOTTO_PRELOAD') == '1'
+WARMUP = os.environ.get('LOTTO_WARMUP', '1') != '0'
+
+
+def on_starting(server):
+    """마스터 시작 시 1회 — 스키마 마이그레이션 + 백필 (워커는 버전 확인만 한다)"""
+    import models
+
+    started = time.perf_counter()
+    applied = models.init_db()
+    models.release_thread_db()
+    for version, description in applied:
+        server.log.info('마이그레이션 %s 적용: %s', version, description)
+    server.log.info('스키마 준비 %.3f초', time.perf_counter() - started)
+
+
+def when_ready(server):
+    """preload 시 fork 전에 마스터에서 예열 → 모든 워커가 같은 캐시로 시작"""
+    if preload_app and WARMUP:
+        import app
+        server.log.info('대시보드 캐시 예열 %.3f초 (마스터)', app.warm_up())
+
+
+def post_worker_init(worker):
+    """워커가 앱을 가져온 직후 — 실시간 갱신 대기 자리 설정 + 첫 요청 전에 기본 대시보드 캐시 예열
+
+    대기 연결(SSE / 롱 폴링)은 스레드를 붙잡으므로 스레드의 1/4 까지만 허용한다 (LOTTO_STREAM_SLOTS 로 변경).
+    preload 로 캐시를 이미 채웠으면 예열은 즉시 끝난다.
+    """
+    import app
+    if 'LOTTO_STREAM_SLOTS' not in os.environ:
+        app.change_watcher.set_slots(max(1, worker.cfg.threads // 4))
+    if WARMUP:
+        try:
+            worker.log.info('대시보드 캐시 예열 %.3f초 (pid %s)', app.warm_up(), worker.pid)
+        except Exception:
+            worker.log.exception('대시보드 캐시 예열 실패 — 첫 요청에서 계산합니다')
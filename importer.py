@@ -0,0 +1,147 @@
+"""
+로또 예측 성능 분석 대시보드 - 당첨 번호/예측 세트 일괄 가져오기 (CSV / JSONL)
+
+당첨 번호: round_number, draw_date, num1~num6 (또는 numbers), bonus
+예측 세트: round_number, code_id, num1~num6 (또는 numbers) — 한 행에 1세트
+"""
+
+import csv
+import json
+import time
+
+from models import (
+    get_codes, validate_draw, parse_prediction_line, bulk_save_rounds, bulk_save_predictions,
+)
+
+MAX_REPORTED_ERRORS = 20
+
+
+def detect_format(filename):
+    """파일 이름 확장자 → 'jsonl' 또는 'csv'"""
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def iter_records(stream, fmt):
+    """텍스트 스트림 → (줄 번호, dict) 순차 반환 (JSON 파싱 실패 행은 dict 대신 None)"""
+    if fmt == 'jsonl':
+        for lineno, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield lineno, record if isinstance(record, dict) else None
+    else:
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+
+
+def _record_numbers(record):
+    """레코드의 번호 6개 (numbers 필드 또는 num1~num6)"""
+    numbers = record.get('numbers')
+    if numbers not in (None, ''):
+        if isinstance(numbers, str):
+            return [int(p) for p in numbers.replace(',', ' ').split()]
+        return [int(n) for n in numbers]
+    return [int(record[f'num{i}']) for i in range(1, 7)]
+
+
+def _valid_draws(records, stats):
+    """당첨 번호 레코드 검증 (입력 폼과 동일한 규칙) → 저장용 행"""
+    for lineno, record in records:
+        stats['read'] += 1
+        try:
+            if record is None:
+                raise ValueError('JSON 형식 오류')
+            round_number = int(record['round_number'])
+            numbers = _record_numbers(record)
+            bonus = record.get('bonus')
+            bonus = int(bonus) if bonus not in (None, '') else None
+            validate_draw(numbers, bonus)
+        except (ValueError, KeyError, TypeError) as e:
+            _add_error(stats, lineno, e)
+            continue
+        stats['valid'] += 1
+        yield round_number, record.get('draw_date') or '', numbers, bonus
+
+
+def _valid_predictions(records, stats):
+    """예측 세트 레코드 검증 (입력 폼과 동일한 규칙) → 저장용 행"""
+    codes = get_codes()
+    for lineno, record in records:
+        stats['read'] += 1
+        try:
+            if record is None:
+                raise ValueError('JSON 형식 오류')
+            round_number = int(record['round_number'])
+            code_id = str(record['code_id'])
+            if code_id not in codes:
+                raise ValueError(f'알 수 없는 코드: {code_id}')
+            numbers = parse_prediction_line(' '.join(str(n) for n in _record_numbers(record)))
+            if numbers is None:
+                raise ValueError('유효하지 않은 세트 (서로 다른 1~45 번호 6개 필요)')
+        except (ValueError, KeyError, TypeError) as e:
+            _add_error(stats, lineno, e)
+            continue
+        stats['valid'] += 1
+        yield round_number, code_id, numbers
+
+
+def _add_error(stats, lineno, error):
+    stats['errors'] += 1
+    if len(stats['error_samples']) < MAX_REPORTED_ERRORS:
+        stats['error_samples'].append(f'{lineno}행: {error}')
+
+
+def _new_stats(kind):
+    return {'kind': kind, 'read': 0, 'valid': 0, 'errors': 0, 'error_samples': [], 'warnings': []}
+
+
+def _finish(stats, started):
+    elapsed = time.perf_counter() - started
+    stats['seconds'] = round(elapsed, 3)
+    stats['rows_per_sec'] = round(stats['read'] / elapsed) if elapsed > 0 else None
+    return stats
+
+
+def import_draws(stream, fmt='csv'):
+    """당첨 번호 스트림 가져오기 → 결과 보고 dict"""
+    started = time.perf_counter()
+    stats = _new_stats('draws')
+    stats['rounds'] = bulk_save_rounds(_valid_draws(iter_records(stream, fmt), stats))
+    return _finish(stats, started)
+
+
+def import_predictions(stream, fmt='csv'):
+    """예측 세트 스트림 가져오기 → 결과 보고 dict"""
+    started = time.perf_counter()
+    stats = _new_stats('predictions')
+    result = bulk_save_predictions(_valid_predictions(iter_records(stream, fmt), stats))
+
+    stats['sets'] = result['saved']
+    codes = get_codes()
+    for rn in result['missing_rounds']:
+        _add_error(stats, '-', f'{rn}회차가 존재하지 않습니다')
+    for (rn, code_id), count in sorted(result['set_counts'].items()):
+        expected = codes[code_id]['sets']
+        if count != expected:
+            stats['warnings'].append(f'{rn}회차 {code_id}: {expected}세트 필요, {count}세트 입력됨')
+    return _finish(stats, started)
+
+
+def import_file(path, kind):
+    """파일 경로 가져오기 (kind: 'draws' | 'predictions')"""
+    importer = import_draws if kind == 'draws' else import_predictions
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        return importer(f, detect_format(path))
+
+
+def format_report(stats):
+    """결과 보고 한 줄 요약"""
+    saved = f"{stats['rounds']}회차" if stats['kind'] == 'draws' else f"{stats['sets']}세트"
+    return (f"{stats['read']}행 중 {stats['valid']}행 유효, {saved} 저장 "
+            f"(오류 {stats['errors']}, 경고 {len(stats['warnings'])}) — "
+            f"{stats['seconds']}초, {stats['rows_per_sec'] or '-'}행/초")
@@ -0,0 +1,272 @@
+"""
+로또 예측 성능 분석 대시보드 - 요청 프로파일링 / SQL 계측 / Prometheus 지표 (opt-in)
+
+환경 변수:
+    LOTTO_INSTRUMENT=1        계측 활성화 (꺼져 있으면 phase() 는 빈 컨텍스트, /metrics 는 404)
+    LOTTO_PROFILE_RATE=0.01   요청 중 cProfile 을 남길 비율 (0~1, 기본 0)
+    LOTTO_PROFILE_DIR=...     .prof 파일 저장 디렉터리 (기본 ./profiles)
+
+지표는 워커 프로세스별로 집계된다 (gunicorn 워커마다 /metrics 값이 다름).
+"""
+
+import cProfile
+import itertools
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from flask import before_render_template, g, has_app_context, request, template_rendered
+
+ENABLED = os.environ.get('LOTTO_INSTRUMENT', '').lower() in ('1', 'true', 'yes')
+PROFILE_RATE = float(os.environ.get('LOTTO_PROFILE_RATE', 0) or 0)
+PROFILE_DIR = os.environ.get('LOTTO_PROFILE_DIR', 'profiles')
+
+# 지연 시간 히스토그램 구간 (초)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 형식)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """라벨별 히스토그램 / 카운터 모음"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}  # (지표명, 라벨 tuple) → Histogram
+        self.counters = {}    # (지표명, 라벨 tuple) → 값
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            key = (name, tuple(labels.items()))
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(value)
+
+    def inc(self, name, labels, amount=1):
+        with self._lock:
+            key = (name, tuple(labels.items()))
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def clear(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+registry = Registry()
+_profile_seq = itertools.count(1)
+
+METRIC_HELP = {
+    'lotto_request_duration_seconds': ('histogram', '라우트별 요청 처리 시간'),
+    'lotto_sql_duration_seconds': ('histogram', '요청당 SQL 실행 시간 합계'),
+    'lotto_render_duration_seconds': ('histogram', '요청당 Jinja 렌더링 시간 합계'),
+    'lotto_phase_duration_seconds': ('histogram', '분석 함수 내부 단계별 시간'),
+    'lotto_sql_queries_total': ('counter', '라우트별 실행 SQL 문 수'),
+    'lotto_profiles_written_total': ('counter', '저장한 cProfile 덤프 수'),
+}
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 단계 타이머 / SQL 계측
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+@contextmanager
+def _timed_phase(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe('lotto_phase_duration_seconds', {'phase': name}, elapsed)
+        if has_app_context():
+            phases = g.setdefault('phases', {})
+            phases[name] = phases.get(name, 0.0) + elapsed
+
+
+def phase(name):
+    """분석 단계 시간 측정 컨텍스트 (비활성 시 오버헤드 없는 빈 컨텍스트)"""
+    return _timed_phase(name) if ENABLED else nullcontext()
+
+
+def _add_sql_time(stats, started):
+    if stats is not None:
+        stats['sql_seconds'] = stats.get('sql_seconds', 0.0) + time.perf_counter() - started
+
+
+class TimedCursor(sqlite3.Cursor):
+    """실행 + 결과 순회(fetch) 시간을 연결의 stats['sql_seconds'] 에 누적하는 커서"""
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            _add_sql_time(self.connection.stats, started)
+
+    def execute(self, *args):
+        return self._timed(super().execute, *args)
+
+    def executemany(self, *args):
+        return self._timed(super().executemany, *args)
+
+    def executescript(self, *args):
+        return self._timed(super().executescript, *args)
+
+    def fetchone(self):
+        return self._timed(super().fetchone)
+
+    def fetchmany(self, *args):
+        return self._timed(super().fetchmany, *args)
+
+    def fetchall(self):
+        return self._timed(super().fetchall)
+
+    def __next__(self):
+        return self._timed(super().__next__)
+
+
+class TimedConnection(sqlite3.Connection):
+    """TimedCursor 를 쓰는 연결 (conn.execute 단축 메서드도 TimedCursor 로 실행)"""
+
+    stats = None
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+    def executescript(self, *args):
+        return self.cursor().executescript(*args)
+
+
+def connection_factory():
+    """sqlite3.connect 의 factory 인자 (비활성 시 기본 연결)"""
+    return TimedConnection if ENABLED else sqlite3.Connection
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# Flask 연동
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+def _route_label():
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def _profile_path(elapsed):
+    endpoint = re.sub(r'[^A-Za-z0-9_.-]+', '_', request.endpoint or 'unmatched')
+    name = f'{time.strftime("%Y%m%d-%H%M%S")}-{os.getpid()}-{next(_profile_seq)}-{endpoint}-{elapsed * 1000:.0f}ms.prof'
+    return os.path.join(PROFILE_DIR, name)
+
+
+def init_app(app, db_stats):
+    """요청 타이머 / 렌더링 타이머 / 샘플 프로파일 등록 (비활성 시 아무것도 하지 않음)
+
+    db_stats: 현재 요청의 {'queries', 'sql_seconds'} 를 반환하는 함수 (models.db_stats)
+    """
+    if not ENABLED:
+        return
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        if PROFILE_RATE > 0 and random.random() < PROFILE_RATE:
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    def start_render(_sender, **_extra):
+        g.render_started = time.perf_counter()
+
+    def finish_render(_sender, **_extra):
+        started = g.pop('render_started', None)
+        if started is not None:
+            g.render_seconds = g.get('render_seconds', 0.0) + time.perf_counter() - started
+
+    before_render_template.connect(start_render, app, weak=False)
+    template_rendered.connect(finish_render, app, weak=False)
+
+    @app.after_request
+    def record_request(response):
+        started = g.pop('request_started', None)
+        if started is None:
+            return response
+        elapsed = time.perf_counter() - started
+        route = _route_label()
+        stats = db_stats()
+        sql_seconds = stats.get('sql_seconds', 0.0)
+        render_seconds = g.get('render_seconds', 0.0)
+
+        labels = {'route': route, 'method': request.method, 'status': str(response.status_code)}
+        registry.observe('lotto_request_duration_seconds', labels, elapsed)
+        registry.observe('lotto_sql_duration_seconds', {'route': route}, sql_seconds)
+        registry.observe('lotto_render_duration_seconds', {'route': route}, render_seconds)
+        registry.inc('lotto_sql_queries_total', {'route': route}, stats.get('queries', 0))
+
+        timings = [('sql', sql_seconds), ('render', render_seconds)]
+        timings += sorted(g.get('phases', {}).items())
+        timings.append(('total', elapsed))
+        response.headers['Server-Timing'] = ', '.join(
+            f'{re.sub(r"[^A-Za-z0-9_-]", "-", name)};dur={seconds * 1000:.2f}' for name, seconds in timings
+        )
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            profiler.dump_stats(_profile_path(elapsed))
+            registry.inc('lotto_profiles_written_total', {})
+        return response
+
+
+def _format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"') for _, v in items)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + '}'
+
+
+def render_metrics():
+    """Prometheus 텍스트 형식 (0.0.4) 지표"""
+    with registry._lock:
+        histograms = sorted(registry.histograms.items())
+        counters = sorted(registry.counters.items())
+
+    lines = []
+    for name, (kind, help_text) in METRIC_HELP.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'histogram':
+            for (metric, labels), h in histograms:
+                if metric != name:
+                    continue
+                for bound, count in zip(h.buckets, h.counts):
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", bound)])} {count}')
+                lines.append(f'{name}_bucket{_format_labels(labels, [("le", "+Inf")])} {h.count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {h.sum:.6f}')
+                lines.append(f'{name}_count{_format_labels(labels)} {h.count}')
+        else:
+            for (metric, labels), value in counters:
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,254 @@
+"""
+로또 예측 성능 분석 대시보드 - 스키마 마이그레이션 (PRAGMA user_version 기반)
+
+각 마이그레이션은 BEGIN IMMEDIATE 트랜잭션 안에서 실행되고 같은 트랜잭션에서
+user_version 을 올리므로, 중간에 실패하면 통째로 롤백된다. 여러 워커가 동시에
+기동해도 쓰기 잠금을 잡은 뒤 버전을 다시 확인하므로 한 번만 적용된다.
+"""
+
+
+def _mask_expr(prefix=''):
+    """num1~num6 → 비트마스크 SQL 식 (비트 n = 번호 n)"""
+    return ' | '.join(f"(1 << {prefix}num{i})" for i in range(1, 7))
+
+
+def _m1_base_tables(conn):
+    """기본 테이블 (기존 init_db 스키마)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS rounds (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            round_number INTEGER UNIQUE NOT NULL,
+            draw_date TEXT,
+            num1 INTEGER, num2 INTEGER, num3 INTEGER,
+            num4 INTEGER, num5 INTEGER, num6 INTEGER,
+            bonus INTEGER,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS predictions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            round_id INTEGER NOT NULL,
+            code_id TEXT NOT NULL,
+            set_number INTEGER NOT NULL,
+            num1 INTEGER, num2 INTEGER, num3 INTEGER,
+            num4 INTEGER, num5 INTEGER, num6 INTEGER,
+            created_at TEXT DEFAULT (datetime('now')),
+            FOREIGN KEY (round_id) REFERENCES rounds(id),
+            UNIQUE(round_id, code_id, set_number)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS random_baselines (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            round_id INTEGER NOT NULL,
+            baseline_group TEXT NOT NULL,
+            set_number INTEGER NOT NULL,
+            num1 INTEGER, num2 INTEGER, num3 INTEGER,
+            num4 INTEGER, num5 INTEGER, num6 INTEGER,
+            FOREIGN KEY (round_id) REFERENCES rounds(id)
+        )
+    """)
+
+
+def _m2_derived_tables(conn):
+    """성과표 / 누적 집계 / 메타 테이블"""
+    # 대역 컬럼 추가 이전의 성과표는 파생 데이터이므로 재생성 (init_db 가 다시 채움)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(round_scores)")}
+    if columns and 'zone_1' not in columns:
+        conn.execute("DROP TABLE round_scores")
+        conn.execute("DROP TABLE IF EXISTS score_aggregates")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS round_scores (
+            round_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            source TEXT NOT NULL,
+            max_match INTEGER, avg_match REAL,
+            match_3plus INTEGER, match_4plus INTEGER, match_5plus INTEGER,
+            n_sets INTEGER,
+            matches TEXT,
+            zone_1 INTEGER, zone_2 INTEGER, zone_3 INTEGER, zone_4 INTEGER, zone_5 INTEGER,
+            PRIMARY KEY (round_id, kind, source),
+            FOREIGN KEY (round_id) REFERENCES rounds(id)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS score_aggregates (
+            kind TEXT NOT NULL,
+            source TEXT NOT NULL,
+            total_rounds INTEGER NOT NULL DEFAULT 0,
+            total_max_matches INTEGER NOT NULL DEFAULT 0,
+            match_3plus INTEGER NOT NULL DEFAULT 0,
+            match_4plus INTEGER NOT NULL DEFAULT 0,
+            match_5plus INTEGER NOT NULL DEFAULT 0,
+            zone_1 INTEGER NOT NULL DEFAULT 0, zone_2 INTEGER NOT NULL DEFAULT 0,
+            zone_3 INTEGER NOT NULL DEFAULT 0, zone_4 INTEGER NOT NULL DEFAULT 0,
+            zone_5 INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (kind, source)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+
+
+def _m3_indexes(conn):
+    """조회 인덱스 + 기준선 유일 키 (기존 중복 행은 먼저 정리)"""
+    conn.execute("""
+        DELETE FROM random_baselines WHERE id NOT IN (
+            SELECT MIN(id) FROM random_baselines GROUP BY round_id, baseline_group, set_number
+        )
+    """)
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_baselines_round_group "
+        "ON random_baselines (round_id, baseline_group, set_number)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_predictions_code_round ON predictions (code_id, round_id)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_round_scores_source ON round_scores (kind, source, round_id)"
+    )
+
+
+def _m4_number_masks(conn):
+    """세트/당첨 번호 비트마스크 컬럼 (popcount(a.mask & b.mask) = 일치 수)"""
+    for table in ('rounds', 'predictions', 'random_baselines'):
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if 'mask' not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN mask INTEGER")
+        conn.execute(f"UPDATE {table} SET mask = {_mask_expr()} WHERE mask IS NULL")
+
+
+def _m5_number_index(conn):
+    """성과표 번호별 빈도 컬럼 (46칸 uint16 BLOB — models.NUMBER_DTYPE, 기존 행은 init_db 가 재계산)"""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(round_scores)")}
+    if 'numbers' not in columns:
+        conn.execute("ALTER TABLE round_scores ADD COLUMN numbers BLOB")
+
+
+def _m6_change_events(conn):
+    """데이터 변경 이벤트 로그 (data_version 별 1행 — 실시간 갱신 스트림의 변경분 기준)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_events (
+            version INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            round_number INTEGER,
+            code_id TEXT,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+
+
+def _m7_round_details(conn):
+    """회차 상세 분석 저장 테이블 (쓰기 시 계산한 JSON — 기존 회차는 init_db 가 채움)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS round_details (
+            round_id INTEGER PRIMARY KEY,
+            round_number INTEGER UNIQUE NOT NULL,
+            payload TEXT NOT NULL,
+            FOREIGN KEY (round_id) REFERENCES rounds(id)
+        )
+    """)
+
+
+# 코드 테이블 도입 전 models.CODES 에 고정돼 있던 7개 코드 (sort_order = 나열 순서)
+SEED_CODES = [
+    ('2601', 'The strongest in the universe ver3.0', 5, '#EF4444', 'ULT'),
+    ('2602', 'Lotto-ultimate-v3.0', 5, '#3B82F6', 'QTM'),
+    ('2603', 'Lotto-ultimate-v1.5', 5, '#10B981', 'MOM'),
+    ('2604', 'Super v2.0 Feature Engineering', 5, '#8B5CF6', 'DEP'),
+    ('2605', 'The strongest in the universe v4.0', 5, '#F59E0B', 'HYB'),
+    ('2606', 'Platinum Lotto System v5.0', 5, '#EC4899', 'PLT'),
+    ('2607', 'Brother v2.0', 21, '#F97316', 'BRO'),
+]
+
+
+def _m8_codes(conn):
+    """예측 코드 테이블 + 기존 7개 코드 등록"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS codes (
+            code_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            sets INTEGER NOT NULL,
+            color TEXT NOT NULL,
+            short TEXT NOT NULL,
+            sort_order INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+    conn.executemany(
+        "INSERT OR IGNORE INTO codes (code_id, name, sets, color, short, sort_order) VALUES (?, ?, ?, ?, ?, ?)",
+        [(*row, i + 1) for i, row in enumerate(SEED_CODES)]
+    )
+
+
+def _m9_orphan_sets(conn):
+    """회차 재저장(INSERT OR REPLACE)으로 id 가 바뀌어 연결이 끊긴 예측/기준선 세트 정리
+
+    해당 세트는 성과표에서 이미 빠져 있으므로 누적 집계는 그대로다.
+    """
+    for table in ('predictions', 'random_baselines'):
+        conn.execute(f"DELETE FROM {table} WHERE round_id NOT IN (SELECT id FROM rounds)")
+
+
+
+def _m10_repeated_numbers(conn):
+    """같은 번호가 두 번 들어간 예측 세트가 있는 회차의 성과표 재계산 표시
+
+    예전 벡터 채점은 중복 번호를 두 번 세어 일치 수가 부풀었다. numbers 를 비우면
+    init_db 가 성과표 / 누적 집계 / 회차 상세를 원본 데이터로 다시 채운다.
+    """
+    repeated = ' OR '.join(f"num{i} = num{j}" for i in range(1, 7) for j in range(i + 1, 7))
+    conn.execute(
+        f"UPDATE round_scores SET numbers = NULL "
+        f"WHERE round_id IN (SELECT round_id FROM predictions WHERE {repeated})"
+    )
+
+
+# (버전, 설명, 적용 함수) — 버전은 1부터 연속, 이미 배포된 항목은 수정하지 않는다
+MIGRATIONS = [
+    (1, '기본 테이블', _m1_base_tables),
+    (2, '성과표/누적 집계/메타 테이블', _m2_derived_tables),
+    (3, '조회 인덱스 + 기준선 유일 키', _m3_indexes),
+    (4, '번호 비트마스크 컬럼', _m4_number_masks),
+    (5, '성과표 번호별 빈도 컬럼', _m5_number_index),
+    (6, '데이터 변경 이벤트 로그', _m6_change_events),
+    (7, '회차 상세 분석 저장 테이블', _m7_round_details),
+    (8, '예측 코드 테이블', _m8_codes),
+    (9, '끊긴 예측/기준선 세트 정리', _m9_orphan_sets),
+    (10, '중복 번호 세트 재채점', _m10_repeated_numbers),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    """DB 스키마 버전 (PRAGMA user_version)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """미적용 마이그레이션을 순서대로 적용 → 적용된 (버전, 설명) 목록"""
+    applied = []
+    if current_version(conn) >= LATEST_VERSION:
+        return applied
+
+    conn.execute("PRAGMA journal_mode=WAL")
+    for version, description, apply in MIGRATIONS:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if current_version(conn) >= version:
+                conn.rollback()
+                continue
+            apply(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append((version, description))
+    return applied
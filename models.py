@@ -4,11 +4,17 @@
 
 import sqlite3
 import os
+import re
 import json
-import random
-import numpy as np
+import threading
+import scoring  # numpy 는 분석·채점 함수 안에서 처음 쓸 때 가져온다 (워커 시작 시간)
+import baseline
+import migrations
+import instrumentation
+from cache import LRUCache
 from datetime import datetime
 from collections import Counter
+from flask import g, has_app_context
 
 DB_PATH = os.environ.get('DATABASE_PATH', 
     '/opt/render/project/data/lotto_dashboard.db' if os.path.exists('/opt/render/project/data') 
@@ -16,17 +22,12 @@ DB_PATH = os.environ.get('DATABASE_PATH',
 )
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-# 코드 정보 (7개 코드)
+# 코드 정보 — codes 테이블 (migrations 8), 조회는 get_codes()
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-CODES = {
-    '2601': {'name': 'The strongest in the universe ver3.0', 'sets': 5,  'color': '#EF4444', 'short': 'ULT'},
-    '2602': {'name': 'Lotto-ultimate-v3.0',  'sets': 5,  'color': '#3B82F6', 'short': 'QTM'},
-    '2603': {'name': 'Lotto-ultimate-v1.5', 'sets': 5,  'color': '#10B981', 'short': 'MOM'},
-    '2604': {'name': 'Super v2.0 Feature Engineering',     'sets': 5,  'color': '#8B5CF6', 'short': 'DEP'},
-    '2605': {'name': 'The strongest in the universe v4.0',   'sets': 5,  'color': '#F59E0B', 'short': 'HYB'},
-    '2606': {'name': 'Platinum Lotto System v5.0', 'sets': 5,  'color': '#EC4899', 'short': 'PLT'},
-    '2607': {'name': 'Brother v2.0',  'sets': 21, 'color': '#F97316', 'short': 'BRO'},
-}
+CODE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,32}$')
+COLOR_PATTERN = re.compile(r'^#[0-9A-Fa-f]{6}$')
+MAX_CODE_SETS = 100
+MAX_SHORT_LENGTH = 8
 
 LOTTO_ZONES = {
     '1~10':  list(range(1, 11)),
@@ -36,94 +37,336 @@ LOTTO_ZONES = {
     '41~45': list(range(41, 46)),
 }
 
+# 기존 표본 랜덤 기준선 그룹 (5세트 × 3그룹의 평균을 rand5_avg 로 사용)
+# 새 회차에는 더 이상 생성하지 않으며, 랜덤 대비 비교는 baseline.py 의 정확값을 쓴다
+RAND5_GROUPS = ['rand5_A', 'rand5_B', 'rand5_C']
+BULK_RESCORE_THRESHOLD = 500  # 일괄 저장 시 이보다 많은 회차가 바뀌면 성과표 전체 재계산
 
-def get_db():
-    """데이터베이스 연결"""
-    conn = sqlite3.connect(DB_PATH)
+
+# 연결마다 한 번 적용하는 SQLite 설정 (journal_mode=WAL 은 DB 파일에 유지되므로 마이그레이션에서 1회)
+SQLITE_PRAGMAS = {
+    'synchronous': 'NORMAL',     # WAL 모드에서 안전한 수준의 fsync
+    'cache_size': -16000,        # 페이지 캐시 16MB
+    'mmap_size': 134217728,      # 128MB 메모리 매핑 읽기
+    'temp_store': 'MEMORY',
+    'busy_timeout': 5000,        # 다른 워커의 쓰기 잠금 대기(ms)
+}
+
+_local = threading.local()
+
+
+def _connect(stats):
+    """새 연결 생성 + 설정 적용 (stats['queries'] 에 실행 SQL 수 누적)"""
+    conn = sqlite3.connect(DB_PATH, factory=instrumentation.connection_factory())
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+    for name, value in SQLITE_PRAGMAS.items():
+        conn.execute(f"PRAGMA {name}={value}")
+    conn.create_function('popcount', 1, scoring.popcount, deterministic=True)
+    stats['connections'] += 1
+    if isinstance(conn, instrumentation.TimedConnection):
+        conn.stats = stats
+
+    def count_query(_statement):
+        stats['queries'] += 1
+    conn.set_trace_callback(count_query)
+    return conn
+
+
+def get_db():
+    """데이터베이스 연결
+
+    앱 컨텍스트(요청) 안에서는 요청 단위로 하나를 재사용하고 종료 시 닫는다.
+    컨텍스트 밖(CLI 스크립트 등)에서는 프로세스·스레드별 연결을 재사용한다.
+    """
+    if has_app_context():
+        if 'db' not in g:
+            g.db_stats = {'connections': 0, 'queries': 0}
+            g.db = _connect(g.db_stats)
+        return g.db
+
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.pid != os.getpid() or _local.path != DB_PATH:
+        _local.stats = {'connections': 0, 'queries': 0}
+        _local.conn = conn = _connect(_local.stats)
+        _local.pid, _local.path = os.getpid(), DB_PATH
     return conn
 
 
+def close_db(_exc=None):
+    """요청 종료 시 연결 반환 (teardown_appcontext)"""
+    conn = g.pop('db', None)
+    if conn is not None:
+        conn.close()
+
+
+def db_stats():
+    """현재 요청(또는 스레드)의 연결/쿼리 수"""
+    if has_app_context():
+        return dict(g.get('db_stats', {'connections': 0, 'queries': 0}))
+    return dict(getattr(_local, 'stats', {'connections': 0, 'queries': 0}))
+
+
+def init_app(app):
+    """Flask 앱에 연결 관리 등록 — 요청 종료 시 닫고 응답 헤더로 쿼리 수 보고"""
+    app.teardown_appcontext(close_db)
+
+    @app.after_request
+    def report_db_stats(response):
+        stats = db_stats()
+        response.headers['X-DB-Connections'] = str(stats['connections'])
+        response.headers['X-DB-Queries'] = str(stats['queries'])
+        return response
+
+
+def _where(*conds):
+    """비어 있지 않은 조건만 AND 로 묶은 WHERE 절"""
+    conds = [c for c in conds if c]
+    return ("WHERE " + " AND ".join(conds)) if conds else ""
+
+
 def init_db():
-    """테이블 초기화"""
+    """스키마 마이그레이션 적용 + 기존 DB 백필 → 적용된 (버전, 설명) 목록
+
+    배포 시 1회 실행하는 단계다 (gunicorn.conf.py on_starting / flask db-migrate).
+    워커는 schema_current() 로 버전만 확인한다.
+    """
     conn = get_db()
-    conn.executescript("""
-        CREATE TABLE IF NOT EXISTS rounds (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            round_number INTEGER UNIQUE NOT NULL,
-            draw_date TEXT,
-            num1 INTEGER, num2 INTEGER, num3 INTEGER,
-            num4 INTEGER, num5 INTEGER, num6 INTEGER,
-            bonus INTEGER,
-            created_at TEXT DEFAULT (datetime('now'))
-        );
-
-        CREATE TABLE IF NOT EXISTS predictions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            round_id INTEGER NOT NULL,
-            code_id TEXT NOT NULL,
-            set_number INTEGER NOT NULL,
-            num1 INTEGER, num2 INTEGER, num3 INTEGER,
-            num4 INTEGER, num5 INTEGER, num6 INTEGER,
-            created_at TEXT DEFAULT (datetime('now')),
-            FOREIGN KEY (round_id) REFERENCES rounds(id),
-            UNIQUE(round_id, code_id, set_number)
-        );
-
-        CREATE TABLE IF NOT EXISTS random_baselines (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            round_id INTEGER NOT NULL,
-            baseline_group TEXT NOT NULL,
-            set_number INTEGER NOT NULL,
-            num1 INTEGER, num2 INTEGER, num3 INTEGER,
-            num4 INTEGER, num5 INTEGER, num6 INTEGER,
-            FOREIGN KEY (round_id) REFERENCES rounds(id)
-        );
-    """)
-    conn.commit()
-    conn.close()
+    applied = migrations.migrate(conn)
+
+    # 기존 DB: 누적 집계가 비어 있거나 번호별 빈도가 없는 성과표가 있으면 원본 데이터로 다시 채움
+    empty = (conn.execute("SELECT 1 FROM score_aggregates LIMIT 1").fetchone() is None
+             and conn.execute("SELECT 1 FROM rounds LIMIT 1").fetchone() is not None)
+    if empty or conn.execute("SELECT 1 FROM round_scores WHERE numbers IS NULL LIMIT 1").fetchone():
+        _refresh_round_scores(conn)
+        conn.commit()
+    elif conn.execute(
+        "SELECT 1 FROM rounds r LEFT JOIN round_details d ON d.round_id = r.id WHERE d.round_id IS NULL LIMIT 1"
+    ).fetchone():
+        _refresh_round_details(conn)
+        conn.commit()
+    return applied
+
+
+def schema_current():
+    """스키마가 최신 마이그레이션까지 적용됐는지 (PRAGMA user_version 1회 조회)"""
+    return migrations.current_version(get_db()) >= migrations.LATEST_VERSION
+
+
+def release_thread_db():
+    """컨텍스트 밖 연결 닫기 (gunicorn 마스터가 워커를 fork 하기 전에)"""
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+def get_data_version():
+    """데이터 버전 조회 (쓰기마다 증가, 프로세스 간 캐시 무효화 기준)"""
+    conn = get_db()
+    row = conn.execute("SELECT value FROM meta WHERE key='data_version'").fetchone()
+    return row['value'] if row else 0
+
+
+CHANGE_EVENTS_KEEP = 1000  # 보관하는 최근 변경 이벤트 수 (이보다 오래 끊긴 클라이언트는 전체 새로고침)
+
+
+def _bump_data_version(conn, kind='bulk', round_number=None, code_id=None):
+    """데이터 버전 증가 + 변경 이벤트 기록 — 쓰기 트랜잭션 안에서 호출
+
+    kind: 'round' / 'predictions' / 'delete' (회차 단위 변경분 전달 가능) 또는
+    'bulk' / 'rebuild' (범위가 커서 클라이언트가 전체를 다시 읽어야 함)
+    """
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key='data_version'")
+    conn.execute(
+        "INSERT INTO change_events (version, kind, round_number, code_id) "
+        "SELECT value, ?, ?, ? FROM meta WHERE key='data_version'",
+        (kind, round_number, code_id)
+    )
+    conn.execute(
+        "DELETE FROM change_events WHERE version <= (SELECT value FROM meta WHERE key='data_version') - ?",
+        (CHANGE_EVENTS_KEEP,)
+    )
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # CRUD 함수
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def save_round(round_number, draw_date, numbers, bonus=None):
-    """회차 당첨 번호 저장"""
+# 번호 6개 뒤의 mask 는 scoring.encode_mask 값 (migrations 4)
+# 기존 회차는 id 를 유지한 채 갱신 — 입력된 예측(round_id 참조)이 보존된다
+UPSERT_ROUND_SQL = (
+    "INSERT INTO rounds (round_number, draw_date, num1, num2, num3, num4, num5, num6, bonus, mask) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(round_number) DO UPDATE SET draw_date=excluded.draw_date, "
+    "num1=excluded.num1, num2=excluded.num2, num3=excluded.num3, num4=excluded.num4, "
+    "num5=excluded.num5, num6=excluded.num6, bonus=excluded.bonus, mask=excluded.mask"
+)
+INSERT_PREDICTION_SQL = (
+    "INSERT INTO predictions (round_id, code_id, set_number, num1,num2,num3,num4,num5,num6, mask) "
+    "VALUES (?,?,?,?,?,?,?,?,?,?)"
+)
+
+
+def get_codes():
+    """등록된 코드 {code_id: {'name', 'sets', 'color', 'short', 'sort_order'}} (sort_order 순)
+
+    요청(앱 컨텍스트) 안에서는 한 번만 조회해 재사용한다.
+    """
+    if has_app_context() and 'codes' in g:
+        return g.codes
+    codes = {
+        row['code_id']: {
+            'name': row['name'],
+            'sets': row['sets'],
+            'color': row['color'],
+            'short': row['short'],
+            'sort_order': row['sort_order'],
+        }
+        for row in get_db().execute(
+            "SELECT code_id, name, sets, color, short, sort_order FROM codes ORDER BY sort_order, code_id"
+        )
+    }
+    if has_app_context():
+        g.codes = codes
+    return codes
+
+
+def _forget_codes():
+    """요청 안의 코드 목록 캐시 폐기 (코드 변경 후)"""
+    if has_app_context():
+        g.pop('codes', None)
+
+
+def validate_code(code_id, name, sets, color, short):
+    """코드 정보 검증 — 문제가 있으면 ValueError(사용자 메시지)"""
+    if not CODE_ID_PATTERN.match(code_id or ''):
+        raise ValueError('코드 ID는 영문/숫자/-/_ 1~32자여야 합니다.')
+    if not (name or '').strip():
+        raise ValueError('코드 이름을 입력해주세요.')
+    if not (1 <= sets <= MAX_CODE_SETS):
+        raise ValueError(f'세트 수는 1~{MAX_CODE_SETS} 사이여야 합니다.')
+    if not COLOR_PATTERN.match(color or ''):
+        raise ValueError('색상은 #RRGGBB 형식이어야 합니다.')
+    if not (1 <= len((short or '').strip()) <= MAX_SHORT_LENGTH):
+        raise ValueError(f'약칭은 1~{MAX_SHORT_LENGTH}자여야 합니다.')
+
+
+def save_code(code_id, name, sets, color, short, sort_order=None):
+    """코드 등록/수정 (검증 포함) → 새로 등록했으면 True
+
+    sort_order 를 생략하면 새 코드는 맨 뒤, 기존 코드는 순서를 유지한다.
+    """
+    validate_code(code_id, name, sets, color, short)
     conn = get_db()
     try:
+        exists = conn.execute("SELECT 1 FROM codes WHERE code_id=?", (code_id,)).fetchone() is not None
+        if sort_order is None and not exists:
+            sort_order = conn.execute("SELECT COALESCE(MAX(sort_order), 0) + 1 FROM codes").fetchone()[0]
         conn.execute(
-            "INSERT OR REPLACE INTO rounds (round_number, draw_date, num1, num2, num3, num4, num5, num6, bonus) "
-            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
-            (round_number, draw_date, *sorted(numbers), bonus)
+            "INSERT INTO codes (code_id, name, sets, color, short, sort_order) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(code_id) DO UPDATE SET name=excluded.name, sets=excluded.sets, color=excluded.color, "
+            "short=excluded.short, sort_order=COALESCE(?, codes.sort_order)",
+            (code_id, name.strip(), sets, color, short.strip(), sort_order or 0, sort_order)
         )
+        _bump_data_version(conn, 'codes', code_id=code_id)
+        conn.commit()
+        _forget_codes()
+        return not exists
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def delete_code(code_id):
+    """코드 삭제 — 입력된 예측과 성과표/누적 집계/회차 상세도 함께 정리 → 삭제한 예측 세트 수, 없는 코드면 None"""
+    conn = get_db()
+    try:
+        if conn.execute("SELECT 1 FROM codes WHERE code_id=?", (code_id,)).fetchone() is None:
+            return None
+        round_ids = [row[0] for row in conn.execute(
+            "SELECT DISTINCT round_id FROM predictions WHERE code_id=?", (code_id,)
+        )]
+        removed = conn.execute("DELETE FROM predictions WHERE code_id=?", (code_id,)).rowcount
+        for chunk in _chunked(round_ids, 5000):
+            _refresh_round_scores(conn, chunk, code_id=code_id)
+        conn.execute("DELETE FROM score_aggregates WHERE kind='code' AND source=?", (code_id,))
+        conn.execute("DELETE FROM codes WHERE code_id=?", (code_id,))
+        _bump_data_version(conn, 'codes', code_id=code_id)
         conn.commit()
+        _forget_codes()
+        return removed
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def validate_draw(numbers, bonus=None):
+    """당첨 번호 검증 — 문제가 있으면 ValueError(사용자 메시지)"""
+    for n in numbers:
+        if not (1 <= n <= 45):
+            raise ValueError(f'번호 {n}은(는) 1~45 범위를 벗어났습니다.')
+    if len(numbers) != 6 or len(set(numbers)) != 6:
+        raise ValueError('중복된 번호가 있습니다.')
+    if bonus is not None and not (1 <= bonus <= 45):
+        raise ValueError(f'보너스 번호 {bonus}은(는) 1~45 범위를 벗어났습니다.')
+
+
+def parse_prediction_line(line):
+    """예측 번호 한 줄 → 정렬된 6개 번호, 유효하지 않으면(범위 밖 / 중복) None"""
+    nums = []
+    for part in line.replace(',', ' ').replace('\t', ' ').split():
+        part = part.strip()
+        if part.isdigit():
+            nums.append(int(part))
+    if len(nums) == 6 and len(set(nums)) == 6 and all(1 <= n <= 45 for n in nums):
+        return sorted(nums)
+    return None
+
+
+def parse_prediction_text(raw_text):
+    """예측 입력 텍스트 → 유효 세트 목록 (한 줄에 6개 숫자)"""
+    sets_list = []
+    for line in raw_text.strip().split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        nums = parse_prediction_line(line)
+        if nums:
+            sets_list.append(nums)
+    return sets_list
+
+
+def _chunked(iterable, size):
+    """이터러블을 size 개씩 묶어 순차 반환"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def save_round(round_number, draw_date, numbers, bonus=None):
+    """회차 당첨 번호 저장 (재채점·버전 갱신까지 단일 트랜잭션)
+
+    기존 회차는 id 를 유지한 채 번호만 바꾸고 그 자리에서 재채점하므로 입력된 예측이 보존된다
+    (bulk_save_rounds 와 같은 동작).
+    """
+    conn = get_db()
+    try:
+        conn.execute(UPSERT_ROUND_SQL,
+                     (round_number, draw_date, *sorted(numbers), bonus, scoring.encode_mask(numbers)))
         row = conn.execute("SELECT id FROM rounds WHERE round_number=?", (round_number,)).fetchone()
         round_id = row['id']
 
-        # 랜덤 기준선 자동 생성 (5세트 × 3그룹 + 21세트 × 1그룹)
-        conn.execute("DELETE FROM random_baselines WHERE round_id=?", (round_id,))
-        for group in ['rand5_A', 'rand5_B', 'rand5_C']:
-            for s in range(5):
-                nums = sorted(random.sample(range(1, 46), 6))
-                conn.execute(
-                    "INSERT INTO random_baselines (round_id, baseline_group, set_number, num1,num2,num3,num4,num5,num6) "
-                    "VALUES (?,?,?,?,?,?,?,?,?)",
-                    (round_id, group, s + 1, *nums)
-                )
-        # 21세트 랜덤 (2607 비교용)
-        for s in range(21):
-            nums = sorted(random.sample(range(1, 46), 6))
-            conn.execute(
-                "INSERT INTO random_baselines (round_id, baseline_group, set_number, num1,num2,num3,num4,num5,num6) "
-                "VALUES (?,?,?,?,?,?,?,?,?)",
-                (round_id, 'rand21', s + 1, *nums)
-            )
-
+        _refresh_round_scores(conn, [round_id])
+        _bump_data_version(conn, 'round', round_number)
         conn.commit()
         return round_id
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 def save_predictions(round_number, code_id, sets_list):
@@ -136,264 +379,964 @@ def save_predictions(round_number, code_id, sets_list):
         round_id = row['id']
 
         conn.execute("DELETE FROM predictions WHERE round_id=? AND code_id=?", (round_id, code_id))
-        for i, nums in enumerate(sets_list):
-            conn.execute(
-                "INSERT INTO predictions (round_id, code_id, set_number, num1,num2,num3,num4,num5,num6) "
-                "VALUES (?,?,?,?,?,?,?,?,?)",
-                (round_id, code_id, i + 1, *sorted(nums))
-            )
+        conn.executemany(
+            INSERT_PREDICTION_SQL,
+            [(round_id, code_id, i + 1, *sorted(nums), scoring.encode_mask(nums))
+             for i, nums in enumerate(sets_list)]
+        )
+        _refresh_round_scores(conn, [round_id], code_id=code_id)
+        _bump_data_version(conn, 'predictions', round_number, code_id)
         conn.commit()
         return True
-    finally:
-        conn.close()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def _rescore_rounds(conn, round_ids):
+    """일괄 저장 후 성과표/누적 집계 갱신 — 대량이면 전체 재계산"""
+    round_ids = sorted(set(round_ids))
+    if not round_ids:
+        return
+    if len(round_ids) > BULK_RESCORE_THRESHOLD:
+        _refresh_round_scores(conn)
+    else:
+        _refresh_round_scores(conn, round_ids)
 
 
-def get_all_rounds():
-    """모든 회차 조회"""
+def bulk_save_rounds(rows, chunk_size=5000):
+    """회차 일괄 저장 (단일 트랜잭션, executemany)
+
+    rows: (round_number, draw_date, [6개 번호], bonus) 이터러블 (검증 완료 가정).
+    기존 회차는 id 를 유지한 채 갱신하므로 입력된 예측이 보존된다. → 저장 회차 수
+    """
     conn = get_db()
-    rows = conn.execute("SELECT * FROM rounds ORDER BY round_number DESC").fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    try:
+        round_ids = []
+        for chunk in _chunked(rows, chunk_size):
+            conn.executemany(
+                UPSERT_ROUND_SQL,
+                [(rn, date, *sorted(nums), bonus, scoring.encode_mask(nums)) for rn, date, nums, bonus in chunk]
+            )
+            ids = [r['id'] for r in conn.execute(
+                f"SELECT id FROM rounds WHERE round_number IN ({','.join('?' * len(chunk))})",
+                [row[0] for row in chunk]
+            )]
+            round_ids.extend(ids)
+
+        _rescore_rounds(conn, round_ids)
+        _bump_data_version(conn, 'bulk')
+        conn.commit()
+        return len(set(round_ids))
+    except Exception:
+        conn.rollback()
+        raise
 
 
-def get_round_data(round_number):
-    """특정 회차의 전체 데이터"""
+def bulk_save_predictions(rows, chunk_size=5000):
+    """예측 세트 일괄 저장 (단일 트랜잭션, executemany)
+
+    rows: (round_number, code_id, [6개 번호]) 이터러블 (검증 완료 가정).
+    파일에 처음 등장한 (회차, 코드)의 기존 예측은 교체된다.
+    → {'saved': 세트 수, 'set_counts': {(회차, 코드): 세트 수}, 'missing_rounds': [...]}
+    """
     conn = get_db()
-    round_row = conn.execute("SELECT * FROM rounds WHERE round_number=?", (round_number,)).fetchone()
-    if not round_row:
-        conn.close()
-        return None
+    try:
+        round_ids = {r['round_number']: r['id'] for r in conn.execute("SELECT id, round_number FROM rounds")}
+        set_counts, missing = {}, set()
+        saved = 0
+        for chunk in _chunked(rows, chunk_size):
+            batch, replaced = [], []
+            for rn, code_id, nums in chunk:
+                round_id = round_ids.get(rn)
+                if round_id is None:
+                    missing.add(rn)
+                    continue
+                key = (rn, code_id)
+                if key not in set_counts:
+                    set_counts[key] = 0
+                    replaced.append((round_id, code_id))
+                set_counts[key] += 1
+                batch.append((round_id, code_id, set_counts[key], *sorted(nums), scoring.encode_mask(nums)))
+            conn.executemany("DELETE FROM predictions WHERE round_id=? AND code_id=?", replaced)
+            conn.executemany(INSERT_PREDICTION_SQL, batch)
+            saved += len(batch)
+
+        _rescore_rounds(conn, [round_ids[rn] for rn, _ in set_counts])
+        _bump_data_version(conn, 'bulk')
+        conn.commit()
+        return {'saved': saved, 'set_counts': set_counts, 'missing_rounds': sorted(missing)}
+    except Exception:
+        conn.rollback()
+        raise
 
-    round_id = round_row['id']
-    actual = [round_row[f'num{i}'] for i in range(1, 7)]
 
-    predictions = {}
-    for code_id in CODES:
-        preds = conn.execute(
-            "SELECT * FROM predictions WHERE round_id=? AND code_id=? ORDER BY set_number",
-            (round_id, code_id)
+def get_rounds_page(before=None, after=None, limit=50):
+    """회차 목록 키셋 페이지 (round_number 내림차순)
+
+    before: 이 회차보다 이전 회차들, after: 이 회차보다 이후 회차들.
+    → (rows, older_cursor, newer_cursor) — 더 없으면 커서는 None
+    """
+    conn = get_db()
+    if after is not None:
+        rows = conn.execute(
+            "SELECT * FROM rounds WHERE round_number > ? ORDER BY round_number ASC LIMIT ?",
+            (after, limit + 1)
+        ).fetchall()
+        has_newer = len(rows) > limit
+        rows = rows[:limit][::-1]
+        has_older = True
+    else:
+        rows = conn.execute(
+            f"SELECT * FROM rounds {_where('round_number < ?' if before is not None else '')} "
+            "ORDER BY round_number DESC LIMIT ?",
+            ((before,) if before is not None else ()) + (limit + 1,)
         ).fetchall()
-        if preds:
-            predictions[code_id] = [[p[f'num{i}'] for i in range(1, 7)] for p in preds]
+        has_older = len(rows) > limit
+        rows = rows[:limit]
+        has_newer = before is not None
 
-    baselines = {}
-    for bl in conn.execute("SELECT * FROM random_baselines WHERE round_id=?", (round_id,)).fetchall():
-        group = bl['baseline_group']
-        if group not in baselines:
-            baselines[group] = []
-        baselines[group].append([bl[f'num{i}'] for i in range(1, 7)])
+    rows = [dict(r) for r in rows]
+    older = rows[-1]['round_number'] if rows and has_older else None
+    newer = rows[0]['round_number'] if rows and has_newer else None
+    return rows, older, newer
 
-    conn.close()
-    return {
-        'round': dict(round_row),
-        'actual': actual,
-        'predictions': predictions,
-        'baselines': baselines,
-    }
+
+def get_rounds_status(from_round=None, to_round=None):
+    """회차 범위의 코드별 입력 현황 (단일 그룹 쿼리) → [{round_number, actual, codes}]"""
+    codes = get_codes()
+    conds, params = _window_condition(from_round=from_round, to_round=to_round)
+    conn = get_db()
+    rows = conn.execute(
+        "SELECT r.round_number, r.num1, r.num2, r.num3, r.num4, r.num5, r.num6, "
+        "p.code_id, COUNT(p.id) AS sets "
+        "FROM rounds r LEFT JOIN predictions p ON p.round_id = r.id "
+        f"{_where(*conds)} "
+        "GROUP BY r.id, p.code_id ORDER BY r.round_number DESC",
+        params
+    ).fetchall()
+
+    statuses = {}
+    for row in rows:
+        rn = row['round_number']
+        if rn not in statuses:
+            statuses[rn] = {
+                'round_number': rn,
+                'actual': [row[f'num{i}'] for i in range(1, 7)],
+                'codes': {code_id: {'entered': False, 'sets': 0} for code_id in codes},
+            }
+        if row['code_id'] in codes:
+            statuses[rn]['codes'][row['code_id']] = {'entered': True, 'sets': row['sets']}
+    return list(statuses.values())
 
 
 def delete_round(round_number):
     """회차 삭제"""
     conn = get_db()
-    row = conn.execute("SELECT id FROM rounds WHERE round_number=?", (round_number,)).fetchone()
-    if row:
-        rid = row['id']
-        conn.execute("DELETE FROM predictions WHERE round_id=?", (rid,))
-        conn.execute("DELETE FROM random_baselines WHERE round_id=?", (rid,))
-        conn.execute("DELETE FROM rounds WHERE id=?", (rid,))
-        conn.commit()
-    conn.close()
+    try:
+        row = conn.execute("SELECT id FROM rounds WHERE round_number=?", (round_number,)).fetchone()
+        if row:
+            rid = row['id']
+            conn.execute("DELETE FROM predictions WHERE round_id=?", (rid,))
+            conn.execute("DELETE FROM random_baselines WHERE round_id=?", (rid,))
+            _clear_round_scores(conn, [rid])
+            conn.execute("DELETE FROM rounds WHERE id=?", (rid,))
+            _bump_data_version(conn, 'delete', round_number)
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 분석 엔진
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-def compute_matches(actual, predicted_sets):
-    """일치 수 계산"""
-    actual_set = set(actual)
-    return [len(actual_set & set(s)) for s in predicted_sets]
+PREDICTION_SETS_QUERY = (
+    "SELECT round_id, code_id AS grp, num1, num2, num3, num4, num5, num6 "
+    "FROM predictions {where} ORDER BY round_id, code_id, set_number"
+)
+BASELINE_SETS_QUERY = (
+    "SELECT round_id, baseline_group AS grp, num1, num2, num3, num4, num5, num6 "
+    "FROM random_baselines {where} ORDER BY round_id, baseline_group, set_number"
+)
+ZONE_COLUMNS = [f'zone_{z + 1}' for z in range(len(LOTTO_ZONES))]
+NUMBER_DTYPE = '<u2'  # round_scores.numbers: 번호(0~45)별 예측 빈도 46칸 (uint16)
 
+# 누적 집계 컬럼 — ('random', 'rand5_avg') 행의 total_max_matches 는 회차별
+# 랜덤5 평균(소수 2자리)을 0.01 단위 정수로 합산한 값
+AGGREGATE_COLUMNS = [
+    'total_rounds', 'total_max_matches', 'match_3plus', 'match_4plus', 'match_5plus',
+    *ZONE_COLUMNS,
+]
 
-def get_code_performance(code_id):
-    """특정 코드의 전체 성과 분석"""
-    conn = get_db()
-    rounds = conn.execute("SELECT * FROM rounds ORDER BY round_number ASC").fetchall()
-
-    results = []
-    for r in rounds:
-        actual = [r[f'num{i}'] for i in range(1, 7)]
-        preds = conn.execute(
-            "SELECT * FROM predictions WHERE round_id=? AND code_id=? ORDER BY set_number",
-            (r['id'], code_id)
-        ).fetchall()
-        if not preds:
+
+def _score_set_rows(actual_by_round, rows):
+    """(round_id, 그룹) 순으로 정렬된 세트 행 → {(round_id, 그룹): 성과 dict}
+
+    전체 회차 × 세트를 벡터화 커널 1회 호출로 채점한다.
+    """
+    import numpy as np
+    round_pos = {rid: i for i, rid in enumerate(actual_by_round)}
+    keys, sets, draw_index, group_index = [], [], [], []
+    for row in rows:
+        round_id, grp = row[0], row[1]
+        if round_id not in round_pos:
             continue
+        key = (round_id, grp)
+        if not keys or keys[-1] != key:
+            keys.append(key)
+        sets.append(row[2:8])  # num1~num6 (쿼리 컬럼 순서 고정)
+        draw_index.append(round_pos[round_id])
+        group_index.append(len(keys) - 1)
 
-        pred_sets = [[p[f'num{i}'] for i in range(1, 7)] for p in preds]
-        matches = compute_matches(actual, pred_sets)
+    if not keys:
+        return {}
 
-        results.append({
-            'round_number': r['round_number'],
-            'max_match': max(matches),
-            'avg_match': sum(matches) / len(matches),
-            'match_3plus': sum(1 for m in matches if m >= 3),
-            'match_4plus': sum(1 for m in matches if m >= 4),
-            'match_5plus': sum(1 for m in matches if m >= 5),
-            'n_sets': len(pred_sets),
-            'all_matches': matches,
-        })
+    with instrumentation.phase('scoring'):
+        matches, stats = scoring.score_groups(
+            list(actual_by_round.values()), sets, draw_index, group_index, len(keys)
+        )
+        per_group = np.split(matches, np.cumsum(stats['n_sets'])[:-1])
+        numbers = scoring.number_counts(sets, group_index, len(keys))
+        zones = scoring.zone_counts(numbers, scoring.zone_bins(LOTTO_ZONES))
 
-    conn.close()
+    results = {}
+    for g, key in enumerate(keys):
+        results[key] = {
+            'max_match': int(stats['max_match'][g]),
+            'avg_match': float(stats['avg_match'][g]),
+            'match_3plus': int(stats['match_3plus'][g]),
+            'match_4plus': int(stats['match_4plus'][g]),
+            'match_5plus': int(stats['match_5plus'][g]),
+            'n_sets': int(stats['n_sets'][g]),
+            'all_matches': per_group[g].tolist(),
+            'zones': zones[g].tolist(),
+            'numbers': numbers[g].astype(NUMBER_DTYPE).tobytes(),
+        }
     return results
 
 
-def get_dashboard_data():
-    """대시보드 전체 데이터 생성"""
+def _score_contributions(conn, scope="", params=()):
+    """round_scores 범위의 누적 집계 기여분 → {(kind, source): [AGGREGATE_COLUMNS 값]}"""
+    contrib = {}
+    zone_sums = ', '.join(f"SUM({c})" for c in ZONE_COLUMNS)
+    for row in conn.execute(
+        f"SELECT kind, source, COUNT(*), SUM(max_match), SUM(match_3plus), SUM(match_4plus), "
+        f"SUM(match_5plus), {zone_sums} FROM round_scores {_where(scope)} GROUP BY kind, source",
+        params
+    ):
+        contrib[(row[0], row[1])] = list(row[2:])
+
+    rand5_filter = f"source IN ({','.join('?' * len(RAND5_GROUPS))})"
+    rand5 = [
+        round(avg, 2) for (avg,) in conn.execute(
+            f"SELECT AVG(max_match) FROM round_scores {_where(scope, 'kind=?', rand5_filter)} "
+            f"GROUP BY round_id",
+            [*params, 'baseline', *RAND5_GROUPS]
+        )
+    ]
+    if rand5:
+        contrib[('random', 'rand5_avg')] = (
+            [len(rand5), sum(round(v * 100) for v in rand5)] + [0] * (len(AGGREGATE_COLUMNS) - 2)
+        )
+    return contrib
+
+
+def _apply_aggregate_delta(conn, old, new):
+    """기여분 차이(new - old)를 score_aggregates 에 반영"""
+    zero = [0] * len(AGGREGATE_COLUMNS)
+    rows = []
+    for key in set(old) | set(new):
+        delta = [b - a for a, b in zip(old.get(key, zero), new.get(key, zero))]
+        if any(delta):
+            rows.append((*key, *delta))
+    if not rows:
+        return
+    conn.executemany(
+        f"INSERT INTO score_aggregates (kind, source, {', '.join(AGGREGATE_COLUMNS)}) "
+        f"VALUES (?, ?, {', '.join('?' * len(AGGREGATE_COLUMNS))}) "
+        f"ON CONFLICT(kind, source) DO UPDATE SET "
+        + ', '.join(f"{c} = {c} + excluded.{c}" for c in AGGREGATE_COLUMNS),
+        rows
+    )
+
+
+def _round_scope(round_ids):
+    """round_id 목록 → (조건절, 파라미터)"""
+    return f"round_id IN ({','.join('?' * len(round_ids))})", list(round_ids)
+
+
+def _clear_round_scores(conn, round_ids):
+    """회차 성과표 행 삭제 + 누적 집계에서 차감 (회차 삭제/교체 시)"""
+    scope, params = _round_scope(round_ids)
+    old = _score_contributions(conn, scope, params)
+    conn.execute(f"DELETE FROM round_scores {_where(scope)}", params)
+    conn.execute(f"DELETE FROM round_details {_where(scope)}", params)
+    _apply_aggregate_delta(conn, old, {})
+
+
+def _refresh_round_scores(conn, round_ids=None, code_id=None):
+    """회차 성과표(round_scores) 재계산 — 쓰기 경로와 재구축 명령에서 호출
+
+    round_ids=None 이면 전체 회차를 다시 계산하고 누적 집계도 새로 만든다.
+    범위를 지정하면 이전/이후 기여분의 차이만 누적 집계에 반영하며,
+    code_id 지정 시 해당 코드 예측만 갱신한다. 커밋은 호출자가 담당한다.
+    """
+    scope, params = _round_scope(round_ids) if round_ids is not None else ("", [])
+    source_scope, source_params = scope, list(params)
+    if code_id is not None:
+        source_scope = ' AND '.join(c for c in [scope, "kind='code'", "source=?"] if c)
+        source_params.append(code_id)
+
+    if round_ids is None:
+        old = {}
+        conn.execute("DELETE FROM score_aggregates")
+    else:
+        old = _score_contributions(conn, source_scope, source_params)
+    conn.execute(f"DELETE FROM round_scores {_where(source_scope)}", source_params)
+
+    rounds = conn.execute(
+        f"SELECT * FROM rounds {_where(scope.replace('round_id', 'id'))}", params
+    ).fetchall()
+    actual_by_round = {r['id']: [r[f'num{i}'] for i in range(1, 7)] for r in rounds}
+
+    if code_id is not None:
+        sources = [('code', conn.execute(
+            PREDICTION_SETS_QUERY.format(where=_where(scope, "code_id=?")), params + [code_id]
+        ).fetchall())]
+    else:
+        sources = [
+            ('code', conn.execute(PREDICTION_SETS_QUERY.format(where=_where(scope)), params).fetchall()),
+            ('baseline', conn.execute(BASELINE_SETS_QUERY.format(where=_where(scope)), params).fetchall()),
+        ]
+
+    for kind, rows in sources:
+        scores = _score_set_rows(actual_by_round, rows)
+        conn.executemany(
+            f"INSERT INTO round_scores (round_id, kind, source, max_match, avg_match, "
+            f"match_3plus, match_4plus, match_5plus, n_sets, matches, {', '.join(ZONE_COLUMNS)}, numbers) "
+            f"VALUES ({', '.join('?' * (11 + len(ZONE_COLUMNS)))})",
+            [
+                (round_id, kind, source, s['max_match'], s['avg_match'], s['match_3plus'],
+                 s['match_4plus'], s['match_5plus'], s['n_sets'], json.dumps(s['all_matches']),
+                 *s['zones'], s['numbers'])
+                for (round_id, source), s in scores.items()
+            ]
+        )
+
+    _apply_aggregate_delta(conn, old, _score_contributions(conn, source_scope, source_params))
+    _refresh_round_details(conn, round_ids)
+
+
+def _refresh_round_details(conn, round_ids=None):
+    """회차 상세 분석(round_details) 재계산 — 회차 단위로 전체 코드를 다시 저장
+
+    적중 번호는 SQL 의 mask 교집합 비트에서 읽으므로 세트마다 집합 연산을 하지 않는다.
+    코드 이름/색상은 조회 시 붙인다 (저장 값은 번호/일치 정보만). 커밋은 호출자가 담당한다.
+    """
+    scope, params = _round_scope(round_ids) if round_ids is not None else ("", [])
+    conn.execute(f"DELETE FROM round_details {_where(scope)}", params)
+
+    details = {}
+    for r in conn.execute(
+        f"SELECT id, round_number, draw_date, num1, num2, num3, num4, num5, num6, bonus "
+        f"FROM rounds {_where(scope.replace('round_id', 'id'))}", params
+    ):
+        details[r['id']] = {
+            'round_number': r['round_number'],
+            'draw_date': r['draw_date'],
+            'actual': [r[f'num{i}'] for i in range(1, 7)],
+            'bonus': r['bonus'],
+            'codes': {},
+        }
+
+    for p in conn.execute(
+        "SELECT p.round_id, p.code_id, p.num1, p.num2, p.num3, p.num4, p.num5, p.num6, "
+        "p.mask & r.mask AS hit_mask FROM predictions p JOIN rounds r ON r.id = p.round_id "
+        f"{_where(scope.replace('round_id', 'p.round_id'))} ORDER BY p.round_id, p.code_id, p.set_number",
+        params
+    ):
+        detail = details.get(p['round_id'])
+        if detail is None:
+            continue
+        numbers, hit_mask = list(p[2:8]), p['hit_mask']
+        hits = sorted({n for n in numbers if hit_mask >> n & 1})  # 중복 번호가 든 이전 세트도 한 번만
+        detail['codes'].setdefault(p['code_id'], []).append(
+            {'numbers': numbers, 'match_count': len(hits), 'hit_numbers': hits}
+        )
+
+    for detail in details.values():
+        for code_id, sets in detail['codes'].items():
+            matches = [s['match_count'] for s in sets]
+            best_idx = matches.index(max(matches))
+            for i, s in enumerate(sets):
+                s['is_best'] = i == best_idx
+            detail['codes'][code_id] = {
+                'max_match': max(matches),
+                'avg_match': round(sum(matches) / len(matches), 2),
+                'sets': sets,
+            }
+
+    conn.executemany(
+        "INSERT INTO round_details (round_id, round_number, payload) VALUES (?, ?, ?)",
+        [(rid, d['round_number'], json.dumps(d, ensure_ascii=False, separators=(',', ':')))
+         for rid, d in details.items()]
+    )
+
+
+def rebuild_round_scores():
+    """회차 성과표 전체 재구축 (기존 DB 백필용) → 생성된 행 수"""
     conn = get_db()
-    rounds = conn.execute("SELECT * FROM rounds ORDER BY round_number ASC").fetchall()
+    try:
+        _refresh_round_scores(conn)
+        _bump_data_version(conn, 'rebuild')
+        conn.commit()
+        return conn.execute("SELECT COUNT(*) FROM round_scores").fetchone()[0]
+    except Exception:
+        conn.rollback()
+        raise
 
-    if not rounds:
-        conn.close()
-        return {
-            'total_rounds': 0,
-            'code_rankings': [],
-            'round_labels': [],
-            'performance_series': {},
-            'random_series': {},
-            'zone_heatmap': {},
+
+def check_aggregates():
+    """누적 집계를 원본 데이터 전체 재계산과 비교 → 불일치 목록 (비어 있으면 정상)"""
+    conn = get_db()
+    rounds = conn.execute("SELECT * FROM rounds").fetchall()
+    actual_by_round = {r['id']: [r[f'num{i}'] for i in range(1, 7)] for r in rounds}
+
+    zero = [0] * len(AGGREGATE_COLUMNS)
+    expected, rand5_maxes = {}, {}
+    for kind, query in (('code', PREDICTION_SETS_QUERY), ('baseline', BASELINE_SETS_QUERY)):
+        scores = _score_set_rows(actual_by_round, conn.execute(query.format(where="")).fetchall())
+        for (round_id, source), s in scores.items():
+            values = [1, s['max_match'], s['match_3plus'], s['match_4plus'], s['match_5plus'], *s['zones']]
+            acc = expected.setdefault((kind, source), list(zero))
+            for i, v in enumerate(values):
+                acc[i] += v
+            if kind == 'baseline' and source in RAND5_GROUPS:
+                rand5_maxes.setdefault(round_id, []).append(s['max_match'])
+    if rand5_maxes:
+        rand5 = [round(sum(m) / len(m), 2) for m in rand5_maxes.values()]
+        expected[('random', 'rand5_avg')] = [len(rand5), sum(round(v * 100) for v in rand5)] + zero[2:]
+
+    stored = {key: [row[c] for c in AGGREGATE_COLUMNS] for key, row in _load_aggregates(conn).items()}
+
+    mismatches = []
+    for key in sorted(set(expected) | set(stored)):
+        exp, got = expected.get(key, zero), stored.get(key, zero)
+        if exp != got:
+            mismatches.append({
+                'kind': key[0],
+                'source': key[1],
+                'expected': dict(zip(AGGREGATE_COLUMNS, exp)),
+                'actual': dict(zip(AGGREGATE_COLUMNS, got)),
+            })
+    return mismatches
+
+
+def _window_condition(last_n=None, from_round=None, to_round=None, column='r.round_number'):
+    """조회 구간을 하위 쿼리 조건으로 → (SQL 조건 목록, 파라미터) — 별도 회차 조회 없이 한 쿼리로 필터"""
+    conds, params = [], []
+    if from_round is not None:
+        conds.append(f"{column} >= ?")
+        params.append(from_round)
+    if to_round is not None:
+        conds.append(f"{column} <= ?")
+        params.append(to_round)
+    if last_n is not None:
+        inner = _where(*(c.replace(column, 'round_number') for c in conds))
+        conds.append(
+            f"{column} >= (SELECT MIN(round_number) FROM "
+            f"(SELECT round_number FROM rounds {inner} ORDER BY round_number DESC LIMIT ?))"
+        )
+        params += params + [last_n]
+    return conds, params
+
+
+def get_code_performance(code_id, last_n=None, from_round=None, to_round=None):
+    """특정 코드의 회차별 성과 (단일 쿼리, 회차 오름차순)"""
+    conds, params = _window_condition(last_n, from_round, to_round)
+    rows = get_db().execute(
+        "SELECT r.round_number, s.max_match, s.avg_match, s.match_3plus, s.match_4plus, s.match_5plus, "
+        "s.n_sets, s.matches FROM round_scores s JOIN rounds r ON r.id = s.round_id "
+        f"{_where('s.kind=?', 's.source=?', *conds)} ORDER BY r.round_number",
+        ['code', code_id, *params]
+    ).fetchall()
+    return [
+        {
+            'round_number': row['round_number'],
+            'max_match': row['max_match'],
+            'avg_match': row['avg_match'],
+            'match_3plus': row['match_3plus'],
+            'match_4plus': row['match_4plus'],
+            'match_5plus': row['match_5plus'],
+            'n_sets': row['n_sets'],
+            'all_matches': json.loads(row['matches']),
         }
+        for row in rows
+    ]
 
-    # ── 1. 코드별 성과 집계 ──
-    code_stats = {}
-    round_labels = []
-    performance_series = {}  # code_id → [max_match per round]
-    random_series = {}       # group → [max_match per round]
-    zone_heatmap = {}        # code_id → {zone: count}
 
-    for code_id in CODES:
-        code_stats[code_id] = {
-            'total_rounds': 0,
-            'total_max_matches': 0,
-            'match_3plus': 0,
-            'match_4plus': 0,
-            'match_5plus': 0,
-            'all_numbers': [],
+def _rolling_mean(values, n):
+    """누적합 차이로 계산한 이동 평균 (앞쪽은 가능한 만큼의 부분 구간)"""
+    import numpy as np
+    cumulative = np.concatenate([[0.0], np.cumsum(values, dtype=np.float64)])
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - n, 0)
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def _streaks(flags):
+    """불리언 배열 → (회차별 연속 길이 배열, 현재 연속, 최장 연속)"""
+    import numpy as np
+    flags = np.asarray(flags, dtype=bool)
+    if not len(flags):
+        return np.zeros(0, dtype=np.int64), 0, 0
+    positions = np.arange(len(flags))
+    last_break = np.maximum.accumulate(np.where(flags, -1, positions))
+    running = np.where(flags, positions - last_break, 0)
+    return running, int(running[-1]), int(running.max())
+
+
+def get_code_drilldown(code_id, rolling=10, last_n=None, from_round=None, to_round=None):
+    """코드 상세 분석 — 회차별 추이, 이동 평균, 연속 기록, 순위 변화 (단일 쿼리 + 벡터 연산)
+
+    순위는 구간 시작부터의 누적 성적을 대시보드와 같은 기준(avg_max_match → pct_3plus →
+    match_4plus)으로 비교해 매 회차 계산한다. 코드 예측이 없으면 None.
+    """
+    import numpy as np
+    codes = get_codes()
+    conds, params = _window_condition(last_n, from_round, to_round)
+    rows = get_db().execute(
+        "SELECT r.round_number, s.source, s.max_match, s.avg_match, s.match_3plus, s.match_4plus, "
+        "s.match_5plus, s.n_sets FROM round_scores s JOIN rounds r ON r.id = s.round_id "
+        f"{_where('s.kind=?', *conds)} ORDER BY r.round_number",
+        ['code', *params]
+    ).fetchall()
+    sources = {row['source'] for row in rows}
+    code_ids = [c for c in codes if c in sources]
+    if code_id not in code_ids:
+        return None
+
+    # ── 1. 코드 × 회차 행렬 ──
+    data = np.array([(row['round_number'], row['max_match'], row['match_3plus'], row['match_4plus'],
+                      row['match_5plus'], row['n_sets']) for row in rows], dtype=np.int64)
+    avg_match = np.array([row['avg_match'] for row in rows])
+    code_pos = {c: i for i, c in enumerate(code_ids)}
+    keep = np.array([row['source'] in code_pos for row in rows])
+    code_idx = np.array([code_pos.get(row['source'], -1) for row in rows])[keep]
+    data, avg_match = data[keep], avg_match[keep]
+    round_numbers, round_idx = np.unique(data[:, 0], return_inverse=True)
+
+    shape = (len(code_ids), len(round_numbers))
+    present = np.zeros(shape, dtype=np.int64)
+    max_m, m3, m4 = np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64)
+    present[code_idx, round_idx] = 1
+    max_m[code_idx, round_idx] = data[:, 1]
+    m3[code_idx, round_idx] = data[:, 2]
+    m4[code_idx, round_idx] = data[:, 3]
+
+    # ── 2. 누적 성적 → 회차별 순위 ──
+    with np.errstate(invalid='ignore', divide='ignore'):
+        counts = np.cumsum(present, axis=1)
+        cum_avg = np.round(np.cumsum(max_m, axis=1) / counts, 2)
+        cum_pct = np.round(np.cumsum(m3, axis=1) / counts * 100, 1)
+    cum_m4 = np.cumsum(m4, axis=1)
+    t = code_pos[code_id]
+    better = (cum_avg > cum_avg[t]) | ((cum_avg == cum_avg[t]) & (
+        (cum_pct > cum_pct[t]) | ((cum_pct == cum_pct[t]) & (cum_m4 > cum_m4[t]))))
+    rank = 1 + better.sum(axis=0)
+    ranked_codes = (counts > 0).sum(axis=0)
+
+    # ── 3. 대상 코드 시계열 ──
+    mine = code_idx == code_pos[code_id]
+    own = data[mine]
+    own_rounds = round_idx[mine]
+    sets = codes[code_id]['sets']
+    expected = np.array([baseline.expected_max_match(int(k)) for k in own[:, 5]])
+    hit_run, hit_current, hit_longest = _streaks(own[:, 1] >= 3)
+    above_run, above_current, above_longest = _streaks(own[:, 1] > expected)
+    _, miss_current, miss_longest = _streaks(own[:, 1] < 3)
+    n = len(own)
+
+    return {
+        'code_id': code_id,
+        'name': codes[code_id]['name'],
+        'short': codes[code_id]['short'],
+        'color': codes[code_id]['color'],
+        'sets': sets,
+        'rolling': rolling,
+        'random_expected': round(float(expected.mean()), 3),
+        'summary': {
+            'rounds': n,
+            'first_round': int(own[0, 0]),
+            'last_round': int(own[-1, 0]),
+            'avg_max_match': round(float(own[:, 1].mean()), 2),
+            'pct_3plus': round(float(own[:, 2].sum()) / n * 100, 1),
+            'match_4plus': int(own[:, 3].sum()),
+            'match_5plus': int(own[:, 4].sum()),
+            'best_match': int(own[:, 1].max()),
+            'rank': int(rank[own_rounds[-1]]),
+            'ranked_codes': int(ranked_codes[own_rounds[-1]]),
+        },
+        'streaks': {
+            'hit_3plus': {'current': hit_current, 'longest': hit_longest},
+            'above_random': {'current': above_current, 'longest': above_longest},
+            'miss_3plus': {'current': miss_current, 'longest': miss_longest},
+        },
+        'series': {
+            'round_numbers': own[:, 0].tolist(),
+            'max_match': own[:, 1].tolist(),
+            'avg_match': np.round(avg_match[mine], 2).tolist(),
+            'match_3plus': own[:, 2].tolist(),
+            'rolling_avg_max': np.round(_rolling_mean(own[:, 1], rolling), 3).tolist(),
+            'rolling_pct_3plus': np.round(_rolling_mean(own[:, 2], rolling) * 100, 1).tolist(),
+            'hit_streak': hit_run.tolist(),
+            'above_random_streak': above_run.tolist(),
+            'rank': rank[own_rounds].tolist(),
+            'ranked_codes': ranked_codes[own_rounds].tolist(),
+        },
+    }
+
+
+def get_code_round_series(last_n=None, from_round=None, to_round=None):
+    """구간 내 코드별 회차 성과 배열 (유의성 검정용)
+
+    → {code_id: {'round_numbers', 'max_match', 'match_3plus', 'n_sets'}} (회차 오름차순 numpy 배열)
+    """
+    import numpy as np
+    codes = get_codes()
+    conn = get_db()
+    rounds = _window_rounds(conn, last_n, from_round, to_round)
+    if not rounds:
+        return {}
+    rows = conn.execute(
+        "SELECT s.source, r.round_number, s.max_match, s.match_3plus, s.n_sets "
+        "FROM round_scores s JOIN rounds r ON r.id = s.round_id "
+        "WHERE s.kind='code' AND r.round_number BETWEEN ? AND ? "
+        "ORDER BY s.source, r.round_number",
+        (rounds[0]['round_number'], rounds[-1]['round_number'])
+    ).fetchall()
+
+    by_code = {}
+    for row in rows:
+        by_code.setdefault(row['source'], []).append(tuple(row)[1:])
+    series = {}
+    for code_id in codes:
+        if code_id not in by_code:
+            continue
+        columns = np.array(by_code[code_id], dtype=np.int64).T
+        series[code_id] = dict(zip(('round_numbers', 'max_match', 'match_3plus', 'n_sets'), columns))
+    return series
+
+
+NUMBER_INDEX_CHUNK = 20000  # 번호 인덱스 합산 시 한 번에 읽는 성과표 행 수
+ROLLING_MAX_POINTS = 500    # 이동 구간 히트맵 최대 구간 수 (step 미지정 시 자동 조정)
+
+
+def _decode_numbers(blobs):
+    """round_scores.numbers BLOB 목록 → (N, 46) int64 배열 (인덱스 = 번호)"""
+    import numpy as np
+    return np.frombuffer(b''.join(blobs), dtype=NUMBER_DTYPE).reshape(-1, scoring.MAX_NUMBER + 1).astype(np.int64)
+
+
+def _window_draws(conn, rounds):
+    """구간 회차의 당첨 번호 원-핫 (R, 46) + round_id → 행 위치"""
+    rows = conn.execute(
+        "SELECT id, num1, num2, num3, num4, num5, num6 FROM rounds "
+        "WHERE round_number BETWEEN ? AND ? ORDER BY round_number",
+        (rounds[0]['round_number'], rounds[-1]['round_number'])
+    ).fetchall()
+    onehot = scoring.encode_draws([tuple(r)[1:] for r in rows])
+    return onehot, {r['id']: i for i, r in enumerate(rows)}
+
+
+def get_number_index(last_n=None, from_round=None, to_round=None):
+    """구간 내 번호별 예측 빈도 / 당첨 횟수 / 적중률 인덱스
+
+    성과표의 번호별 빈도(46칸 BLOB)를 청크 단위로 코드별 합산한다 (메모리 일정).
+    → {'rounds', 'numbers': [1..45], 'drawn': [45], 'codes': {code_id: {'predicted', 'hits', 'hit_rate'}}}
+    """
+    import numpy as np
+    codes = get_codes()
+    conn = get_db()
+    rounds = _window_rounds(conn, last_n, from_round, to_round)
+    numbers = list(range(1, scoring.MAX_NUMBER + 1))
+    if not rounds:
+        return {'rounds': 0, 'numbers': numbers, 'drawn': [0] * len(numbers), 'codes': {}}
+
+    onehot, round_pos = _window_draws(conn, rounds)
+    code_pos = {code_id: i for i, code_id in enumerate(codes)}
+    predicted = np.zeros((len(code_pos), scoring.MAX_NUMBER + 1), dtype=np.int64)
+    hits = np.zeros_like(predicted)
+
+    cursor = conn.execute(
+        "SELECT s.round_id, s.source, s.numbers FROM round_scores s JOIN rounds r ON r.id = s.round_id "
+        "WHERE s.kind='code' AND r.round_number BETWEEN ? AND ?",
+        (rounds[0]['round_number'], rounds[-1]['round_number'])
+    )
+    while True:
+        batch = cursor.fetchmany(NUMBER_INDEX_CHUNK)
+        if not batch:
+            break
+        rows = [row for row in batch if row[1] in code_pos]
+        if not rows:
+            continue
+        counts = _decode_numbers([row[2] for row in rows])
+        code_idx = np.array([code_pos[row[1]] for row in rows], dtype=np.intp)
+        round_idx = np.array([round_pos[row[0]] for row in rows], dtype=np.intp)
+        np.add.at(predicted, code_idx, counts)
+        np.add.at(hits, code_idx, counts * onehot[round_idx])
+
+    by_code = {}
+    for code_id, i in code_pos.items():
+        if not predicted[i].any():
+            continue
+        rate = np.divide(hits[i], predicted[i], out=np.zeros(len(hits[i])), where=predicted[i] > 0)
+        by_code[code_id] = {
+            'predicted': predicted[i, 1:].tolist(),
+            'hits': hits[i, 1:].tolist(),
+            'hit_rate': np.round(rate[1:], 4).tolist(),
         }
-        performance_series[code_id] = []
-        zone_heatmap[code_id] = {zone: 0 for zone in LOTTO_ZONES}
-
-    for group in ['rand5_avg', 'rand21']:
-        random_series[group] = []
-
-    for r in rounds:
-        round_number = r['round_number']
-        round_labels.append(str(round_number))
-        actual = [r[f'num{i}'] for i in range(1, 7)]
-        actual_set = set(actual)
-        round_id = r['id']
-
-        # 각 코드 성과
-        for code_id in CODES:
-            preds = conn.execute(
-                "SELECT * FROM predictions WHERE round_id=? AND code_id=? ORDER BY set_number",
-                (round_id, code_id)
-            ).fetchall()
-
-            if preds:
-                pred_sets = [[p[f'num{i}'] for i in range(1, 7)] for p in preds]
-                matches = compute_matches(actual, pred_sets)
-                max_m = max(matches)
-
-                code_stats[code_id]['total_rounds'] += 1
-                code_stats[code_id]['total_max_matches'] += max_m
-                code_stats[code_id]['match_3plus'] += sum(1 for m in matches if m >= 3)
-                code_stats[code_id]['match_4plus'] += sum(1 for m in matches if m >= 4)
-                code_stats[code_id]['match_5plus'] += sum(1 for m in matches if m >= 5)
-                performance_series[code_id].append(max_m)
-
-                # 번호 대역별 카운트
-                for nums in pred_sets:
-                    for n in nums:
-                        code_stats[code_id]['all_numbers'].append(n)
-                        for zone_name, zone_nums in LOTTO_ZONES.items():
-                            if n in zone_nums:
-                                zone_heatmap[code_id][zone_name] += 1
-            else:
-                performance_series[code_id].append(None)
-
-        # 랜덤 기준선
-        rand5_maxes = []
-        for group in ['rand5_A', 'rand5_B', 'rand5_C']:
-            bl_rows = conn.execute(
-                "SELECT * FROM random_baselines WHERE round_id=? AND baseline_group=?",
-                (round_id, group)
-            ).fetchall()
-            if bl_rows:
-                bl_sets = [[b[f'num{i}'] for i in range(1, 7)] for b in bl_rows]
-                bl_matches = compute_matches(actual, bl_sets)
-                rand5_maxes.append(max(bl_matches))
-
-        random_series['rand5_avg'].append(
-            round(sum(rand5_maxes) / len(rand5_maxes), 2) if rand5_maxes else None
-        )
+    return {
+        'rounds': len(rounds),
+        'numbers': numbers,
+        'drawn': onehot.sum(axis=0)[1:].tolist(),
+        'codes': by_code,
+    }
 
-        bl21_rows = conn.execute(
-            "SELECT * FROM random_baselines WHERE round_id=? AND baseline_group='rand21'",
-            (round_id,)
-        ).fetchall()
-        if bl21_rows:
-            bl21_sets = [[b[f'num{i}'] for i in range(1, 7)] for b in bl21_rows]
-            bl21_matches = compute_matches(actual, bl21_sets)
-            random_series['rand21'].append(max(bl21_matches))
-        else:
-            random_series['rand21'].append(None)
 
-    conn.close()
+def get_number_rolling(code_id, window=50, step=None, last_n=None, from_round=None, to_round=None):
+    """코드의 번호별 이동 구간 히트맵 — 회차 축 누적합 차이로 모든 구간을 한 번에 계산
+
+    step 을 생략하면 구간 수가 ROLLING_MAX_POINTS 이하가 되도록 정한다.
+    → {'code_id', 'window', 'step', 'numbers', 'labels': [구간 끝 회차], 'predicted', 'hits', 'drawn'}
+      (predicted/hits/drawn 은 [구간][번호] 2차원 리스트)
+    """
+    import numpy as np
+    conn = get_db()
+    rounds = _window_rounds(conn, last_n, from_round, to_round)
+    window = max(1, min(window, len(rounds)))
+    result = {
+        'code_id': code_id, 'window': window, 'step': step,
+        'numbers': list(range(1, scoring.MAX_NUMBER + 1)),
+        'labels': [], 'predicted': [], 'hits': [], 'drawn': [],
+    }
+    if not rounds:
+        return result
+
+    onehot, round_pos = _window_draws(conn, rounds)
+    predicted = np.zeros(onehot.shape, dtype=np.int64)
+    rows = conn.execute(
+        "SELECT s.round_id, s.numbers FROM round_scores s JOIN rounds r ON r.id = s.round_id "
+        "WHERE s.kind='code' AND s.source=? AND r.round_number BETWEEN ? AND ?",
+        (code_id, rounds[0]['round_number'], rounds[-1]['round_number'])
+    ).fetchall()
+    if rows:
+        predicted[[round_pos[row[0]] for row in rows]] = _decode_numbers([row[1] for row in rows])
+
+    n_windows = len(rounds) - window + 1
+    step = step if step and step > 0 else max(1, -(-n_windows // ROLLING_MAX_POINTS))
+    ends = np.arange(window - 1, len(rounds), step)
+
+    def window_sums(per_round):
+        cumulative = np.vstack([np.zeros((1, per_round.shape[1]), dtype=np.int64), np.cumsum(per_round, axis=0)])
+        return (cumulative[ends + 1] - cumulative[ends + 1 - window])[:, 1:].tolist()
+
+    result.update({
+        'step': step,
+        'labels': [rounds[e]['round_number'] for e in ends],
+        'predicted': window_sums(predicted),
+        'hits': window_sums(predicted * onehot),
+        'drawn': window_sums(onehot.astype(np.int64)),
+    })
+    return result
+
+
+def _load_aggregates(conn):
+    """누적 집계 로드 → {(kind, source): {컬럼: 값}}"""
+    return {
+        (row['kind'], row['source']): {c: row[c] for c in AGGREGATE_COLUMNS}
+        for row in conn.execute("SELECT * FROM score_aggregates")
+    }
+
 
-    # ── 2. 랭킹 계산 ──
+def _window_rounds(conn, last_n=None, from_round=None, to_round=None):
+    """조회 구간의 회차 (round_number 오름차순) — last_n 은 구간 내 최근 N회차"""
+    conds, params = [], []
+    if from_round is not None:
+        conds.append("round_number >= ?")
+        params.append(from_round)
+    if to_round is not None:
+        conds.append("round_number <= ?")
+        params.append(to_round)
+    limit = ""
+    if last_n is not None:
+        limit = "LIMIT ?"
+        params.append(last_n)
+    rows = conn.execute(
+        f"SELECT id, round_number FROM rounds {_where(*conds)} ORDER BY round_number DESC {limit}",
+        params
+    ).fetchall()
+    return rows[::-1]
+
+
+def _random_expected_by_code(conn, scope="", params=()):
+    """코드별 랜덤 기댓값 — 회차마다 실제 입력된 세트 수(n_sets)의 최대 일치 기댓값 평균
+
+    유의성 검정 / 코드 상세와 같은 정의 (세트를 덜 입력한 회차는 그 세트 수로 비교).
+    """
+    totals = {}
+    for row in conn.execute(
+        f"SELECT source, n_sets, COUNT(*) FROM round_scores {_where(scope, 'kind = ?')} GROUP BY source, n_sets",
+        [*params, 'code']
+    ):
+        total = totals.setdefault(row[0], [0, 0.0])
+        total[0] += row[2]
+        total[1] += row[2] * baseline.expected_max_match(row[1])
+    return {source: expected / n for source, (n, expected) in totals.items()}
+
+
+def _code_rankings(aggregates, codes, random_expected):
+    """누적 집계 → 코드 랭킹 행 목록 (avg_max_match → pct_3plus → match_4plus 순)
+
+    random_expected: _random_expected_by_code() 결과 (같은 범위)
+    """
     rankings = []
-    for code_id, stats in code_stats.items():
-        n = stats['total_rounds']
+    for code_id in codes:
+        stats = aggregates.get(('code', code_id))
+        n = stats['total_rounds'] if stats else 0
         if n == 0:
             continue
         avg_max = stats['total_max_matches'] / n
         pct_3plus = stats['match_3plus'] / n * 100 if n > 0 else 0
 
-        # 랜덤 대비 향상율
-        rand_key = 'rand21' if CODES[code_id]['sets'] == 21 else 'rand5_avg'
-        rand_vals = [v for v in random_series[rand_key] if v is not None]
-        rand_avg = sum(rand_vals) / len(rand_vals) if rand_vals else 1
-        improvement = ((avg_max - rand_avg) / rand_avg * 100) if rand_avg > 0 else 0
+        # 랜덤 대비 향상율 (회차별로 같은 세트 수를 무작위 선택했을 때의 최대 일치 기댓값 대비)
+        rand_avg = random_expected[code_id]
+        improvement = (avg_max - rand_avg) / rand_avg * 100
 
         rankings.append({
             'code_id': code_id,
-            'name': CODES[code_id]['name'],
-            'short': CODES[code_id]['short'],
-            'color': CODES[code_id]['color'],
-            'sets': CODES[code_id]['sets'],
+            'name': codes[code_id]['name'],
+            'short': codes[code_id]['short'],
+            'color': codes[code_id]['color'],
+            'sets': codes[code_id]['sets'],
             'rounds': n,
             'avg_max_match': round(avg_max, 2),
             'pct_3plus': round(pct_3plus, 1),
             'match_4plus': stats['match_4plus'],
             'match_5plus': stats['match_5plus'],
             'vs_random': round(improvement, 1),
+            'random_expected': round(rand_avg, 3),
         })
 
     # 랭킹 정렬: avg_max_match → pct_3plus → match_4plus
     rankings.sort(key=lambda x: (x['avg_max_match'], x['pct_3plus'], x['match_4plus']), reverse=True)
     for i, r in enumerate(rankings):
         r['rank'] = i + 1
+    return rankings
 
-    # ── 3. 번호 대역 히트맵 정규화 ──
-    zone_heatmap_normalized = {}
-    for code_id, zones in zone_heatmap.items():
+
+def _zone_heatmap(aggregates, codes):
+    """누적 집계 → 코드별 번호 대역 비율(%)"""
+    zone_heatmap = {}
+    for code_id in codes:
+        stats = aggregates.get(('code', code_id))
+        zones = {zone: stats[col] if stats else 0 for zone, col in zip(LOTTO_ZONES, ZONE_COLUMNS)}
         total = sum(zones.values())
         if total > 0:
-            zone_heatmap_normalized[code_id] = {
-                z: round(v / total * 100, 1) for z, v in zones.items()
+            zone_heatmap[code_id] = {z: round(v / total * 100, 1) for z, v in zones.items()}
+        else:
+            zone_heatmap[code_id] = zones
+    return zone_heatmap
+
+
+def get_dashboard_data(last_n=None, from_round=None, to_round=None):
+    """대시보드 전체 데이터 생성
+
+    구간(last_n / from_round~to_round)을 지정하면 해당 회차만 집계한다.
+    """
+    import numpy as np
+    codes = get_codes()
+    windowed = any(v is not None for v in (last_n, from_round, to_round))
+    conn = get_db()
+    with instrumentation.phase('dashboard.rounds'):
+        rounds = _window_rounds(conn, last_n, from_round, to_round)
+
+    if not rounds:
+        return {
+            'total_rounds': 0,
+            'code_rankings': [],
+            'round_labels': [],
+            'performance_series': {},
+            'random_series': {},
+            'random_expected': {},
+            'zone_heatmap': {},
+        }
+
+    # ── 0. 누적 집계 + 회차별 최대일치 로드 ──
+    with instrumentation.phase('dashboard.load'):
+        if windowed:
+            # 구간 집계: 전체 누적 집계 대신 구간 내 성과표만 합산
+            scope = "round_id IN (SELECT id FROM rounds WHERE round_number BETWEEN ? AND ?)"
+            params = [rounds[0]['round_number'], rounds[-1]['round_number']]
+            aggregates = {
+                key: dict(zip(AGGREGATE_COLUMNS, values))
+                for key, values in _score_contributions(conn, scope, params).items()
             }
         else:
-            zone_heatmap_normalized[code_id] = zones
+            scope, params = "", []
+            aggregates = _load_aggregates(conn)
+        # 코드 성과표는 (코드, 회차) 행렬로 한 번에 채운다 — 코드 수 × 회차 수 만큼의 파이썬 조회 없음
+        code_rows = conn.execute(
+            f"SELECT round_id, source, max_match FROM round_scores {_where(scope, 'kind = ?')}", params + ['code']
+        ).fetchall()
+        baseline_max = {
+            (row['round_id'], row['source']): row['max_match']
+            for row in conn.execute(
+                f"SELECT round_id, source, max_match FROM round_scores {_where(scope, 'kind = ?')}",
+                params + ['baseline']
+            )
+        }
+
+    # ── 1. 회차별 추이 ──
+    with instrumentation.phase('dashboard.series'):
+        round_labels = [str(r['round_number']) for r in rounds]
+        code_index = {code_id: i for i, code_id in enumerate(codes)}
+        round_ids = np.array([r['id'] for r in rounds], dtype=np.int64)
+        id_order = np.argsort(round_ids)
+        matrix = np.full((len(codes), len(rounds)), -1, dtype=np.int8)  # -1 = 예측 없음
+        if code_rows:
+            ids = np.array([row[0] for row in code_rows], dtype=np.int64)
+            code_pos = np.array([code_index.get(row[1], -1) for row in code_rows], dtype=np.int64)
+            maxes = np.array([row[2] for row in code_rows], dtype=np.int8)
+            round_pos = id_order[np.searchsorted(round_ids[id_order], ids)]
+            known = code_pos >= 0  # 등록되지 않은 코드의 성과표 행은 무시
+            matrix[code_pos[known], round_pos[known]] = maxes[known]
+        performance_series = {  # code_id → [max_match per round]
+            code_id: [v if v >= 0 else None for v in matrix[i].tolist()]
+            for code_id, i in code_index.items()
+        }
+        random_series = {'rand5_avg': [], 'rand21': []}  # 기존 표본 기준선 (생성된 회차만, 그 외 None)
+
+        for r in rounds:
+            round_id = r['id']
+            rand5_maxes = [
+                baseline_max[(round_id, group)]
+                for group in RAND5_GROUPS
+                if (round_id, group) in baseline_max
+            ]
+            random_series['rand5_avg'].append(
+                round(sum(rand5_maxes) / len(rand5_maxes), 2) if rand5_maxes else None
+            )
+            random_series['rand21'].append(baseline_max.get((round_id, 'rand21')))
+
+    # ── 2. 랭킹 계산 (누적 집계 기반, O(코드 수)) ──
+    with instrumentation.phase('dashboard.rankings'):
+        rankings = _code_rankings(aggregates, codes, _random_expected_by_code(conn, scope, params))
+
+    # ── 3. 번호 대역 히트맵 정규화 ──
+    with instrumentation.phase('dashboard.heatmap'):
+        zone_heatmap_normalized = _zone_heatmap(aggregates, codes)
 
     return {
         'total_rounds': len(rounds),
@@ -401,40 +1344,229 @@ def get_dashboard_data():
         'round_labels': round_labels,
         'performance_series': performance_series,
         'random_series': random_series,
+        'random_expected': {
+            f'rand{k}': round(baseline.expected_max_match(k), 3)
+            for k in sorted({info['sets'] for info in codes.values()})
+        },
         'zone_heatmap': zone_heatmap_normalized,
     }
 
 
+ROUND_CHANGE_KINDS = ('round', 'predictions', 'delete')
+
+
+def get_changes(since):
+    """since 버전 이후의 전체 이력 대시보드 변경분
+
+    → {'version', 'since', 'reset', 'events', 'rounds', 'total_rounds', 'code_rankings', 'zone_heatmap'}
+    rounds: 바뀐 회차별 {'round_number', 'label', 'removed', 'points': {code_id: max_match}}
+    (값은 조회 시점의 최신 상태이므로 순서대로 덮어써도 결과가 같다).
+    일괄 저장 / 재계산이 끼어 있거나 이벤트 로그 보관 범위를 벗어나면 reset=True 와 버전만 반환한다.
+    """
+    codes = get_codes()
+    conn = get_db()
+    version = get_data_version()
+    result = {'version': version, 'since': since, 'reset': since > version, 'events': [], 'rounds': []}
+    if since >= version:
+        return result  # 변경 없음 (since 가 더 크면 DB 가 바뀐 것이므로 reset)
+
+    events = [dict(row) for row in conn.execute(
+        "SELECT version, kind, round_number, code_id, created_at FROM change_events "
+        "WHERE version > ? AND version <= ? ORDER BY version",
+        (since, version)
+    )]
+    result['events'] = events
+    if len(events) != version - since or any(e['kind'] not in ROUND_CHANGE_KINDS for e in events):
+        result['reset'] = True
+        return result
+
+    round_numbers = sorted({e['round_number'] for e in events})
+    placeholders = ','.join('?' * len(round_numbers))
+    existing = {
+        row['round_number']: row['id']
+        for row in conn.execute(
+            f"SELECT id, round_number FROM rounds WHERE round_number IN ({placeholders})", round_numbers
+        )
+    }
+    points = {rn: {code_id: None for code_id in codes} for rn in existing}
+    for row in conn.execute(
+        "SELECT r.round_number, s.source, s.max_match FROM round_scores s JOIN rounds r ON r.id = s.round_id "
+        f"WHERE s.kind='code' AND r.round_number IN ({placeholders})",
+        round_numbers
+    ):
+        if row['source'] in codes:
+            points[row['round_number']][row['source']] = row['max_match']
+
+    result['rounds'] = [
+        {'round_number': rn, 'label': str(rn), 'removed': rn not in existing, 'points': points.get(rn, {})}
+        for rn in round_numbers
+    ]
+    aggregates = _load_aggregates(conn)
+    result['total_rounds'] = conn.execute("SELECT COUNT(*) FROM rounds").fetchone()[0]
+    result['code_rankings'] = _code_rankings(aggregates, codes, _random_expected_by_code(conn))
+    result['zone_heatmap'] = _zone_heatmap(aggregates, codes)
+    return result
+
+
+ROUND_DETAIL_CACHE_SIZE = 256  # 워커별로 보관하는 회차 상세 분석 수
+COMPARE_MAX_ROUNDS = 500       # 회차 비교 한 번에 다루는 최대 회차 수
+
+_round_detail_cache = LRUCache(ROUND_DETAIL_CACHE_SIZE)
+_round_detail_lock = threading.Lock()
+_round_detail_seen = {'version': None}  # 캐시가 반영한 마지막 데이터 버전
+
+
+def _sync_round_detail_cache(conn):
+    """마지막 확인 이후 바뀐 회차만 캐시에서 제거 (다른 워커의 쓰기도 change_events 로 감지) → 현재 버전"""
+    version = get_data_version()
+    seen = _round_detail_seen['version']
+    if seen == version:
+        return version
+
+    touched = None  # None = 전체 무효화
+    if seen is not None and seen < version:
+        events = conn.execute(
+            "SELECT kind, round_number FROM change_events WHERE version > ? AND version <= ?",
+            (seen, version)
+        ).fetchall()
+        if len(events) == version - seen and all(e['kind'] in ROUND_CHANGE_KINDS for e in events):
+            touched = {e['round_number'] for e in events}
+
+    with _round_detail_lock:
+        if _round_detail_seen['version'] == seen:
+            if touched is None:
+                _round_detail_cache.clear()
+            else:
+                for rn in touched:
+                    _round_detail_cache.discard(rn)
+            _round_detail_seen['version'] = version
+    return version
+
+
+def _load_round_detail(conn, round_number):
+    """저장된 회차 상세 분석 (캐시 우선) → dict, 회차가 없으면 None"""
+    version = _sync_round_detail_cache(conn)
+    detail = _round_detail_cache.get(round_number)
+    if detail is not None:
+        return detail
+
+    row = conn.execute("SELECT payload FROM round_details WHERE round_number=?", (round_number,)).fetchone()
+    if row is None:
+        return None
+    detail = json.loads(row['payload'])
+    with _round_detail_lock:
+        # 읽는 동안 다른 쓰기가 반영(무효화)됐으면 캐시에 넣지 않음
+        if _round_detail_seen['version'] == version:
+            _round_detail_cache.put(round_number, detail)
+    return detail
+
+
+def clear_round_detail_cache():
+    """회차 상세 분석 캐시 비우기 (벤치마크의 콜드 측정용)"""
+    with _round_detail_lock:
+        _round_detail_cache.clear()
+        _round_detail_seen['version'] = None
+
+
+def round_detail_cache_stats():
+    """회차 상세 분석 캐시 적중/미스 카운터"""
+    return {'version': _round_detail_seen['version'], **_round_detail_cache.stats()}
+
+
 def get_round_detail_analysis(round_number):
-    """특정 회차 상세 분석"""
-    data = get_round_data(round_number)
-    if not data:
+    """특정 회차 상세 분석 (쓰기 시 저장한 결과 + 워커별 LRU 캐시)
+
+    → {'round_number', 'draw_date', 'actual', 'bonus', 'codes': {code_id: {name, color, max_match,
+    avg_match, sets: [{numbers, match_count, hit_numbers, is_best}]}}}
+    """
+    codes = get_codes()
+    detail = _load_round_detail(get_db(), round_number)
+    if detail is None:
         return None
+    return {
+        **{k: v for k, v in detail.items() if k != 'codes'},
+        'codes': {
+            code_id: {'name': codes[code_id]['name'], 'color': codes[code_id]['color'], **detail['codes'][code_id]}
+            for code_id in codes if code_id in detail['codes']
+        },
+    }
 
-    actual = data['actual']
-    analysis = {'actual': actual, 'codes': {}}
-
-    for code_id, pred_sets in data['predictions'].items():
-        matches = compute_matches(actual, pred_sets)
-        best_idx = matches.index(max(matches))
-
-        # 번호별 적중 표시
-        set_details = []
-        for i, (s, m) in enumerate(zip(pred_sets, matches)):
-            hits = sorted(set(actual) & set(s))
-            set_details.append({
-                'numbers': s,
-                'match_count': m,
-                'hit_numbers': hits,
-                'is_best': i == best_idx,
-            })
 
-        analysis['codes'][code_id] = {
-            'name': CODES[code_id]['name'],
-            'color': CODES[code_id]['color'],
-            'max_match': max(matches),
-            'avg_match': round(sum(matches) / len(matches), 2),
-            'sets': set_details,
-        }
+def get_round_comparison(from_round, to_round):
+    """회차 구간 비교 — 성과표(round_scores)만 읽는 단일 쿼리
 
-    return analysis
+    → {'from_round', 'to_round', 'truncated', 'rounds': [{round_number, draw_date, actual, bonus,
+    codes: {code_id: {max_match, avg_match, match_3plus}}, best}], 'summary': [코드별 구간 성적]}
+    구간이 COMPARE_MAX_ROUNDS 보다 길면 앞쪽(오래된) 회차를 잘라낸다.
+    """
+    codes = get_codes()
+    if from_round > to_round:
+        from_round, to_round = to_round, from_round
+    rows = get_db().execute(
+        "SELECT r.round_number, r.draw_date, r.num1, r.num2, r.num3, r.num4, r.num5, r.num6, r.bonus, "
+        "s.source, s.max_match, s.avg_match, s.match_3plus "
+        "FROM (SELECT * FROM rounds WHERE round_number BETWEEN ? AND ? ORDER BY round_number DESC LIMIT ?) r "
+        "LEFT JOIN round_scores s ON s.round_id = r.id AND s.kind = 'code' "
+        "ORDER BY r.round_number",
+        (from_round, to_round, COMPARE_MAX_ROUNDS + 1)
+    ).fetchall()
+
+    rounds = {}
+    for row in rows:
+        entry = rounds.get(row['round_number'])
+        if entry is None:
+            entry = rounds[row['round_number']] = {
+                'round_number': row['round_number'],
+                'draw_date': row['draw_date'],
+                'actual': [row[f'num{i}'] for i in range(1, 7)],
+                'bonus': row['bonus'],
+                'codes': {},
+            }
+        if row['source'] in codes:
+            entry['codes'][row['source']] = {
+                'max_match': row['max_match'],
+                'avg_match': round(row['avg_match'], 2),
+                'match_3plus': row['match_3plus'],
+            }
+    rounds = list(rounds.values())
+    truncated = len(rounds) > COMPARE_MAX_ROUNDS
+    if truncated:
+        rounds = rounds[1:]
+
+    totals = {code_id: {'rounds': 0, 'max_sum': 0, 'best': 0, 'rounds_3plus': 0, 'wins': 0} for code_id in codes}
+    for entry in rounds:
+        scores = entry['codes']
+        # 코드별 정렬 순서를 등록 순서(sort_order)에 맞춤
+        entry['codes'] = {code_id: scores[code_id] for code_id in codes if code_id in scores}
+        top = max((c['max_match'] for c in scores.values()), default=None)
+        entry['best'] = [code_id for code_id, c in entry['codes'].items() if c['max_match'] == top]
+        for code_id, c in scores.items():
+            t = totals[code_id]
+            t['rounds'] += 1
+            t['max_sum'] += c['max_match']
+            t['best'] = max(t['best'], c['max_match'])
+            t['rounds_3plus'] += c['max_match'] >= 3
+            t['wins'] += code_id in entry['best']
+
+    summary = [
+        {
+            'code_id': code_id,
+            'name': codes[code_id]['name'],
+            'short': codes[code_id]['short'],
+            'color': codes[code_id]['color'],
+            'rounds': t['rounds'],
+            'avg_max_match': round(t['max_sum'] / t['rounds'], 2),
+            'best_match': t['best'],
+            'rounds_3plus': t['rounds_3plus'],
+            'wins': t['wins'],
+        }
+        for code_id, t in totals.items() if t['rounds']
+    ]
+    summary.sort(key=lambda x: (x['avg_max_match'], x['wins']), reverse=True)
+    return {
+        'from_round': rounds[0]['round_number'] if rounds else from_round,
+        'to_round': rounds[-1]['round_number'] if rounds else to_round,
+        'truncated': truncated,
+        'rounds': rounds,
+        'summary': summary,
+    }
@@ -0,0 +1,236 @@
+"""
+로또 예측 성능 분석 대시보드 - 당첨 등수 판정 (보너스 번호 포함) + 기대 수익
+
+등수 (로또 6/45):
+    1등 6개 일치, 2등 5개 + 보너스, 3등 5개, 4등 4개, 5등 3개 (0 = 낙첨)
+
+예측 세트와 기존 표본 랜덤 세트 중 3개 이상 맞힌 세트가 있는 (회차, 출처)의 세트만
+성과표(round_scores.match_3plus)로 골라 비트마스크를 한 번에 읽고, popcount(세트 & 당첨) 과
+(세트 >> 보너스) & 1 로 등수를 벡터 판정한 뒤 (출처, 회차, 등수) 별 개수를 bincount 1회로 집계한다.
+낙첨 세트 수는 성과표의 세트 수에서 뺀다. 금액 계산은 이 개수에 상금표를 곱하기만 하므로
+상금표를 바꿔도 다시 채점하지 않는다.
+
+1~3등은 실제로는 회차별 판매액에 따라 달라지는 금액이므로 기본값은 평균 수준의 근사치이며,
+LOTTO_PRIZE_TABLE 환경 변수(JSON, 예: {"1": 2500000000, "ticket": 1000})나 API 인자로 바꿀 수 있다.
+"""
+
+import json
+import os
+from math import comb
+
+import numpy as np
+
+import scoring
+from models import _where, _window_condition, get_codes, get_db
+
+TIERS = (1, 2, 3, 4, 5)
+DEFAULT_PRIZE_TABLE = {
+    1: 2_000_000_000,
+    2: 55_000_000,
+    3: 1_500_000,
+    4: 50_000,
+    5: 5_000,
+}
+DEFAULT_TICKET_PRICE = 1_000
+FETCH_SIZE = 50_000
+
+# (회차, 출처)별 세트 수 — 모든 세트를 우선 낙첨으로 센다
+GROUPS_QUERY = """
+    SELECT s.round_id, s.kind, s.source, s.n_sets
+    FROM round_scores s JOIN rounds r ON r.id = s.round_id
+    WHERE r.round_number BETWEEN :first AND :last
+"""
+
+# 3개 이상 일치 세트가 있는 (회차, 출처)의 세트만 (예측 + 기존 표본 랜덤)
+CANDIDATE_SETS_QUERY = """
+    SELECT p.round_id, 'code' AS kind, p.code_id AS source, p.mask
+    FROM round_scores s JOIN rounds r ON r.id = s.round_id
+    JOIN predictions p ON p.round_id = s.round_id AND p.code_id = s.source
+    WHERE s.kind = 'code' AND s.match_3plus > 0 AND r.round_number BETWEEN :first AND :last
+    UNION ALL
+    SELECT b.round_id, 'baseline', b.baseline_group, b.mask
+    FROM round_scores s JOIN rounds r ON r.id = s.round_id
+    JOIN random_baselines b ON b.round_id = s.round_id AND b.baseline_group = s.source
+    WHERE s.kind = 'baseline' AND s.match_3plus > 0 AND r.round_number BETWEEN :first AND :last
+"""
+
+
+def prize_table(overrides=None):
+    """상금표 → ({등수: 금액}, 1게임 가격)
+
+    기본값 ← LOTTO_PRIZE_TABLE 환경 변수 ← overrides 순으로 덮어쓴다.
+    키는 등수(1~5, 문자열 가능) 또는 'ticket'. 음수나 숫자가 아닌 값은 ValueError.
+    """
+    table, ticket = dict(DEFAULT_PRIZE_TABLE), DEFAULT_TICKET_PRICE
+    sources = [json.loads(os.environ.get('LOTTO_PRIZE_TABLE') or '{}'), overrides or {}]
+    for source in sources:
+        for key, value in source.items():
+            if value is None:
+                continue
+            try:
+                amount = int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f'금액은 정수여야 합니다: {key}={value}') from None
+            if amount < 0:
+                raise ValueError(f'금액은 0 이상이어야 합니다: {key}={value}')
+            if str(key) == 'ticket':
+                ticket = amount
+            elif str(key).isdigit() and int(key) in table:
+                table[int(key)] = amount
+            else:
+                raise ValueError(f'알 수 없는 상금표 항목: {key}')
+    return table, ticket
+
+
+def tier_pmf():
+    """무작위 세트 1개의 등수 분포 → (P(낙첨), P(1등), ..., P(5등))"""
+    total = comb(scoring.MAX_NUMBER, 6)
+    others = scoring.MAX_NUMBER - 6 - 1  # 당첨 번호 6개와 보너스를 뺀 나머지
+    p = [0.0] * 6
+    p[1] = 1 / total
+    p[2] = 6 / total                                   # 5개 + 보너스
+    p[3] = comb(6, 5) * others / total                 # 5개 + 보너스 외 1개
+    p[4] = comb(6, 4) * comb(scoring.MAX_NUMBER - 6, 2) / total
+    p[5] = comb(6, 3) * comb(scoring.MAX_NUMBER - 6, 3) / total
+    p[0] = 1 - sum(p[1:])
+    return tuple(p)
+
+
+def classify(set_masks, draw_masks, bonuses):
+    """세트별 등수 (0 = 낙첨, 1~5등)
+
+    set_masks: (N,) 세트 비트마스크, draw_masks / bonuses: (N,) 비교할 회차의 당첨 마스크 / 보너스 번호
+    (보너스가 없으면 0 — 비트 0 은 번호가 아니므로 2등이 나오지 않는다)
+    """
+    set_masks = np.asarray(set_masks, dtype=np.int64)
+    matches = scoring.popcount_array(set_masks & np.asarray(draw_masks, dtype=np.int64))
+    bonus_hit = (set_masks >> np.asarray(bonuses, dtype=np.int64)) & 1
+    tiers = np.zeros(len(set_masks), dtype=np.int8)
+    tiers[matches == 3] = 5
+    tiers[matches == 4] = 4
+    tiers[matches == 5] = 3
+    tiers[(matches == 5) & (bonus_hit == 1)] = 2
+    tiers[matches == 6] = 1
+    return tiers
+
+
+def tier_counts(last_n=None, from_round=None, to_round=None):
+    """구간 전체 세트의 (출처, 회차, 등수) 개수 — 일괄 1회 채점
+
+    → {'round_numbers': (R,), 'sources': [(kind, source), ...], 'counts': (G, R, 6) int64}
+    counts[..., 0] 은 낙첨 세트 수 (합계 = 세트 수). 회차가 없으면 None.
+    """
+    conn = get_db()
+    conds, params = _window_condition(last_n, from_round, to_round, column='round_number')
+    rounds = conn.execute(
+        f"SELECT id, round_number, mask, COALESCE(bonus, 0) FROM rounds {_where(*conds)} ORDER BY round_number",
+        params
+    ).fetchall()
+    if not rounds:
+        return None
+    rounds = np.array([tuple(r) for r in rounds], dtype=np.int64)
+    round_numbers, draw_masks, bonuses = rounds[:, 1], rounds[:, 2], rounds[:, 3]
+    id_order = np.argsort(rounds[:, 0])
+    sorted_ids = rounds[id_order, 0]
+
+    bounds = {'first': int(round_numbers[0]), 'last': int(round_numbers[-1])}
+
+    def positions(round_ids):
+        return id_order[np.searchsorted(sorted_ids, round_ids)]
+
+    # ── 1. (출처, 회차)별 세트 수 → 전부 낙첨(0등)으로 시작 ──
+    source_index = {}
+    groups = conn.execute(GROUPS_QUERY, bounds).fetchall()
+    group_ids = np.array([source_index.setdefault((g[1], g[2]), len(source_index)) for g in groups],
+                         dtype=np.int64)
+    group_pos = positions(np.array([g[0] for g in groups], dtype=np.int64))
+    n_sets = np.array([g[3] for g in groups], dtype=np.int64)
+
+    # ── 2. 3+ 일치 후보 세트 등수 판정 ──
+    flat = []  # bincount 인덱스 조각
+    cursor = conn.execute(CANDIDATE_SETS_QUERY, bounds)
+    try:
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            pos = positions(np.array([row[0] for row in rows], dtype=np.int64))
+            masks = np.array([row[3] for row in rows], dtype=np.int64)
+            ids = np.array([source_index.setdefault((row[1], row[2]), len(source_index)) for row in rows],
+                           dtype=np.int64)
+            tiers = classify(masks, draw_masks[pos], bonuses[pos])
+            won = tiers > 0
+            flat.append((ids[won] * len(round_numbers) + pos[won]) * 6 + tiers[won])
+    finally:
+        cursor.close()
+
+    n_groups = len(source_index)
+    size = n_groups * len(round_numbers) * 6
+    winners = np.bincount(np.concatenate(flat), minlength=size) if flat else np.zeros(size, dtype=np.int64)
+    counts = winners.reshape(n_groups, len(round_numbers), 6)
+    np.add.at(counts[:, :, 0], (group_ids, group_pos), n_sets)
+    counts[:, :, 0] -= counts[:, :, 1:].sum(axis=2)
+    return {'round_numbers': round_numbers, 'sources': list(source_index), 'counts': counts}
+
+
+def _summary(counts, table, ticket, random_per_set):
+    """(R, 6) 등수 개수 → 출처 1개의 성적 dict"""
+    played = counts.sum(axis=1) > 0
+    n_sets = int(counts.sum())
+    n_rounds = int(played.sum())
+    prize = np.array([0] + [table[t] for t in TIERS], dtype=np.float64)
+    winnings = float(counts.sum(axis=0) @ prize)
+    cost = n_sets * ticket
+    return {
+        'rounds': n_rounds,
+        'sets': n_sets,
+        'tiers': {str(t): int(counts[:, t].sum()) for t in TIERS},
+        'cost': cost,
+        'winnings': round(winnings),
+        'net': round(winnings - cost),
+        'return_rate': round(winnings / cost * 100, 2) if cost else None,
+        'expected_return_per_round': round(winnings / n_rounds) if n_rounds else None,
+        'random_expected_winnings': round(random_per_set * n_sets),
+        'random_return_rate': round(random_per_set / ticket * 100, 2) if ticket else None,
+    }
+
+
+def prize_report(data, table=None, ticket=None):
+    """tier_counts() 결과 + 상금표 → 코드/기준선별 성적과 회차별 당첨금
+
+    → {'prize_table', 'ticket', 'random_per_set', 'round_numbers', 'codes': {code_id: 요약},
+       'baselines': {그룹: 요약}, 'series': {code_id: [회차별 당첨금]}}
+    """
+    if table is None or ticket is None:
+        default_table, default_ticket = prize_table()
+        table = default_table if table is None else table
+        ticket = default_ticket if ticket is None else ticket
+    pmf = tier_pmf()
+    random_per_set = sum(pmf[t] * table[t] for t in TIERS)
+    result = {
+        'prize_table': {str(t): table[t] for t in TIERS},
+        'ticket': ticket,
+        'random_per_set': round(random_per_set, 2),
+        'round_numbers': [],
+        'codes': {},
+        'baselines': {},
+        'series': {},
+    }
+    if data is None:
+        return result
+
+    prize = np.array([0] + [table[t] for t in TIERS], dtype=np.int64)
+    per_round = data['counts'] @ prize  # (G, R)
+    result['round_numbers'] = data['round_numbers'].tolist()
+    by_source = {key: g for g, key in enumerate(data['sources'])}
+    for code_id in get_codes():
+        g = by_source.get(('code', code_id))
+        if g is None:
+            continue
+        result['codes'][code_id] = _summary(data['counts'][g], table, ticket, random_per_set)
+        played = data['counts'][g].sum(axis=1) > 0
+        result['series'][code_id] = [int(v) if p else None for v, p in zip(per_round[g], played)]
+    for (kind, source), g in sorted(by_source.items()):
+        if kind == 'baseline':
+            result['baselines'][source] = _summary(data['counts'][g], table, ticket, random_per_set)
+    return result
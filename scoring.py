@@ -0,0 +1,134 @@
+"""
+로또 예측 성능 분석 대시보드 - 벡터화 일치 수 계산 커널
+
+numpy 는 커널을 처음 호출할 때 가져온다 — 비트마스크 함수(encode_mask, popcount)만 쓰는
+워커 시작과 단순 조회 경로는 numpy 로딩을 기다리지 않는다.
+"""
+
+from functools import lru_cache
+
+MAX_NUMBER = 45
+
+
+def encode_draws(draws):
+    """당첨 번호 (R, 6) → 원-핫 (R, 46) 배열 (인덱스 = 번호)"""
+    import numpy as np
+    draws = np.asarray(draws, dtype=np.intp).reshape(-1, 6)
+    onehot = np.zeros((len(draws), MAX_NUMBER + 1), dtype=np.int8)
+    onehot[np.arange(len(draws))[:, None], draws] = 1
+    return onehot
+
+
+def score_sets(draws, sets, draw_index=None):
+    """모든 세트의 일치 수를 한 번에 계산
+
+    draws: (R, 6) 당첨 번호, sets: (S, 6) 예측 세트,
+    draw_index: (S,) 각 세트가 비교할 draws 행 (생략 시 모두 0행)
+    세트 안의 같은 번호는 한 번만 센다 (mask popcount 경로와 같은 결과).
+    저장된 세트는 오름차순이므로 순증가가 아닌 행만 정렬해 중복을 지운다.
+    """
+    import numpy as np
+    sets = np.asarray(sets, dtype=np.intp).reshape(-1, 6)
+    if draw_index is None:
+        draw_index = np.zeros(len(sets), dtype=np.intp)
+    unsorted = ~(np.diff(sets, axis=1) > 0).all(axis=1)
+    if unsorted.any():
+        sets = sets.copy()
+        sets[unsorted] = np.sort(sets[unsorted], axis=1)
+    onehot = encode_draws(draws)
+    hits = onehot[np.asarray(draw_index, dtype=np.intp)[:, None], sets]
+    if unsorted.any():
+        rows = sets[unsorted]
+        hits[unsorted, 1:] *= rows[:, 1:] != rows[:, :-1]
+    return hits.sum(axis=1)
+
+
+def summarize_groups(matches, group_index, n_groups):
+    """그룹(회차×코드)별 max/avg/3+/4+/5+ 집계 → 열 배열 dict"""
+    import numpy as np
+    matches = np.asarray(matches, dtype=np.int64)
+    group_index = np.asarray(group_index, dtype=np.intp)
+
+    n_sets = np.bincount(group_index, minlength=n_groups)
+    max_match = np.full(n_groups, -1, dtype=np.int64)
+    np.maximum.at(max_match, group_index, matches)
+    total = np.bincount(group_index, weights=matches, minlength=n_groups)
+
+    return {
+        'max_match': max_match,
+        'avg_match': np.divide(total, n_sets, out=np.zeros(n_groups), where=n_sets > 0),
+        'match_3plus': np.bincount(group_index, weights=matches >= 3, minlength=n_groups).astype(np.int64),
+        'match_4plus': np.bincount(group_index, weights=matches >= 4, minlength=n_groups).astype(np.int64),
+        'match_5plus': np.bincount(group_index, weights=matches >= 5, minlength=n_groups).astype(np.int64),
+        'n_sets': n_sets,
+    }
+
+
+def score_groups(draws, sets, draw_index, group_index, n_groups):
+    """일치 수 + 그룹별 집계를 한 번의 호출로 계산 → (matches, stats)"""
+    matches = score_sets(draws, sets, draw_index)
+    return matches, summarize_groups(matches, group_index, n_groups)
+
+
+def zone_bins(zones):
+    """{구간명: [번호...]} → 번호 → 구간 인덱스 배열 (구간 밖 번호는 -1)"""
+    import numpy as np
+    bins = np.full(MAX_NUMBER + 1, -1, dtype=np.intp)
+    for z, nums in enumerate(zones.values()):
+        bins[list(nums)] = z
+    return bins
+
+
+def number_counts(sets, group_index, n_groups):
+    """그룹별 번호 빈도 (bincount 1회) → (n_groups, 46) 배열 (인덱스 = 번호)"""
+    import numpy as np
+    width = MAX_NUMBER + 1
+    sets = np.asarray(sets, dtype=np.intp).reshape(-1, 6)
+    group = np.repeat(np.asarray(group_index, dtype=np.intp), 6)
+    counts = np.bincount(group * width + sets.ravel(), minlength=n_groups * width)
+    return counts.reshape(n_groups, width)
+
+
+def zone_counts(counts, bins):
+    """번호 빈도 (..., 46) → 구간별 합계 (..., 구간 수)"""
+    import numpy as np
+    n_zones = int(bins.max()) + 1
+    valid = np.flatnonzero(bins >= 0)
+    onehot = np.zeros((len(bins), n_zones), dtype=np.int64)
+    onehot[valid, bins[valid]] = 1
+    return np.asarray(counts, dtype=np.int64) @ onehot
+
+
+def random_sets(n, rng=None):
+    """무작위 6개 번호 세트 n개 (오름차순, 세트 내 중복 없음) → (n, 6) 배열"""
+    import numpy as np
+    rng = rng if rng is not None else np.random.default_rng()
+    picks = np.argpartition(rng.random((n, MAX_NUMBER)), 6, axis=1)[:, :6] + 1
+    return np.sort(picks, axis=1)
+
+
+def encode_mask(numbers):
+    """번호 목록 → 비트마스크 정수 (비트 n = 번호 n, 최대 46비트)"""
+    mask = 0
+    for n in numbers:
+        mask |= 1 << n
+    return mask
+
+
+def popcount(mask):
+    """비트마스크의 1 비트 수 (SQLite 사용자 함수용, NULL 은 NULL)"""
+    return None if mask is None else bin(mask).count('1')
+
+
+@lru_cache(maxsize=None)
+def _popcount_table():
+    """바이트 값(0~255)별 1 비트 수 조회표"""
+    import numpy as np
+    return np.array([bin(i).count('1') for i in range(256)], dtype=np.int8)
+
+
+def popcount_array(masks):
+    """비트마스크 배열의 원소별 1 비트 수 (바이트 조회표, numpy 1.x 호환) → int8 배열"""
+    import numpy as np
+    masks = np.ascontiguousarray(masks, dtype=np.int64)
+    return _popcount_table()[masks.view(np.uint8).reshape(-1, 8)].sum(axis=1, dtype=np.int8).reshape(masks.shape)
@@ -0,0 +1,228 @@
+"""
+로또 예측 성능 분석 대시보드 - 코드 랭킹 유의성 검정 (부트스트랩 / 랜덤 시뮬레이션 / 순열)
+
+- 부트스트랩: 회차를 복원 추출(값별 다항분포)해 avg_max_match / pct_3plus / vs_random 의 신뢰구간 계산
+- 랜덤 시뮬레이션: 같은 세트 수의 무작위 선택을 같은 회차 수만큼 반복해 단측 p-value 계산
+  (최대 일치 합은 baseline.max_match_pmf 의 다항분포, 3+ 세트 수는 이항분포로 정확히 추출)
+- 순열 검정: 랭킹상 이웃한 두 코드의 공통 회차 차이에 부호 뒤집기를 적용해 순위 차이의 p-value 계산
+
+시행은 (코드, 조각) 단위 작업으로 나눠 프로세스 풀에서 실행하며, 각 작업은
+SeedSequence.spawn 으로 독립 시드를 받으므로 같은 seed · 워커 수면 결과가 재현된다.
+
+프로세스 풀은 프로세스(웹 워커)당 하나를 처음 필요할 때 만들어 재사용한다. 요청 스레드가 도는
+워커에서 fork 하지 않도록 forkserver(없으면 spawn) 컨텍스트로 띄우고, 풀을 쓰는 검정은 동시에
+하나만 실행한다 — 자리가 없으면 Busy 를 올려 호출자가 나중에 다시 요청하게 한다.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import baseline
+
+DEFAULT_TRIALS = 10_000
+MAX_TRIALS = 1_000_000
+CONFIDENCE = 0.95
+PARALLEL_MIN_TRIALS = 200_000  # 이보다 적으면 프로세스 풀 기동 비용이 더 크므로 현재 프로세스에서 실행
+MAX_SEED = 2**32 - 1
+
+_pool = None
+_pool_key = None  # (pid, workers) — fork 된 자식 프로세스나 다른 워커 수면 새로 만든다
+_pool_lock = threading.Lock()
+_parallel_run = threading.BoundedSemaphore(1)  # 풀을 쓰는 검정은 프로세스당 동시에 1개
+
+
+class Busy(RuntimeError):
+    """다른 병렬 검정이 실행 중 — 잠시 뒤 다시 요청"""
+
+
+def _shared_pool(workers):
+    """프로세스별 공유 풀 (forkserver / spawn 컨텍스트, 처음 호출 시 생성)"""
+    global _pool, _pool_key
+    with _pool_lock:
+        key = (os.getpid(), workers)
+        if _pool_key != key:
+            if _pool is not None and _pool_key[0] == key[0]:
+                _pool.shutdown(wait=False)
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+            _pool, _pool_key = ProcessPoolExecutor(max_workers=workers, mp_context=context), key
+        return _pool
+
+
+def _discard_pool():
+    """공유 풀 폐기 (다음 _shared_pool 호출에서 새로 생성)"""
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool, _pool_key = None, None
+
+
+def _histogram(values):
+    """정수 값 배열 → (고유값, 비율)"""
+    uniq, counts = np.unique(values, return_counts=True)
+    return uniq.astype(np.float64), counts / counts.sum()
+
+
+def _code_task(args):
+    """코드 1개 · 조각 1개 시행 → (부트스트랩 avg_max, 부트스트랩 pct_3plus, 귀무 초과 횟수 2개)
+
+    값이 작은 정수이므로 n회차 복원 추출의 값별 횟수는 다항분포를 따른다 — 회차 인덱스를
+    뽑는 대신 다항분포에서 직접 추출해 시행당 O(값 종류 수)로 계산한다.
+    """
+    max_match, match_3plus, n_sets, trials, seed = args
+    rng = np.random.default_rng(seed)
+    n = len(max_match)
+
+    values, probs = _histogram(max_match)
+    boot_max = rng.multinomial(n, probs, size=trials) @ values / n
+    values, probs = _histogram(match_3plus)
+    boot_3plus = rng.multinomial(n, probs, size=trials) @ values / n * 100
+
+    # 귀무가설: 회차마다 같은 세트 수의 무작위 선택 (세트 수별 최대일치 분포의 다항 추출)
+    totals = np.zeros(trials)
+    for k, count in zip(*np.unique(n_sets, return_counts=True)):
+        pmf = np.asarray(baseline.max_match_pmf(int(k)))
+        totals += rng.multinomial(int(count), pmf / pmf.sum(), size=trials) @ np.arange(len(pmf))
+    null_max_ge = int((totals >= max_match.sum() - 1e-9).sum())
+    p3 = sum(baseline.match_pmf()[3:])
+    null_3plus_ge = int((rng.binomial(int(n_sets.sum()), p3, size=trials) >= match_3plus.sum()).sum())
+
+    return boot_max, boot_3plus, null_max_ge, null_3plus_ge
+
+
+def _pair_task(args):
+    """이웃 코드 쌍 · 조각 1개 부호 뒤집기 순열 → |차이 합| 이상인 횟수
+
+    |차이| 가 같은 회차끼리는 + 부호 개수가 이항분포를 따르므로 값별로 한 번에 추출한다.
+    """
+    diffs, trials, seed = args
+    rng = np.random.default_rng(seed)
+    magnitudes, counts = np.unique(np.abs(diffs[diffs != 0]), return_counts=True)
+    totals = np.zeros(trials)
+    for v, c in zip(magnitudes, counts):
+        totals += v * (2 * rng.binomial(int(c), 0.5, size=trials) - int(c))
+    return int((np.abs(totals) >= abs(diffs.sum()) - 1e-9).sum())
+
+
+def _split(trials, parts):
+    """시행 수를 parts 조각으로 분할 (빈 조각 제외)"""
+    base, extra = divmod(trials, parts)
+    return [base + (i < extra) for i in range(parts) if base + (i < extra) > 0]
+
+
+def _p_value(exceed, trials):
+    """단측/양측 경험적 p-value (+1 보정)"""
+    return (exceed + 1) / (trials + 1)
+
+
+def _interval(samples, confidence):
+    tail = (1 - confidence) / 2 * 100
+    lo, hi = np.percentile(samples, [tail, 100 - tail])
+    return [round(float(lo), 3), round(float(hi), 3)]
+
+
+def run_significance(series, trials=DEFAULT_TRIALS, seed=None, workers=None, confidence=CONFIDENCE):
+    """코드별 유의성 검정
+
+    series: models.get_code_round_series() 결과
+    workers: 프로세스 수 (기본: PARALLEL_MIN_TRIALS 이상이면 CPU 수, 아니면 1 = 현재 프로세스)
+    → {'trials', 'confidence', 'workers', 'codes': [...], 'pairs': [...]} (codes 는 avg_max_match 내림차순)
+    """
+    trials = max(1, min(int(trials), MAX_TRIALS))
+    if workers is None:
+        workers = (os.cpu_count() or 1) if trials >= PARALLEL_MIN_TRIALS else 1
+    workers = max(1, workers)
+    code_ids = [c for c in series if len(series[c]['max_match'])]
+
+    ordered = sorted(code_ids, key=lambda c: series[c]['max_match'].mean(), reverse=True)
+    pairs = []
+    for a, b in zip(ordered, ordered[1:]):
+        common, ia, ib = np.intersect1d(series[a]['round_numbers'], series[b]['round_numbers'],
+                                        return_indices=True)
+        if len(common):
+            diffs = (series[a]['max_match'][ia] - series[b]['max_match'][ib]).astype(np.float64)
+            pairs.append((a, b, diffs))
+
+    chunks = _split(trials, workers)
+    n_tasks = len(code_ids) * len(chunks) + len(pairs) * len(chunks)
+    seeds = iter(np.random.SeedSequence(seed).spawn(n_tasks))
+    code_args = [
+        (series[c]['max_match'].astype(np.float64), series[c]['match_3plus'].astype(np.float64),
+         series[c]['n_sets'], size, next(seeds))
+        for c in code_ids for size in chunks
+    ]
+    pair_args = [(diffs, size, next(seeds)) for _, _, diffs in pairs for size in chunks]
+
+    if workers == 1:
+        code_results = [_code_task(a) for a in code_args]
+        pair_results = [_pair_task(a) for a in pair_args]
+    else:
+        if not _parallel_run.acquire(blocking=False):
+            raise Busy('다른 유의성 검정이 실행 중입니다.')
+        try:
+            pool = _shared_pool(workers)
+            code_futures = pool.map(_code_task, code_args)
+            pair_futures = pool.map(_pair_task, pair_args)
+            code_results, pair_results = list(code_futures), list(pair_futures)
+        except BrokenProcessPool:
+            _discard_pool()  # 자식 프로세스가 죽은 풀은 다시 쓸 수 없으므로 다음 호출에서 새로 만든다
+            raise
+        finally:
+            _parallel_run.release()
+
+    codes = []
+    for i, code_id in enumerate(code_ids):
+        parts = code_results[i * len(chunks):(i + 1) * len(chunks)]
+        boot_max = np.concatenate([p[0] for p in parts])
+        boot_3plus = np.concatenate([p[1] for p in parts])
+        data = series[code_id]
+        n = len(data['max_match'])
+        expected = float(np.mean([baseline.expected_max_match(int(k)) for k in data['n_sets']]))
+        avg_max = float(data['max_match'].mean())
+        p_max = _p_value(sum(p[2] for p in parts), trials)
+        codes.append({
+            'code_id': code_id,
+            'rounds': n,
+            'random_expected': round(expected, 3),
+            'avg_max_match': {
+                'value': round(avg_max, 2),
+                'ci': _interval(boot_max, confidence),
+                'p_value': p_max,
+            },
+            'pct_3plus': {
+                'value': round(float(data['match_3plus'].sum()) / n * 100, 1),
+                'ci': _interval(boot_3plus, confidence),
+                'p_value': _p_value(sum(p[3] for p in parts), trials),
+            },
+            'vs_random': {
+                'value': round((avg_max - expected) / expected * 100, 1),
+                'ci': _interval((boot_max - expected) / expected * 100, confidence),
+                'p_value': p_max,  # avg_max_match 의 단조 변환이므로 같은 검정
+            },
+        })
+
+    codes.sort(key=lambda c: ordered.index(c['code_id']))
+
+    pair_stats = []
+    for j, (a, b, diffs) in enumerate(pairs):
+        exceed = sum(pair_results[j * len(chunks):(j + 1) * len(chunks)])
+        pair_stats.append({
+            'higher': a,
+            'lower': b,
+            'common_rounds': len(diffs),
+            'mean_diff': round(float(diffs.mean()), 3),
+            'p_value': _p_value(exceed, trials),
+        })
+
+    return {
+        'trials': trials,
+        'confidence': confidence,
+        'workers': workers,
+        'codes': codes,
+        'pairs': pair_stats,
+    }
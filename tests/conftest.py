@@ -0,0 +1,71 @@
+"""
+로또 예측 성능 분석 대시보드 - 테스트 공통 설정 (임시 DB + 합성 데이터)
+"""
+
+import os
+import random
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# app 을 가져올 때 마이그레이션이 기본 DB 파일을 만들지 않도록 먼저 임시 경로를 지정
+os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(prefix='lotto-test-'), 'import.db')
+
+import models  # noqa: E402
+import legacy_models  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """테스트마다 빈 DB 파일 — 현재 엔진과 원본 엔진이 같은 파일을 본다"""
+    path = str(tmp_path / 'lotto.db')
+    monkeypatch.setattr(models, 'DB_PATH', path)
+    monkeypatch.setattr(legacy_models, 'DB_PATH', path)
+    models.clear_round_detail_cache()
+    yield path
+    models.release_thread_db()
+    models.clear_round_detail_cache()
+
+
+def random_set(rng):
+    return rng.sample(range(1, 46), 6)
+
+
+def fill_synthetic(rng, n_rounds, coverage=0.8):
+    """현재 엔진 API 로 합성 데이터 입력 + 수정 / 재입력 / 삭제 (반환: 남은 회차 번호)"""
+    codes = models.get_codes()
+    for rn in range(1, n_rounds + 1):
+        models.save_round(rn, '2024-01-01', random_set(rng), rng.randint(1, 45))
+        for code_id, info in codes.items():
+            if rng.random() < coverage:
+                models.save_predictions(rn, code_id, [random_set(rng) for _ in range(info['sets'])])
+
+    first = next(iter(codes))
+    for rn in rng.sample(range(1, n_rounds + 1), 5):
+        models.save_round(rn, '2024-01-02', random_set(rng), None)
+    for rn in rng.sample(range(1, n_rounds + 1), 5):
+        models.save_predictions(rn, first, [random_set(rng) for _ in range(codes[first]['sets'])])
+    deleted = rng.sample(range(1, n_rounds + 1), 3)
+    for rn in deleted:
+        models.delete_round(rn)
+    return [rn for rn in range(1, n_rounds + 1) if rn not in deleted]
+
+
+@pytest.fixture
+def synthetic_db(db_path):
+    """현재 엔진으로 만든 합성 DB (120회차)"""
+    models.init_db()
+    return fill_synthetic(random.Random(1), 120)
+
+
+@pytest.fixture
+def client(synthetic_db):
+    """합성 DB 위의 Flask 테스트 클라이언트 (대시보드 캐시는 테스트마다 비움)"""
+    import app
+    app.dashboard_cache.clear()
+    yield app.app.test_client()
+    app.dashboard_cache.clear()
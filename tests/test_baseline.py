@@ -0,0 +1,35 @@
+"""
+로또 예측 성능 분석 대시보드 - 랜덤 기준선 테스트 (정확 계산 / 몬테카를로 / 화면별 기댓값 일치)
+"""
+
+import pytest
+
+import baseline
+import models
+import significance
+
+
+def test_analytic_baseline():
+    assert baseline.expected_max_match(1) == pytest.approx(0.8)  # 6 × 6/45
+    for k in (1, 5, 21):
+        assert sum(baseline.max_match_pmf(k)) == pytest.approx(1.0)
+    estimate = baseline.monte_carlo_baseline(5, trials=200_000, seed=1)
+    assert abs(estimate['expected_max'] - baseline.expected_max_match(5)) < 4 * estimate['expected_max_stderr']
+
+
+def test_random_expectation_is_one_definition(synthetic_db):
+    """랭킹 / 유의성 검정 / 코드 상세의 랜덤 기댓값이 회차별 실제 세트 수 기준으로 같다"""
+    code_id = next(iter(models.get_codes()))
+    for rn in synthetic_db[:30]:
+        models.save_predictions(rn, code_id, [[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12]])
+
+    for window in ({}, {'last_n': 50}, {'from_round': 1, 'to_round': 40}):
+        rankings = models.get_dashboard_data(**window)['code_rankings']
+        tested = {
+            c['code_id']: (c['vs_random']['value'], c['random_expected'])
+            for c in significance.run_significance(models.get_code_round_series(**window), 20, 1)['codes']
+        }
+        for row in rankings:
+            drilldown = models.get_code_drilldown(row['code_id'], **window)
+            assert (row['vs_random'], row['random_expected']) == tested[row['code_id']]
+            assert row['random_expected'] == drilldown['random_expected']
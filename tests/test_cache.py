@@ -0,0 +1,51 @@
+"""
+로또 예측 성능 분석 대시보드 - 응답 캐시 테스트 (ETag / 304 / 데이터 버전 무효화)
+"""
+
+import models
+from cache import VersionedCache
+
+
+def test_dashboard_etag_and_not_modified(client):
+    first = client.get('/api/dashboard')
+    assert first.status_code == 200
+    assert first.headers['Cache-Control'] == 'no-cache'
+    etag = first.headers['ETag']
+
+    again = client.get('/api/dashboard', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == etag
+
+    windowed = client.get('/api/dashboard?last_n=10', headers={'If-None-Match': etag})
+    assert windowed.status_code == 200
+    assert windowed.headers['ETag'] != etag
+    assert windowed.get_json()['total_rounds'] == 10
+
+
+def test_write_invalidates_etag_and_body(client, synthetic_db):
+    first = client.get('/api/dashboard')
+    etag = first.headers['ETag']
+    rn = synthetic_db[-1]
+    code_id = next(iter(models.get_codes()))
+    models.save_predictions(rn, code_id, [[1, 2, 3, 4, 5, 6]])
+
+    after = client.get('/api/dashboard', headers={'If-None-Match': etag})
+    assert after.status_code == 200
+    assert after.headers['ETag'] != etag
+    expected = len(set(models.get_round_detail_analysis(rn)['actual']) & {1, 2, 3, 4, 5, 6})
+    assert after.get_json()['performance_series'][code_id][-1] == expected
+
+    models.delete_round(rn)
+    latest = client.get('/api/dashboard', headers={'If-None-Match': after.headers['ETag']}).get_json()
+    assert latest['round_labels'][-1] != str(rn)
+
+
+def test_versioned_cache_drops_older_versions():
+    cache = VersionedCache()
+    assert cache.get(1, 'k', lambda: 'v1') == 'v1'
+    assert cache.get(1, 'k', lambda: 'other') == 'v1'
+    assert cache.get(2, 'k', lambda: 'v2') == 'v2'
+    assert cache.get(1, 'k', lambda: 'stale') == 'stale'  # 이전 버전 요청은 계산만 하고 저장하지 않음
+    assert cache.get(2, 'k', lambda: 'other') == 'v2'
+    assert cache.stats()['hits'] == 2
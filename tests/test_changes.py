@@ -0,0 +1,121 @@
+"""
+로또 예측 성능 분석 대시보드 - 변경 알림 테스트 (변경분 / 전체 새로고침 / 롱 폴링 / 대기 자리)
+"""
+
+import io
+import threading
+import time
+
+import pytest
+
+import app as app_module
+import events
+import importer
+import models
+
+
+def test_round_changes_are_sent_as_delta(synthetic_db):
+    since = models.get_data_version()
+    assert models.get_changes(since) == {'version': since, 'since': since, 'reset': False,
+                                         'events': [], 'rounds': []}
+
+    rn, removed = synthetic_db[-1], synthetic_db[0]
+    code_id = next(iter(models.get_codes()))
+    models.save_predictions(rn, code_id, [[1, 2, 3, 4, 5, 6]])
+    models.delete_round(removed)
+
+    changes = models.get_changes(since)
+    assert not changes['reset']
+    assert changes['version'] == since + 2
+    assert [(e['kind'], e['round_number']) for e in changes['events']] == [('predictions', rn), ('delete', removed)]
+    points = {r['round_number']: r for r in changes['rounds']}
+    assert points[removed]['removed'] and points[removed]['points'] == {}
+    assert points[rn]['points'][code_id] == models.get_round_detail_analysis(rn)['codes'][code_id]['max_match']
+    dashboard = models.get_dashboard_data()
+    assert changes['code_rankings'] == dashboard['code_rankings']
+    assert changes['total_rounds'] == dashboard['total_rounds']
+
+    assert models.get_changes(since + 5)['reset']  # 클라이언트가 더 새 버전 = DB 가 바뀜
+
+
+def test_bulk_import_forces_reset(synthetic_db):
+    since = models.get_data_version()
+    importer.import_draws(io.StringIO('round_number,numbers\n500,1 2 3 4 5 6\n'))
+    changes = models.get_changes(since)
+    assert changes['reset'] and changes['rounds'] == []
+    assert [e['kind'] for e in changes['events']] == ['bulk']
+
+
+def test_event_gap_forces_reset(synthetic_db):
+    since = models.get_data_version()
+    for rn in synthetic_db[:3]:
+        models.save_round(rn, '2024-03-01', [1, 2, 3, 4, 5, 6])
+    conn = models.get_db()
+    conn.execute("DELETE FROM change_events WHERE version = ?", (since + 1,))  # 보관 범위를 벗어난 경우
+    conn.commit()
+    assert models.get_changes(since)['reset']
+    assert not models.get_changes(since + 1)['reset']
+
+
+def test_watcher_wakes_waiters_on_version_change():
+    state = {'version': 1}
+    watcher = events.ChangeWatcher(lambda: state['version'], interval=5, slots=1)
+    assert watcher.wait(1, 0.05) == 1  # 변경 없음 → 시간 초과
+
+    result = {}
+    waiter = threading.Thread(target=lambda: result.setdefault('version', watcher.wait(1, 10)))
+    waiter.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    state['version'] = 2
+    watcher.poke()  # 주기(5초)를 기다리지 않고 바로 확인
+    waiter.join(5)
+    assert result == {'version': 2}
+    assert time.monotonic() - started < 1
+
+
+def test_stream_without_slot_sends_changes_and_retry():
+    state = {'version': 3}
+    watcher = events.ChangeWatcher(lambda: state['version'], interval=0.05, slots=1)
+    assert watcher.try_hold() and not watcher.try_hold()
+    chunks = list(events.stream(watcher, 2, lambda since: f'{{"since": {since}}}'))
+    assert chunks[0] == f'retry: {events.SHORT_POLL_RETRY_MS}\n\n'
+    assert chunks[1] == events.format_event('change', '{"since": 2}', event_id=3)
+    watcher.release()
+    assert watcher.try_hold()
+
+
+@pytest.fixture
+def watcher(monkeypatch):
+    watcher = events.ChangeWatcher(models.get_data_version, interval=0.05, slots=1)
+    monkeypatch.setattr(app_module, 'change_watcher', watcher)
+    return watcher
+
+
+def test_long_poll_returns_on_write(client, synthetic_db, watcher):
+    since = models.get_data_version()
+    result = {}
+
+    def poll():
+        started = time.monotonic()
+        response = client.get(f'/api/changes?since={since}&wait=20')
+        result.update(response.get_json(), seconds=time.monotonic() - started)
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    time.sleep(0.2)
+    models.save_round(synthetic_db[-1], '2024-03-01', [1, 2, 3, 4, 5, 6])
+    poller.join(10)
+    assert result['version'] == since + 1 and not result['reset']
+    assert result['seconds'] < 5
+
+
+def test_long_poll_without_slot_answers_at_once(client, watcher):
+    assert watcher.try_hold()
+    try:
+        started = time.monotonic()
+        response = client.get('/api/changes?wait=20')
+        assert time.monotonic() - started < 1
+        assert response.headers['Retry-After'] == str(events.SHORT_POLL_RETRY_MS // 1000)
+    finally:
+        watcher.release()
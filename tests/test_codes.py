@@ -0,0 +1,51 @@
+"""
+로또 예측 성능 분석 대시보드 - 코드 관리 테스트 (등록 / 집계 반영 / 삭제 / 화면 이스케이프)
+"""
+
+import random
+
+import pytest
+
+import models
+from conftest import random_set
+
+XSS_NAME = '<script>alert(1)</script>'
+
+
+def test_added_code_is_scored_and_removed_cleanly(client, synthetic_db):
+    response = client.post('/api/codes', json={'code_id': 'X1', 'name': 'New', 'sets': 3,
+                                               'color': '#112233', 'short': 'X1'})
+    assert response.status_code == 201
+    rng = random.Random(5)
+    for rn in synthetic_db[-20:]:
+        models.save_predictions(rn, 'X1', [random_set(rng) for _ in range(3)])
+    assert models.check_aggregates() == []
+
+    dashboard = client.get('/api/dashboard').get_json()
+    assert any(row['code_id'] == 'X1' for row in dashboard['code_rankings'])
+    assert sum(v is not None for v in dashboard['performance_series']['X1']) == 20
+    assert 'X1' in client.get(f'/api/round/{synthetic_db[-1]}').get_json()['codes']
+
+    assert client.delete('/api/codes/X1').status_code == 200
+    assert client.delete('/api/codes/X1').status_code == 404
+    assert models.check_aggregates() == []
+    conn = models.get_db()
+    assert conn.execute("SELECT COUNT(*) FROM predictions WHERE code_id='X1'").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM round_scores WHERE source='X1'").fetchone()[0] == 0
+    assert 'X1' not in client.get('/api/dashboard').get_json()['performance_series']
+
+
+def test_invalid_code_is_rejected(client):
+    for body in ({'code_id': 'bad id', 'name': 'x', 'sets': 3, 'color': '#112233', 'short': 'X'},
+                 {'code_id': 'X2', 'name': 'x', 'sets': 'a', 'color': '#112233', 'short': 'X'}):
+        assert client.post('/api/codes', json=body).status_code == 400
+
+
+@pytest.mark.parametrize('path', ['/', '/code/XSS', '/codes', '/history', '/input'])
+def test_code_names_are_escaped(client, synthetic_db, path):
+    client.post('/api/codes', json={'code_id': 'XSS', 'name': XSS_NAME, 'sets': 1,
+                                    'color': '#112233', 'short': '<b>'})
+    models.save_predictions(synthetic_db[-1], 'XSS', [[1, 2, 3, 4, 5, 6]])
+    response = client.get(path)
+    assert response.status_code == 200
+    assert XSS_NAME.encode() not in response.data
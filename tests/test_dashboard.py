@@ -0,0 +1,46 @@
+"""
+로또 예측 성능 분석 대시보드 - 대시보드 엔진 회귀 테스트 (변경 전 엔진 고정본과 결과 비교)
+
+랜덤 기대값(vs_random / random_expected)은 샘플링 기준선을 정확 계산으로 바꾸면서
+의도적으로 달라졌으므로 비교에서 뺀다.
+"""
+
+import random
+
+import pytest
+
+import legacy_models
+import models
+from conftest import fill_synthetic
+
+DASHBOARD_KEYS = ['total_rounds', 'code_rankings', 'round_labels', 'performance_series', 'random_series',
+                  'zone_heatmap']
+RANDOM_EXPECTATION_KEYS = ('vs_random', 'random_expected')
+
+
+def comparable(dashboard):
+    """대시보드 결과에서 원본과 비교할 부분만 (랜덤 기대값 제외)"""
+    result = {key: dashboard[key] for key in DASHBOARD_KEYS}
+    result['code_rankings'] = [
+        {k: v for k, v in row.items() if k not in RANDOM_EXPECTATION_KEYS} for row in result['code_rankings']
+    ]
+    return result
+
+
+def assert_matches_legacy():
+    """대시보드 / 코드별 성과가 원본 엔진과 같고 누적 집계가 전체 재계산과 같다"""
+    assert comparable(models.get_dashboard_data()) == comparable(legacy_models.get_dashboard_data())
+
+    for code_id in legacy_models.CODES:
+        old = legacy_models.get_code_performance(code_id)
+        new = models.get_code_performance(code_id)
+        assert [{k: row[k] for k in old[0]} for row in new] == old if old else new == old
+
+    assert models.check_aggregates() == []
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_dashboard_matches_legacy_engine(db_path, seed):
+    models.init_db()
+    fill_synthetic(random.Random(seed), 150)
+    assert_matches_legacy()
@@ -0,0 +1,68 @@
+"""
+로또 예측 성능 분석 대시보드 - 일괄 가져오기 테스트 (행 검증 / 결과 보고 / 재가져오기)
+"""
+
+import io
+import json
+
+import importer
+import models
+
+DRAW_HEADER = 'round_number,draw_date,num1,num2,num3,num4,num5,num6,bonus\n'
+
+
+def test_draw_rows_are_validated_and_reported(db_path):
+    models.init_db()
+    csv_text = DRAW_HEADER + (
+        '1,2024-01-06,1,2,3,4,5,6,7\n'
+        '2,2024-01-13,1,2,3,4,5,46,\n'      # 범위 밖
+        '3,2024-01-20,1,1,3,4,5,6,\n'       # 중복 번호
+        '4,2024-01-27,1,2,3,4,5,6,50\n'     # 보너스 범위 밖
+        'x,2024-02-03,1,2,3,4,5,6,\n'       # 회차 번호 오류
+        '1,2024-01-06,10,11,12,13,14,15,\n'  # 같은 회차 재등장 — 뒤의 행으로 갱신
+    )
+    stats = importer.import_draws(io.StringIO(csv_text))
+    assert (stats['read'], stats['valid'], stats['errors'], stats['rounds']) == (6, 2, 4, 1)
+    assert [s.split(':')[0] for s in stats['error_samples']] == ['3행', '4행', '5행', '6행']
+    assert importer.format_report(stats).startswith('6행 중 2행 유효, 1회차 저장 (오류 4, 경고 0)')
+    assert models.get_round_detail_analysis(1)['actual'] == [10, 11, 12, 13, 14, 15]
+
+
+def test_prediction_rows_are_validated_and_reported(db_path):
+    models.init_db()
+    models.save_round(1, '2024-01-06', [1, 2, 3, 4, 5, 6])
+    code_id, info = next(iter(models.get_codes().items()))
+    lines = [json.dumps({'round_number': 1, 'code_id': code_id, 'numbers': [n, n + 1, n + 2, n + 3, n + 4, n + 5]})
+             for n in range(1, info['sets'])]  # 한 세트 모자람 → 경고
+    lines += [
+        json.dumps({'round_number': 1, 'code_id': 'nope', 'numbers': [1, 2, 3, 4, 5, 6]}),
+        json.dumps({'round_number': 1, 'code_id': code_id, 'numbers': [1, 1, 2, 3, 4, 5]}),
+        '{not json',
+        json.dumps({'round_number': 9, 'code_id': code_id, 'numbers': [1, 2, 3, 4, 5, 6]}),
+    ]
+    stats = importer.import_predictions(io.StringIO('\n'.join(lines)), 'jsonl')
+
+    assert stats['read'] == len(lines)
+    assert stats['valid'] == info['sets']  # 유효 행 = 저장 세트 + 없는 회차 행
+    assert stats['sets'] == info['sets'] - 1
+    assert stats['errors'] == 4
+    assert any('알 수 없는 코드' in s for s in stats['error_samples'])
+    assert any('서로 다른' in s for s in stats['error_samples'])
+    assert any('9회차가 존재하지 않습니다' in s for s in stats['error_samples'])
+    assert stats['warnings'] == [f"1회차 {code_id}: {info['sets']}세트 필요, {info['sets'] - 1}세트 입력됨"]
+    assert len(models.get_round_detail_analysis(1)['codes'][code_id]['sets']) == info['sets'] - 1
+
+
+def test_draw_reimport_keeps_round_ids_and_predictions(synthetic_db):
+    conn = models.get_db()
+    before_ids = dict(conn.execute("SELECT round_number, id FROM rounds"))
+    before_sets = conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    csv_text = DRAW_HEADER + ''.join(f'{rn},2025-01-01,1,2,3,4,5,6,\n' for rn in synthetic_db[:10])
+    stats = importer.import_draws(io.StringIO(csv_text))
+    assert stats['rounds'] == 10 and stats['errors'] == 0
+
+    assert dict(conn.execute("SELECT round_number, id FROM rounds")) == before_ids
+    assert conn.execute("SELECT COUNT(*) FROM predictions").fetchone()[0] == before_sets
+    assert models.get_round_detail_analysis(synthetic_db[0])['actual'] == [1, 2, 3, 4, 5, 6]
+    assert models.check_aggregates() == []
@@ -0,0 +1,31 @@
+"""
+로또 예측 성능 분석 대시보드 - 마이그레이션 테스트 (원본 엔진이 만든 DB 업그레이드)
+"""
+
+import random
+
+import legacy_models
+import migrations
+import models
+from conftest import random_set
+from test_dashboard import assert_matches_legacy
+
+
+def test_migrating_legacy_database(db_path):
+    """원본 엔진이 만든 DB 에 마이그레이션 + 백필을 적용해도 결과가 같다"""
+    rng = random.Random(9)
+    legacy_models.init_db()
+    for rn in range(1, 60):
+        legacy_models.save_round(rn, '', random_set(rng))
+        for code_id, info in legacy_models.CODES.items():
+            legacy_models.save_predictions(rn, code_id, [random_set(rng) for _ in range(info['sets'])])
+
+    assert [version for version, _ in models.init_db()] == [v for v, _, _ in migrations.MIGRATIONS]
+    assert models.schema_current()
+    assert models.init_db() == []  # 두 번째 실행은 할 일이 없다
+    assert_matches_legacy()
+    assert sum(v is not None for v in models.get_dashboard_data()['random_series']['rand5_avg']) == 59
+
+    conn = models.get_db()
+    assert conn.execute("SELECT COUNT(*) FROM predictions WHERE mask IS NULL").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM round_scores WHERE numbers IS NULL").fetchone()[0] == 0
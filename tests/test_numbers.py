@@ -0,0 +1,31 @@
+"""
+로또 예측 성능 분석 대시보드 - 번호별 인덱스 테스트 (원본 테이블 직접 집계와 비교)
+"""
+
+import models
+
+
+def test_number_index_matches_raw_counts(synthetic_db):
+    conn = models.get_db()
+    actual = {
+        row['id']: {row[f'num{i}'] for i in range(1, 7)}
+        for row in conn.execute("SELECT * FROM rounds")
+    }
+    expected = {}
+    for row in conn.execute("SELECT * FROM predictions"):
+        predicted, hits = expected.setdefault(row['code_id'], ([0] * 45, [0] * 45))
+        for n in (row[f'num{i}'] for i in range(1, 7)):
+            predicted[n - 1] += 1
+            hits[n - 1] += n in actual[row['round_id']]
+
+    index = models.get_number_index()
+    assert index['rounds'] == len(synthetic_db)
+    assert {c: (v['predicted'], v['hits']) for c, v in index['codes'].items()} == expected
+
+
+def test_rolling_window_matches_index(synthetic_db):
+    code_id = next(iter(models.get_codes()))
+    rolling = models.get_number_rolling(code_id, window=20, step=1)
+    last = models.get_number_index(last_n=20)['codes'][code_id]
+    assert rolling['predicted'][-1] == last['predicted'] and rolling['hits'][-1] == last['hits']
+    assert rolling['labels'][-1] == synthetic_db[-1]
@@ -0,0 +1,32 @@
+"""
+로또 예측 성능 분석 대시보드 - 등수 / 상금 테스트 (상금표 검증, 구간 집계)
+"""
+
+import pytest
+
+import models
+import prizes
+
+
+@pytest.mark.parametrize('query', ['prize1=abc', 'ticket=1.5', 'prize4=-1'])
+def test_invalid_prize_table_is_rejected(client, query):
+    response = client.get(f'/api/prizes?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('금액은')
+
+
+def _set_count(table, first, last):
+    return models.get_db().execute(
+        f"SELECT COUNT(*) FROM {table} t JOIN rounds r ON r.id = t.round_id WHERE r.round_number BETWEEN ? AND ?",
+        (first, last)
+    ).fetchone()[0]
+
+
+def test_tier_counts_follow_window(synthetic_db):
+    """구간 회차와 세트 수가 대시보드 구간 조회와 같다 (낙첨 포함 합계 = 세트 수)"""
+    for window in ((None, None, None), (20, None, None), (None, 10, 40), (5, 10, 40)):
+        rounds = [r['round_number'] for r in models._window_rounds(models.get_db(), *window)]
+        counts = prizes.tier_counts(*window)
+        assert counts['round_numbers'].tolist() == rounds
+        expected = sum(_set_count(t, rounds[0], rounds[-1]) for t in ('predictions', 'random_baselines'))
+        assert counts['counts'].sum() == expected
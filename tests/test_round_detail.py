@@ -0,0 +1,36 @@
+"""
+로또 예측 성능 분석 대시보드 - 회차 상세 분석 테스트 (저장본 / 캐시 vs 원본 엔진)
+"""
+
+import random
+
+import legacy_models
+import models
+from conftest import fill_synthetic
+
+
+def _assert_detail_matches_legacy(rn):
+    old = legacy_models.get_round_detail_analysis(rn)
+    new = models.get_round_detail_analysis(rn)
+    assert {k: new[k] for k in old} == old
+
+
+def test_round_detail_matches_legacy_engine(db_path):
+    models.init_db()
+    for rn in fill_synthetic(random.Random(4), 80):
+        _assert_detail_matches_legacy(rn)
+
+
+def test_round_detail_follows_edits(synthetic_db):
+    rn = synthetic_db[-1]
+    models.get_round_detail_analysis(rn)  # 캐시 적재 후 수정
+    code_id = next(iter(models.get_codes()))
+    models.save_predictions(rn, code_id, [[1, 2, 3, 4, 5, 6]] * 5)
+    models.save_round(rn, '2024-02-01', [1, 2, 3, 7, 8, 9], None)
+
+    detail = models.get_round_detail_analysis(rn)
+    assert detail['codes'][code_id]['sets'][0]['hit_numbers'] == [1, 2, 3]
+    _assert_detail_matches_legacy(rn)
+
+    models.delete_round(rn)
+    assert models.get_round_detail_analysis(rn) is None
@@ -0,0 +1,55 @@
+"""
+로또 예측 성능 분석 대시보드 - 채점 커널 테스트 (중복 번호 세트)
+"""
+
+import legacy_models
+import models
+import scoring
+
+DRAW = [1, 2, 3, 4, 5, 6]
+REPEATED = [1, 1, 2, 3, 4, 5]
+
+
+def test_repeated_numbers_are_rejected_on_input():
+    assert models.parse_prediction_line('1 1 2 3 4 5') is None
+    assert models.parse_prediction_text('1 1 2 3 4 5\n1 2 3 4 5 6') == [DRAW]
+
+
+def test_kernel_counts_distinct_numbers():
+    sets = [REPEATED, DRAW, [6, 6, 6, 6, 6, 6], [40, 41, 42, 43, 44, 45]]
+    matches = scoring.score_sets([DRAW], sets).tolist()
+    assert matches == [5, 6, 1, 0]
+    draw_mask = scoring.encode_mask(DRAW)
+    assert matches == [scoring.popcount(scoring.encode_mask(s) & draw_mask) for s in sets]
+
+
+def test_stored_repeated_set_scores_like_legacy(db_path):
+    """입력 검증을 거치지 않고 저장된 중복 세트도 원본 엔진과 같은 일치 수 (5, 1등 아님)"""
+    models.init_db()
+    models.save_round(1, '2024-01-01', DRAW)
+    code_id = next(iter(models.get_codes()))
+    models.save_predictions(1, code_id, [REPEATED])
+
+    detail = models.get_round_detail_analysis(1)['codes'][code_id]
+    assert detail['max_match'] == 5
+    assert detail['sets'][0]['hit_numbers'] == [1, 2, 3, 4, 5]
+    assert detail['max_match'] == legacy_models.get_round_detail_analysis(1)['codes'][code_id]['max_match']
+    assert models.get_code_performance(code_id)[0]['max_match'] == 5
+    assert models.check_aggregates() == []
+
+
+def test_migration_rescores_inflated_rounds(db_path):
+    """예전 커널이 저장한 부풀려진 점수는 마이그레이션 후 init_db 가 다시 채점한다"""
+    models.init_db()
+    models.save_round(1, '2024-01-01', DRAW)
+    code_id = next(iter(models.get_codes()))
+    models.save_predictions(1, code_id, [REPEATED])
+    conn = models.get_db()
+    conn.execute("UPDATE round_scores SET max_match = 6, match_5plus = 1 WHERE kind = 'code'")
+    conn.execute("UPDATE score_aggregates SET total_max_matches = 6, match_5plus = 1 WHERE kind = 'code'")
+    conn.execute("PRAGMA user_version = 9")
+    conn.commit()
+
+    models.init_db()
+    assert conn.execute("SELECT max_match FROM round_scores WHERE kind = 'code'").fetchone()[0] == 5
+    assert models.check_aggregates() == []